@@ -0,0 +1,389 @@
+"""
+请求集合存储
+基于 SQLite 的工作区：一个工作区文件包含多个集合，集合下可以嵌套文件夹和请求。
+树形结构按层级查询，全文搜索使用 FTS5 索引（不可用时退回 LIKE 查询）。
+"""
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from headers import header_data
+
+
+WORKSPACE_FILE_NAME = '.http_client_workspace.db'
+
+# 批量写入时每个事务包含的请求数
+BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collections (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS folders (
+    id INTEGER PRIMARY KEY,
+    collection_id INTEGER NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+    parent_id INTEGER REFERENCES folders(id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_folders_parent ON folders(collection_id, parent_id);
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    collection_id INTEGER NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+    folder_id INTEGER REFERENCES folders(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    body TEXT NOT NULL,
+    body_file TEXT,
+    timeout INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_requests_folder ON requests(collection_id, folder_id);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS requests_fts USING fts5(
+    name, method, url, content='requests', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS requests_ai AFTER INSERT ON requests BEGIN
+    INSERT INTO requests_fts(rowid, name, method, url) VALUES (new.id, new.name, new.method, new.url);
+END;
+CREATE TRIGGER IF NOT EXISTS requests_ad AFTER DELETE ON requests BEGIN
+    INSERT INTO requests_fts(requests_fts, rowid, name, method, url)
+    VALUES ('delete', old.id, old.name, old.method, old.url);
+END;
+CREATE TRIGGER IF NOT EXISTS requests_au AFTER UPDATE ON requests BEGIN
+    INSERT INTO requests_fts(requests_fts, rowid, name, method, url)
+    VALUES ('delete', old.id, old.name, old.method, old.url);
+    INSERT INTO requests_fts(rowid, name, method, url) VALUES (new.id, new.name, new.method, new.url);
+END;
+"""
+
+
+def get_workspace_file() -> str:
+    """获取默认工作区文件路径"""
+    return os.path.join(os.path.expanduser('~'), WORKSPACE_FILE_NAME)
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _default_name(method: str, url: str) -> str:
+    """根据方法和URL生成请求名称"""
+    path = url.split('://', 1)[-1]
+    path = path[path.find('/'):] if '/' in path else path
+    return f"{method} {path or '/'}"
+
+
+class CollectionStore:
+    """
+    请求集合存储
+
+    所有查询只返回当前层级需要显示的字段，请求头和请求体只在
+    get_request() 时读取，因此打开大工作区的开销与请求总数无关。
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or get_workspace_file()
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA foreign_keys = ON')
+        if self.path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.executescript(_SCHEMA)
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(requests)')}
+        if 'body_file' not in columns:
+            # 旧版本创建的工作区没有 body_file 列
+            self._conn.execute('ALTER TABLE requests ADD COLUMN body_file TEXT')
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite 未编译 FTS5 或不支持 trigram 分词
+            self.has_fts = False
+        self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    # ---------- 集合 ----------
+
+    def create_collection(self, name: str) -> int:
+        """创建集合，同名集合已存在时返回其ID"""
+        with self._lock, self._conn:
+            row = self._conn.execute('SELECT id FROM collections WHERE name = ?', (name,)).fetchone()
+            if row:
+                return row['id']
+            cursor = self._conn.execute(
+                'INSERT INTO collections (name, created_at) VALUES (?, ?)', (name, _now())
+            )
+            return cursor.lastrowid
+
+    def list_collections(self) -> List[Dict]:
+        """列出所有集合"""
+        with self._lock:
+            rows = self._conn.execute('SELECT id, name FROM collections ORDER BY name').fetchall()
+        return [dict(row) for row in rows]
+
+    def rename_collection(self, collection_id: int, name: str):
+        """重命名集合"""
+        with self._lock, self._conn:
+            self._conn.execute('UPDATE collections SET name = ? WHERE id = ?', (name, collection_id))
+
+    def delete_collection(self, collection_id: int):
+        """删除集合及其全部内容"""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM requests WHERE collection_id = ?', (collection_id,))
+            self._conn.execute('DELETE FROM folders WHERE collection_id = ?', (collection_id,))
+            self._conn.execute('DELETE FROM collections WHERE id = ?', (collection_id,))
+
+    # ---------- 文件夹 ----------
+
+    def create_folder(self, collection_id: int, name: str, parent_id: Optional[int] = None) -> int:
+        """在集合（或父文件夹）下创建文件夹"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO folders (collection_id, parent_id, name) VALUES (?, ?, ?)',
+                (collection_id, parent_id, name)
+            )
+            return cursor.lastrowid
+
+    def get_folder_path(self, collection_id: int, path: str) -> Optional[int]:
+        """
+        按 "a/b/c" 形式的路径获取文件夹，不存在时逐级创建
+
+        Returns:
+            文件夹ID，路径为空时返回None（集合根目录）
+        """
+        parent_id = None
+        for name in [part for part in path.split('/') if part]:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT id FROM folders WHERE collection_id = ? AND parent_id IS ? AND name = ?',
+                    (collection_id, parent_id, name)
+                ).fetchone()
+            parent_id = row['id'] if row else self.create_folder(collection_id, name, parent_id)
+        return parent_id
+
+    def rename_folder(self, folder_id: int, name: str):
+        """重命名文件夹"""
+        with self._lock, self._conn:
+            self._conn.execute('UPDATE folders SET name = ? WHERE id = ?', (name, folder_id))
+
+    def delete_folder(self, folder_id: int):
+        """删除文件夹及其子文件夹、请求"""
+        with self._lock, self._conn:
+            folder_ids = [row[0] for row in self._conn.execute(
+                """
+                WITH RECURSIVE tree(id) AS (
+                    SELECT ? UNION ALL
+                    SELECT folders.id FROM folders JOIN tree ON folders.parent_id = tree.id
+                )
+                SELECT id FROM tree
+                """, (folder_id,)
+            )]
+            placeholders = ','.join('?' * len(folder_ids))
+            self._conn.execute(f'DELETE FROM requests WHERE folder_id IN ({placeholders})', folder_ids)
+            self._conn.execute(f'DELETE FROM folders WHERE id IN ({placeholders})', folder_ids)
+
+    def list_children(self, collection_id: int, folder_id: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """
+        列出某一层级的直接子节点（懒加载树使用）
+
+        Returns:
+            {'folders': [{'id', 'name', 'has_children'}], 'requests': [{'id', 'name', 'method', 'url'}]}
+        """
+        with self._lock:
+            folders = self._conn.execute(
+                """
+                SELECT f.id, f.name,
+                       EXISTS(SELECT 1 FROM folders c WHERE c.collection_id = f.collection_id AND c.parent_id = f.id)
+                       OR EXISTS(SELECT 1 FROM requests r WHERE r.collection_id = f.collection_id AND r.folder_id = f.id)
+                       AS has_children
+                FROM folders f WHERE f.collection_id = ? AND f.parent_id IS ?
+                ORDER BY f.name
+                """, (collection_id, folder_id)
+            ).fetchall()
+            requests = self._conn.execute(
+                """
+                SELECT id, name, method, url FROM requests
+                WHERE collection_id = ? AND folder_id IS ?
+                ORDER BY name
+                """, (collection_id, folder_id)
+            ).fetchall()
+        return {
+            'folders': [dict(row) for row in folders],
+            'requests': [dict(row) for row in requests]
+        }
+
+    # ---------- 请求 ----------
+
+    def _request_row(self, collection_id, folder_id, request: Dict, name: Optional[str] = None):
+        method = request.get('method', 'GET')
+        url = request.get('url', '')
+        return (
+            collection_id,
+            folder_id,
+            name or request.get('name') or _default_name(method, url),
+            method,
+            url,
+            json.dumps(header_data(request.get('headers')), ensure_ascii=False),
+            request.get('body') or '',
+            request.get('body_file') or None,
+            request.get('timeout', 30),
+            _now()
+        )
+
+    def add_request(self, collection_id: int, request: Dict, folder_id: Optional[int] = None,
+                    name: Optional[str] = None) -> int:
+        """
+        保存请求到集合
+
+        Args:
+            collection_id: 集合ID
+            request: 请求字典，格式与历史记录相同（可以带 body_file，即作为请求体发送的文件路径）
+            folder_id: 文件夹ID，None 表示集合根目录
+            name: 请求名称，默认由方法和路径生成
+
+        Returns:
+            请求ID
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO requests (collection_id, folder_id, name, method, url, headers, body, body_file,
+                                      timeout, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, self._request_row(collection_id, folder_id, request, name)
+            )
+            return cursor.lastrowid
+
+    def add_requests(self, collection_id: int, requests: Iterable[Dict],
+                     folder_id: Optional[int] = None, batch_size: int = BATCH_SIZE) -> int:
+        """
+        批量保存请求，按批次提交事务，可直接传入生成器
+
+        Returns:
+            写入的请求数量
+        """
+        count = 0
+        batch = []
+        for request in requests:
+            batch.append(self._request_row(collection_id, folder_id, request))
+            if len(batch) >= batch_size:
+                count += self._insert_batch(batch)
+                batch = []
+        if batch:
+            count += self._insert_batch(batch)
+        return count
+
+    def _insert_batch(self, rows: List[tuple]) -> int:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO requests (collection_id, folder_id, name, method, url, headers, body, body_file,
+                                      timeout, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows
+            )
+        return len(rows)
+
+    def get_request(self, request_id: int) -> Optional[Dict]:
+        """读取完整的请求数据"""
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM requests WHERE id = ?', (request_id,)).fetchone()
+        if not row:
+            return None
+        request = dict(row)
+        request['headers'] = json.loads(request['headers'])
+        return request
+
+    def update_request(self, request_id: int, request: Dict):
+        """更新请求内容"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE requests SET method = ?, url = ?, headers = ?, body = ?, body_file = ?, timeout = ?,
+                                    updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    request.get('method', 'GET'),
+                    request.get('url', ''),
+                    json.dumps(header_data(request.get('headers')), ensure_ascii=False),
+                    request.get('body') or '',
+                    request.get('body_file') or None,
+                    request.get('timeout', 30),
+                    _now(),
+                    request_id
+                )
+            )
+
+    def delete_request(self, request_id: int):
+        """删除请求"""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM requests WHERE id = ?', (request_id,))
+
+    def count_requests(self, collection_id: Optional[int] = None) -> int:
+        """统计请求数量"""
+        with self._lock:
+            if collection_id is None:
+                row = self._conn.execute('SELECT COUNT(*) FROM requests').fetchone()
+            else:
+                row = self._conn.execute(
+                    'SELECT COUNT(*) FROM requests WHERE collection_id = ?', (collection_id,)
+                ).fetchone()
+        return row[0]
+
+    def search(self, query: str, collection_id: Optional[int] = None, limit: int = 200) -> List[Dict]:
+        """
+        按名称、方法、URL搜索请求
+
+        Args:
+            query: 搜索关键字（子串匹配，不区分大小写）
+            collection_id: 限定集合，None 表示整个工作区
+            limit: 最多返回的结果数
+
+        Returns:
+            [{'id', 'collection_id', 'folder_id', 'name', 'method', 'url'}]
+        """
+        query = query.strip()
+        if not query:
+            return []
+
+        scope = '' if collection_id is None else 'AND r.collection_id = ?'
+        scope_args = () if collection_id is None else (collection_id,)
+
+        with self._lock:
+            if self.has_fts and len(query) >= 3:
+                # trigram 分词支持任意子串匹配
+                phrase = '"' + query.replace('"', '""') + '"'
+                rows = self._conn.execute(
+                    f"""
+                    SELECT r.id, r.collection_id, r.folder_id, r.name, r.method, r.url
+                    FROM requests_fts JOIN requests r ON r.id = requests_fts.rowid
+                    WHERE requests_fts MATCH ? {scope}
+                    LIMIT ?
+                    """, (phrase,) + scope_args + (limit,)
+                ).fetchall()
+            else:
+                pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                rows = self._conn.execute(
+                    f"""
+                    SELECT r.id, r.collection_id, r.folder_id, r.name, r.method, r.url
+                    FROM requests r
+                    WHERE (r.name LIKE ? ESCAPE '\\' OR r.url LIKE ? ESCAPE '\\' OR r.method LIKE ? ESCAPE '\\') {scope}
+                    LIMIT ?
+                    """, (pattern, pattern, pattern) + scope_args + (limit,)
+                ).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,191 @@
+"""
+数据驱动执行（不依赖 Qt）
+按数据文件（CSV / JSONL）的每一行发送一次请求，列名作为变量替换 URL、请求头和请求体中的 {{变量}}
+
+数据文件逐行读取，同时在途的行数有上限，结果逐条写出，内存占用与文件大小无关，
+可以处理数百万行的文件；请求模板只编译一次，每行只做渲染
+"""
+import os
+import csv
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, Optional, Union
+
+from request_engine import new_session, normalize_url
+from request_runner import RunnerRequest, SourceError, run_request
+from templates import RequestTemplate, TemplateError
+
+
+DEFAULT_CONCURRENCY = 8
+
+# 每个工作线程最多排队的行数，读取速度超过发送速度时暂停读取
+QUEUE_PER_WORKER = 2
+
+# 结果文件每写出多少条刷新一次
+FLUSH_EVERY = 100
+
+RESULT_FIELDS = ['row', 'source', 'method', 'url', 'status_code', 'response_time', 'ttfb',
+                 'size', 'request_size', 'error']
+
+
+def iter_rows(path: str) -> Iterator[Union[Dict[str, str], SourceError]]:
+    """
+    逐行读取数据文件
+
+    - .csv：第一行为列名
+    - 其他（.jsonl / .ndjson）：每行一个 JSON 对象，空行跳过
+
+    Args:
+        path: 数据文件路径
+
+    Returns:
+        逐行产出变量字典（值均为字符串）的生成器，无法解析的行产出 SourceError
+    """
+    name = os.path.basename(path)
+
+    if path.lower().endswith('.csv'):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                # 列数多于表头时多余的值在键 None 下，忽略
+                yield {key: value or '' for key, value in row.items() if key is not None}
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield SourceError(f"{name}:{line_number}", f'JSON格式错误: {e}')
+                continue
+            if not isinstance(row, dict):
+                yield SourceError(f"{name}:{line_number}", '每行应为一个 JSON 对象')
+                continue
+            yield {str(key): value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+                   for key, value in row.items()}
+
+
+class ResultWriter:
+    """
+    逐条写出结果：.csv 为表格，其他为每行一个 JSON 对象
+
+    用于 with 语句，退出时刷新并关闭文件。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        if path.lower().endswith('.csv'):
+            self.csv_writer = csv.DictWriter(self.file, RESULT_FIELDS, extrasaction='ignore')
+            self.csv_writer.writeheader()
+        else:
+            self.csv_writer = None
+
+    def write(self, result: Dict):
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(result)
+        else:
+            self.file.write(json.dumps(result, ensure_ascii=False))
+            self.file.write('\n')
+        self.count += 1
+        if self.count % FLUSH_EVERY == 0:
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _error_result(row_index: int, source: str, error: str) -> Dict:
+    return {'row': row_index, 'source': source, 'method': '-', 'url': '-', 'status_code': None,
+            'response_time': None, 'ttfb': None, 'size': None, 'request_size': None, 'error': error}
+
+
+def run_rows(request: RunnerRequest, rows, on_result: Callable[[Dict], None],
+             variables: Optional[Dict[str, str]] = None, concurrency: int = DEFAULT_CONCURRENCY,
+             compression: Optional[str] = None, dry_run: bool = False,
+             stop: Optional[threading.Event] = None, session_factory: Callable = new_session) -> int:
+    """
+    按每一行数据发送一次请求
+
+    Args:
+        request: 请求模板（URL、请求头、请求体中可以含有 {{变量}}）；渲染后的 URL 没有协议时按 https 发送
+        rows: 逐个产出变量字典或 SourceError 的可迭代对象，见 iter_rows()
+        on_result: 每行完成时在调用线程中回调，参数为 run_request() 的结果加上 'row'（从 0 开始的行号）；
+            结果按完成顺序回调
+        variables: 公共变量（如当前环境），行中的同名列优先
+        concurrency: 同时发送的请求数
+        compression: 请求体压缩方式
+        dry_run: 只渲染和准备请求体，不发送
+        stop: 设置后不再读取新的行，等待在途的请求完成后返回
+        session_factory: 创建会话的函数，每个工作线程一个会话（保持连接）
+
+    Returns:
+        已处理的行数
+    """
+    template = RequestTemplate(request.method, request.url, request.headers, request.body)
+    base_variables = dict(variables or {})
+    concurrency = max(1, concurrency)
+
+    local = threading.local()
+    sessions = []
+    sessions_lock = threading.Lock()
+
+    def get_session():
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = session_factory()
+            with sessions_lock:
+                sessions.append(session)
+        return session
+
+    def execute(row_index: int, row: Dict[str, str]) -> Dict:
+        source = f"{request.source}@{row_index}"
+        try:
+            rendered = template.render({**base_variables, **row})
+        except TemplateError as e:
+            return _error_result(row_index, source, str(e))
+        row_request = RunnerRequest(
+            request.method, normalize_url(rendered['url']), rendered['headers'], rendered['body'],
+            request.body_file, request.timeout, source
+        )
+        result = run_request(row_request, None if dry_run else get_session(), compression, dry_run)
+        result['row'] = row_index
+        return result
+
+    def deliver(futures):
+        for future in futures:
+            on_result(future.result())
+
+    processed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='DataRunner') as executor:
+            pending = set()
+            limit = concurrency * QUEUE_PER_WORKER
+            for row_index, row in enumerate(rows):
+                if stop is not None and stop.is_set():
+                    break
+                processed += 1
+                if isinstance(row, SourceError):
+                    on_result(_error_result(row_index, row.source, row.error))
+                    continue
+                if len(pending) >= limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    deliver(done)
+                pending.add(executor.submit(execute, row_index, row))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                deliver(done)
+    finally:
+        for session in sessions:
+            session.close()
+    return processed
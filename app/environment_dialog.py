@@ -0,0 +1,175 @@
+"""
+环境管理对话框
+在首次打开时才导入
+"""
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget,
+    QTableWidget, QTableWidgetItem, QHeaderView, QInputDialog, QMessageBox, QDialogButtonBox
+)
+
+from environments import EnvironmentStore
+
+
+class EnvironmentDialog(QDialog):
+    """编辑环境及其变量，点击确定后写回 EnvironmentStore 并保存"""
+
+    def __init__(self, store: EnvironmentStore, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("环境管理")
+        self.setMinimumSize(700, 450)
+        self.store = store
+        # 在副本上编辑，取消时不影响存储
+        self.environments = {name: dict(variables) for name, variables in store.environments.items()}
+        self.current_name = None
+        self.setup_ui()
+
+        self.env_list.addItems(sorted(self.environments))
+        if store.active in self.environments:
+            self.env_list.setCurrentRow(sorted(self.environments).index(store.active))
+        elif self.environments:
+            self.env_list.setCurrentRow(0)
+
+    def setup_ui(self):
+        """设置UI"""
+        layout = QVBoxLayout(self)
+
+        content_layout = QHBoxLayout()
+
+        # 左侧：环境列表
+        env_layout = QVBoxLayout()
+        env_layout.addWidget(QLabel("环境:"))
+        self.env_list = QListWidget()
+        self.env_list.currentTextChanged.connect(self.on_environment_changed)
+        env_layout.addWidget(self.env_list)
+
+        env_buttons = QHBoxLayout()
+        add_env_btn = QPushButton("新建")
+        add_env_btn.clicked.connect(self.add_environment)
+        rename_env_btn = QPushButton("重命名")
+        rename_env_btn.clicked.connect(self.rename_environment)
+        remove_env_btn = QPushButton("删除")
+        remove_env_btn.clicked.connect(self.remove_environment)
+        env_buttons.addWidget(add_env_btn)
+        env_buttons.addWidget(rename_env_btn)
+        env_buttons.addWidget(remove_env_btn)
+        env_layout.addLayout(env_buttons)
+        content_layout.addLayout(env_layout, 1)
+
+        # 右侧：变量表
+        var_layout = QVBoxLayout()
+        var_layout.addWidget(QLabel("变量（在 URL、请求头、请求体中以 {{变量名}} 引用）:"))
+        self.var_table = QTableWidget()
+        self.var_table.setColumnCount(2)
+        self.var_table.setHorizontalHeaderLabels(["变量名", "值"])
+        self.var_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        var_layout.addWidget(self.var_table)
+
+        var_buttons = QHBoxLayout()
+        add_var_btn = QPushButton("添加变量")
+        add_var_btn.clicked.connect(self.add_variable)
+        remove_var_btn = QPushButton("删除选中")
+        remove_var_btn.clicked.connect(self.remove_variable)
+        var_buttons.addWidget(add_var_btn)
+        var_buttons.addWidget(remove_var_btn)
+        var_buttons.addStretch()
+        var_layout.addLayout(var_buttons)
+        content_layout.addLayout(var_layout, 2)
+
+        layout.addLayout(content_layout)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def read_table(self):
+        """变量表中的变量，忽略空变量名"""
+        variables = {}
+        for row in range(self.var_table.rowCount()):
+            key_item = self.var_table.item(row, 0)
+            value_item = self.var_table.item(row, 1)
+            key = key_item.text().strip() if key_item else ''
+            if key:
+                variables[key] = value_item.text() if value_item else ''
+        return variables
+
+    def on_environment_changed(self, name):
+        """切换环境前保存当前变量表"""
+        if self.current_name in self.environments:
+            self.environments[self.current_name] = self.read_table()
+        self.current_name = name or None
+
+        variables = self.environments.get(name, {})
+        self.var_table.setRowCount(len(variables))
+        for row, (key, value) in enumerate(variables.items()):
+            self.var_table.setItem(row, 0, QTableWidgetItem(key))
+            self.var_table.setItem(row, 1, QTableWidgetItem(value))
+        self.var_table.setEnabled(self.current_name is not None)
+
+    def ask_name(self, title, text=''):
+        name, ok = QInputDialog.getText(self, title, "环境名称:", text=text)
+        name = name.strip()
+        if not ok or not name:
+            return None
+        if name in self.environments and name != text:
+            QMessageBox.warning(self, "名称重复", f"环境 {name} 已存在")
+            return None
+        return name
+
+    def add_environment(self):
+        name = self.ask_name("新建环境")
+        if name:
+            self.environments[name] = {}
+            self.env_list.addItem(name)
+            self.env_list.setCurrentRow(self.env_list.count() - 1)
+
+    def rename_environment(self):
+        item = self.env_list.currentItem()
+        if not item:
+            return
+        old_name = item.text()
+        name = self.ask_name("重命名环境", old_name)
+        if name and name != old_name:
+            self.environments[name] = self.read_table()
+            del self.environments[old_name]
+            self.current_name = name
+            item.setText(name)
+
+    def remove_environment(self):
+        item = self.env_list.currentItem()
+        if not item:
+            return
+        name = item.text()
+        self.environments.pop(name, None)
+        self.current_name = None
+        self.env_list.takeItem(self.env_list.row(item))
+
+    def add_variable(self):
+        if self.current_name is None:
+            return
+        row = self.var_table.rowCount()
+        self.var_table.insertRow(row)
+        self.var_table.setItem(row, 0, QTableWidgetItem(""))
+        self.var_table.setItem(row, 1, QTableWidgetItem(""))
+        self.var_table.editItem(self.var_table.item(row, 0))
+
+    def remove_variable(self):
+        rows = sorted({index.row() for index in self.var_table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.var_table.removeRow(row)
+
+    def accept(self):
+        """写回存储并保存"""
+        if self.current_name in self.environments:
+            self.environments[self.current_name] = self.read_table()
+        active = self.store.active
+        self.store.environments = {}
+        for name, variables in self.environments.items():
+            self.store.set(name, variables)
+        self.store.active = active if active in self.environments else None
+        try:
+            self.store.save()
+        except OSError as e:
+            QMessageBox.warning(self, "保存失败", f"无法保存环境: {e}")
+            return
+        super().accept()
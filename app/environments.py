@@ -0,0 +1,115 @@
+"""
+环境变量集合
+每个环境是一组命名变量（如 dev / staging / prod 各自的 base_url、token），
+发送请求时用当前环境的变量替换 URL、请求头和请求体中的 {{变量}}
+"""
+import os
+import json
+import tempfile
+from typing import Dict, List, Optional
+
+
+ENVIRONMENTS_FILE_NAME = '.http_client_environments.json'
+
+
+def get_environments_file() -> str:
+    """获取环境文件路径"""
+    return os.path.join(os.path.expanduser('~'), ENVIRONMENTS_FILE_NAME)
+
+
+class EnvironmentStore:
+    """
+    环境存储
+
+    文件格式: {"active": "dev", "environments": {"dev": {"base_url": "..."}, ...}}
+    修改后调用 save() 写盘（先写临时文件再重命名覆盖）。
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or get_environments_file()
+        self.environments: Dict[str, Dict[str, str]] = {}
+        self.active: Optional[str] = None
+        self.load()
+
+    def load(self):
+        """从文件加载，文件不存在或损坏时为空"""
+        self.environments = {}
+        self.active = None
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    for name, variables in (data.get('environments') or {}).items():
+                        if isinstance(variables, dict):
+                            self.environments[name] = {str(k): str(v) for k, v in variables.items()}
+                    if data.get('active') in self.environments:
+                        self.active = data['active']
+        except Exception:
+            pass
+
+    def save(self):
+        """原子写入环境文件"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix='.http_client_environments.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'active': self.active, 'environments': self.environments}, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def names(self) -> List[str]:
+        """全部环境名称（按名称排序）"""
+        return sorted(self.environments)
+
+    def get(self, name: str) -> Dict[str, str]:
+        """
+        获取环境的变量
+
+        Raises:
+            KeyError: 环境不存在
+        """
+        return self.environments[name]
+
+    def set(self, name: str, variables: Dict[str, str]):
+        """新建或替换环境"""
+        self.environments[name] = {str(k): str(v) for k, v in variables.items()}
+
+    def remove(self, name: str):
+        """删除环境，删除的是当前环境时取消选择"""
+        self.environments.pop(name, None)
+        if self.active == name:
+            self.active = None
+
+    def rename(self, old_name: str, new_name: str):
+        """重命名环境"""
+        if old_name == new_name or old_name not in self.environments:
+            return
+        self.environments[new_name] = self.environments.pop(old_name)
+        if self.active == old_name:
+            self.active = new_name
+
+    def set_active(self, name: Optional[str]):
+        """
+        选择当前环境
+
+        Args:
+            name: 环境名称，None 表示不使用环境
+
+        Raises:
+            KeyError: 环境不存在
+        """
+        if name is not None and name not in self.environments:
+            raise KeyError(name)
+        self.active = name
+
+    def active_variables(self) -> Dict[str, str]:
+        """当前环境的变量，未选择环境时为空"""
+        if self.active is None:
+            return {}
+        return self.environments.get(self.active, {})
@@ -0,0 +1,200 @@
+"""
+HAR (HTTP Archive) 导入导出
+流式解析 log.entries 数组并转换为历史记录格式，导出时逐条写出，不会整体加载文件
+"""
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Union
+
+from headers import Headers, header_data
+from json_stream import CHUNK_SIZE, JsonStreamReader
+
+
+HAR_VERSION = '1.2'
+
+
+def iter_har_entries(source: Union[str, TextIO], chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    流式读取HAR文件中的 log.entries
+
+    Args:
+        source: HAR文件路径或文本文件对象
+        chunk_size: 每次读取的字符数
+
+    Yields:
+        原始HAR entry 字典
+    """
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8-sig') as f:
+            yield from iter_har_entries(f, chunk_size)
+        return
+
+    reader = JsonStreamReader(source, chunk_size)
+    for key in reader.iter_object_keys():
+        if key != 'log':
+            reader.read_value_text()
+            continue
+        for log_key in reader.iter_object_keys():
+            if log_key == 'entries':
+                yield from reader.iter_array_items()
+            else:
+                reader.read_value_text()
+
+
+def har_entry_to_history(entry: Dict) -> Optional[Dict]:
+    """
+    将HAR entry转换为历史记录格式
+
+    Args:
+        entry: HAR entry 字典
+
+    Returns:
+        历史记录字典，缺少请求信息时返回None
+    """
+    request = entry.get('request') or {}
+    method = (request.get('method') or '').upper()
+    url = request.get('url') or ''
+    if not method or not url:
+        return None
+
+    # 保留重复字段（如多个 Cookie）
+    headers = Headers()
+    for header in request.get('headers') or []:
+        name = header.get('name', '')
+        # 跳过HTTP/2伪首部 (:authority 等)
+        if name and not name.startswith(':'):
+            headers.add(name, header.get('value', ''))
+
+    post_data = request.get('postData') or {}
+    body = post_data.get('text') or ''
+    if not body and post_data.get('params'):
+        body = '&'.join(f"{p.get('name', '')}={p.get('value', '')}" for p in post_data['params'])
+
+    timestamp = ''
+    started = entry.get('startedDateTime')
+    if started:
+        try:
+            timestamp = datetime.fromisoformat(started.replace('Z', '+00:00')).astimezone().strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            timestamp = started
+
+    return {
+        'method': method,
+        'url': url,
+        'headers': header_data(headers),
+        'body': body,
+        'timeout': 30,
+        'timestamp': timestamp
+    }
+
+
+def import_har(source: Union[str, TextIO], chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    导入HAR文件，逐条产出历史记录格式的请求
+
+    Args:
+        source: HAR文件路径或文本文件对象
+        chunk_size: 每次读取的字符数
+
+    Yields:
+        历史记录字典
+    """
+    for entry in iter_har_entries(source, chunk_size):
+        item = har_entry_to_history(entry)
+        if item:
+            yield item
+
+
+def history_to_har_entry(item: Dict) -> Dict:
+    """
+    将历史记录转换为HAR entry
+
+    Args:
+        item: 历史记录字典
+
+    Returns:
+        HAR entry 字典
+    """
+    timestamp = item.get('timestamp', '')
+    try:
+        started = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S').astimezone().isoformat()
+    except ValueError:
+        started = datetime.now().astimezone().isoformat()
+
+    headers = Headers(item.get('headers') or {})
+    body = item.get('body') or ''
+    request = {
+        'method': item.get('method', 'GET'),
+        'url': item.get('url', ''),
+        'httpVersion': 'HTTP/1.1',
+        'cookies': [],
+        'headers': [{'name': k, 'value': v} for k, v in headers.items()],
+        'queryString': [],
+        'headersSize': -1,
+        'bodySize': len(body.encode('utf-8'))
+    }
+    if body:
+        mime_type = headers.get('Content-Type', '')
+        request['postData'] = {'mimeType': mime_type, 'text': body}
+
+    # 离线加载的原始响应会保存在历史记录的 response 字段中
+    saved = item.get('response') or {}
+    response_headers = Headers(saved.get('headers') or {})
+    response_body = saved.get('body') or ''
+    response = {
+        'status': saved.get('status_code', 0),
+        'statusText': saved.get('reason', ''),
+        'httpVersion': 'HTTP/1.1',
+        'cookies': [],
+        'headers': [{'name': k, 'value': v} for k, v in response_headers.items()],
+        'content': {
+            'size': len(response_body.encode('utf-8')),
+            'mimeType': response_headers.get('Content-Type', '')
+        },
+        'redirectURL': '',
+        'headersSize': -1,
+        'bodySize': -1
+    }
+    if response_body:
+        response['content']['text'] = response_body
+
+    return {
+        'startedDateTime': started,
+        'time': 0,
+        'request': request,
+        'response': response,
+        'cache': {},
+        'timings': {'send': 0, 'wait': 0, 'receive': 0}
+    }
+
+
+def export_har(history: Iterable[Dict], target: Union[str, TextIO]) -> int:
+    """
+    将历史记录逐条写出为HAR文件
+
+    Args:
+        history: 历史记录可迭代对象
+        target: 输出文件路径或文本文件对象
+
+    Returns:
+        写出的 entry 数量
+    """
+    if isinstance(target, str):
+        with open(target, 'w', encoding='utf-8') as f:
+            return export_har(history, f)
+
+    from version import __version__
+
+    creator = json.dumps({'name': 'PyHttpRequests', 'version': __version__}, ensure_ascii=False)
+    target.write(f'{{"log": {{"version": "{HAR_VERSION}", "creator": {creator}, "entries": [')
+
+    count = 0
+    for item in history:
+        if count:
+            target.write(',')
+        target.write('\n')
+        target.write(json.dumps(history_to_har_entry(item), ensure_ascii=False))
+        count += 1
+
+    target.write('\n]}}\n')
+    return count
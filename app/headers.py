@@ -0,0 +1,190 @@
+"""
+HTTP头部容器
+按原始顺序保存全部字段（允许重复，例如多个 Set-Cookie），
+同时维护不区分大小写的索引，按名称查找为 O(1)
+"""
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+
+# 合并重复字段时使用的分隔符，其余字段按 RFC 9110 用逗号合并
+_JOIN_SEPARATORS = {
+    'cookie': '; ',
+}
+
+
+class Headers:
+    """
+    不区分大小写的多值头部
+
+    headers['content-type'] 和 get() 返回第一个值，get_all() 返回全部值；
+    items() 按原始顺序返回全部 (名称, 值)，包括重复的字段。
+    """
+
+    __slots__ = ('_names', '_values', '_index')
+
+    def __init__(self, data: Union['Headers', Mapping[str, str], Iterable[Tuple[str, str]], None] = None):
+        self._names: List[str] = []
+        self._values: List[str] = []
+        # 小写名称 -> 字段位置列表
+        self._index: Dict[str, List[int]] = {}
+        if data is not None:
+            self.extend(data)
+
+    def add(self, name: str, value: str):
+        """追加一个字段，不覆盖同名字段"""
+        key = name.lower()
+        positions = self._index.get(key)
+        if positions is None:
+            self._index[key] = [len(self._names)]
+        else:
+            positions.append(len(self._names))
+        self._names.append(name)
+        self._values.append(value)
+
+    def extend(self, data: Union['Headers', Mapping[str, str], Iterable[Tuple[str, str]]]):
+        """追加多个字段"""
+        pairs = data.items() if hasattr(data, 'items') else data
+        for name, value in pairs:
+            self.add(name, value)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """返回第一个同名字段的值"""
+        positions = self._index.get(name.lower())
+        return self._values[positions[0]] if positions else default
+
+    def get_all(self, name: str) -> List[str]:
+        """按顺序返回全部同名字段的值"""
+        return [self._values[i] for i in self._index.get(name.lower(), ())]
+
+    def __getitem__(self, name: str) -> str:
+        positions = self._index.get(name.lower())
+        if not positions:
+            raise KeyError(name)
+        return self._values[positions[0]]
+
+    def __setitem__(self, name: str, value: str):
+        """设置字段，替换全部同名字段（与字典赋值一致）"""
+        positions = self._index.get(name.lower())
+        if not positions:
+            self.add(name, value)
+            return
+        first = positions[0]
+        self._names[first] = name
+        self._values[first] = value
+        if len(positions) > 1:
+            self._remove(positions[1:])
+
+    def __delitem__(self, name: str):
+        positions = self._index.get(name.lower())
+        if not positions:
+            raise KeyError(name)
+        self._remove(positions)
+
+    def _remove(self, positions: List[int]):
+        removed = set(positions)
+        pairs = [(n, v) for i, (n, v) in enumerate(zip(self._names, self._values)) if i not in removed]
+        self._names, self._values, self._index = [], [], {}
+        self.extend(pairs)
+
+    def pop(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """删除全部同名字段并返回第一个值"""
+        value = self.get(name, default)
+        if name.lower() in self._index:
+            del self[name]
+        return value
+
+    def setdefault(self, name: str, value: str) -> str:
+        if name.lower() not in self._index:
+            self.add(name, value)
+        return self[name]
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and name.lower() in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        """按首次出现的顺序返回不重复的名称"""
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        """字段总数（重复字段分别计数）"""
+        return len(self._names)
+
+    def keys(self) -> List[str]:
+        """不重复的名称，保留首次出现时的大小写"""
+        return [self._names[positions[0]] for positions in self._index.values()]
+
+    def values(self) -> List[str]:
+        return list(self._values)
+
+    def items(self) -> List[Tuple[str, str]]:
+        """全部字段，按原始顺序，包括重复项"""
+        return list(zip(self._names, self._values))
+
+    def copy(self) -> 'Headers':
+        return Headers(self.items())
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        转换为普通字典（用于 requests 发送，requests 不支持重复字段），重复字段合并为一个值；
+        保存时使用 header_data()，不会丢失重复字段
+
+        Returns:
+            {名称: 值}，Cookie 用 "; " 合并，其余用 ", " 合并
+        """
+        result = {}
+        for key, positions in self._index.items():
+            name = self._names[positions[0]]
+            if len(positions) == 1:
+                result[name] = self._values[positions[0]]
+            else:
+                separator = _JOIN_SEPARATORS.get(key, ', ')
+                result[name] = separator.join(self._values[i] for i in positions)
+        return result
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Headers):
+            return self.items() == other.items()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Headers({self.items()!r})"
+
+
+def has_duplicates(headers: Headers) -> bool:
+    """是否有重复的字段（如多个 Set-Cookie）"""
+    return len(headers.keys()) != len(headers)
+
+
+def header_data(headers: Union[Headers, Mapping[str, str], Iterable[Tuple[str, str]], None]
+                ) -> Union[Dict[str, str], List[List[str]]]:
+    """
+    转换为可 JSON 序列化的数据（用于历史记录、集合和保存的请求）
+
+    没有重复字段时为 {名称: 值}，与之前保存的格式相同；
+    有重复字段时为 [[名称, 值], ...]，按原始顺序保留每个字段。
+    两种格式都可以直接传给 Headers() 读回。
+    """
+    if headers is None:
+        return {}
+    headers = headers if isinstance(headers, Headers) else Headers(headers)
+    if has_duplicates(headers):
+        return [[name, value] for name, value in headers.items()]
+    return dict(headers.items())
+
+
+def response_headers(response) -> Headers:
+    """
+    读取 requests 响应的全部头部，保留重复字段（requests 的 response.headers 会合并它们）
+
+    Args:
+        response: requests.Response 对象
+
+    Returns:
+        Headers 对象
+    """
+    raw_headers = getattr(response.raw, 'headers', None)
+    if raw_headers is not None and hasattr(raw_headers, 'getlist'):
+        return Headers((name, value) for name in raw_headers for value in raw_headers.getlist(name))
+    return Headers(response.headers.items())
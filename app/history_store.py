@@ -0,0 +1,190 @@
+"""
+历史记录持久化
+在后台线程中合并、延迟写入历史记录，避免在GUI线程上进行磁盘I/O
+"""
+import os
+import json
+import tempfile
+import threading
+import time
+from typing import List, Dict, Iterator, Optional
+
+from json_stream import JsonStreamReader
+
+
+HISTORY_FILE_NAME = '.http_client_history.json'
+
+
+def get_history_file() -> str:
+    """获取历史记录文件路径"""
+    return os.path.join(os.path.expanduser('~'), HISTORY_FILE_NAME)
+
+
+def load_history(path: Optional[str] = None) -> List[Dict]:
+    """
+    从文件加载历史记录
+
+    Args:
+        path: 历史记录文件路径，默认为用户主目录下的历史文件
+
+    Returns:
+        历史记录列表，文件不存在或损坏时返回空列表
+    """
+    path = path or get_history_file()
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                return data
+    except Exception:
+        pass
+    return []
+
+
+def iter_history_pages(path: Optional[str] = None, page_size: int = 100) -> Iterator[List[Dict]]:
+    """
+    分页流式读取历史记录文件
+
+    Args:
+        path: 历史记录文件路径，默认为用户主目录下的历史文件
+        page_size: 每页的记录数
+
+    Yields:
+        历史记录列表（每页最多 page_size 条）
+    """
+    path = path or get_history_file()
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        page = []
+        for item in JsonStreamReader(f).iter_array_items():
+            if isinstance(item, dict):
+                page.append(item)
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+
+def write_history_atomic(path: str, history: List[Dict]):
+    """
+    原子写入历史记录（先写临时文件，再重命名覆盖）
+
+    Args:
+        path: 目标文件路径
+        history: 历史记录列表
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.http_client_history.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class HistoryWriter:
+    """
+    历史记录后台写入器
+
+    schedule() 只记录最新的历史快照并立即返回；后台线程在最后一次修改
+    之后等待 delay 秒再写盘，期间的多次修改会被合并为一次写入。
+    """
+
+    def __init__(self, path: Optional[str] = None, delay: float = 0.5):
+        self.path = path or get_history_file()
+        self.delay = delay
+        self.write_count = 0
+        self.last_error = None
+
+        self._condition = threading.Condition()
+        self._pending = None        # 待写入的快照
+        self._deadline = 0.0        # 最早写入时间
+        self._writing = False
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name='HistoryWriter', daemon=True)
+        self._thread.start()
+
+    def schedule(self, history: List[Dict]):
+        """
+        提交历史记录快照（不阻塞）
+
+        Args:
+            history: 历史记录列表，会被浅拷贝保存
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._pending = list(history)
+            self._deadline = time.monotonic() + self.delay
+            self._condition.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        立即写入待处理的快照并等待完成
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            是否在超时前写入完成
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._deadline = 0.0
+            self._condition.notify()
+            while self._pending is not None or self._writing:
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """写入剩余数据并停止后台线程（程序退出时调用）"""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        """后台线程主循环"""
+        while True:
+            with self._condition:
+                while True:
+                    if self._pending is not None:
+                        wait = self._deadline - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._condition.wait(wait)
+                    elif self._closed:
+                        return
+                    else:
+                        self._condition.wait()
+
+                snapshot = self._pending
+                self._pending = None
+                self._writing = True
+
+            try:
+                write_history_atomic(self.path, snapshot)
+                self.write_count += 1
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)  # 静默失败，保留错误信息
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
@@ -1,26 +1,226 @@
 """
 HTTP请求解析器
-解析原始HTTP请求文本，提取方法、URL、请求头和请求体
+解析原始HTTP请求文本，提取方法、URL、请求头和请求体；
+同时提供原始HTTP响应的流式解析（分块传输、内容解压）
 """
+import os
 import re
 import json
+import zlib
+import base64
 import urllib.parse
-from typing import Dict, Tuple, Optional, List
+from typing import BinaryIO, Dict, Iterator, Tuple, Optional, List, TextIO, Union
+
+from headers import Headers, header_data
+from multipart_form import MultipartError, format_multipart, get_boundary, parse_form_spec, parse_form_specs
+from query_params import parse_query_pairs
+from tracing import traced
+
+
+# 批量解析时每次读取的字节数
+BULK_CHUNK_SIZE = 256 * 1024
+
+# 支持的HTTP方法
+VALID_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS', 'CONNECT', 'TRACE')
+
+# 请求头与请求体之间的空行
+_HEAD_END_RE = re.compile(rb'\r?\n\r?\n')
+# 行首的请求行，用于确定没有 Content-Length 的请求体在哪里结束
+_REQUEST_LINE_RE = re.compile(
+    rb'^(?:GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS|CONNECT|TRACE) [^ \r\n]+(?: HTTP/\d(?:\.\d)?)?\r?$',
+    re.MULTILINE
+)
+_LEADING_BLANK_RE = re.compile(rb'[ \t\r\n]*')
+
+# 字节级解析：以下正则都直接作用于 bytes/bytearray/memoryview，按偏移量逐行匹配
+_START_LINE_RE = re.compile(rb'([A-Za-z]+)[ \t]+([^ \t\r\n]+)(?:[ \t]+([^ \t\r\n]+))?[ \t]*(?:\r?\n|\r?\Z)')
+_HEAD_BREAK_RE = re.compile(rb'\n\r?\n')
+# 请求头行：group(1) 为名称；以空白开头的续行（obs-fold）没有 group(1)
+_FIELD_LINE_RE = re.compile(rb'^(?:(:?[^:\r\n \t][^:\r\n]*):|[ \t])[ \t]*((?:[^\r\n]*[^ \t\r\n])?)[ \t]*\r?$', re.MULTILINE)
+_FOLD_RE = re.compile(r'\r?\n[ \t]+')
+# 文本中请求头与请求体之间的空行（与 _HEAD_BREAK_RE 相同的判断）
+_TEXT_HEAD_END_RE = re.compile(r'\n\r?\n')
+
+
+class HTTPParseError(ValueError):
+    """原始请求格式错误"""
+
+
+class RawHTTPRequest:
+    """
+    字节级解析结果
+
+    请求头只记录偏移量 (name_start, name_end, value_start, value_end)，
+    按需解码；请求体通过 body 属性以 memoryview 返回，不复制数据。
+    """
+
+    __slots__ = ('data', 'method', 'target', 'version', 'header_spans', 'head_end', 'body_start', 'body_end')
+
+    def __init__(self, data, method: str, target: str, version: str, header_spans: List[Tuple[int, int, int, int]],
+                 head_end: int, body_start: int, body_end: int):
+        self.data = data
+        self.method = method
+        self.target = target
+        self.version = version
+        self.header_spans = header_spans
+        self.head_end = head_end
+        self.body_start = body_start
+        self.body_end = body_end
+
+    def header_name(self, index: int) -> str:
+        """第 index 个请求头的名称"""
+        name_start, name_end, _, _ = self.header_spans[index]
+        return bytes(self.data[name_start:name_end]).decode('latin-1').strip()
+
+    def header_value(self, index: int) -> str:
+        """第 index 个请求头的值，续行合并为单个空格"""
+        _, _, value_start, value_end = self.header_spans[index]
+        value = bytes(self.data[value_start:value_end]).decode('utf-8', errors='replace')
+        if '\n' in value:
+            value = _FOLD_RE.sub(' ', value)
+        return value
+
+    def headers(self) -> List[Tuple[str, str]]:
+        """按原始顺序返回全部请求头（保留重复项）"""
+        return [(self.header_name(i), self.header_value(i)) for i in range(len(self.header_spans))]
+
+    def get_header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """按名称（不区分大小写）查找第一个请求头"""
+        name = name.lower()
+        for i in range(len(self.header_spans)):
+            if self.header_name(i).lower() == name:
+                return self.header_value(i)
+        return default
+
+    @property
+    def content_length(self) -> Optional[int]:
+        """Content-Length 请求头的值，缺失或无效时为 None"""
+        data = self.data
+        for name_start, name_end, value_start, value_end in self.header_spans:
+            if bytes(data[name_start:name_end]).strip().lower() == b'content-length':
+                value = bytes(data[value_start:value_end])
+                return int(value) if value.isdigit() else None
+        return None
+
+    @property
+    def body(self) -> memoryview:
+        """请求体的零拷贝视图（二进制数据原样保留）"""
+        return memoryview(self.data)[self.body_start:self.body_end]
+
+    @property
+    def end(self) -> int:
+        """本请求在缓冲区中的结束位置"""
+        return self.body_end
+
+
+# 解析结果的字段，按旧版结果字典的键顺序排列
+RESULT_KEYS = ('method', 'path', 'url', 'protocol', 'headers', 'body', 'success', 'error')
+
+
+class _ResultMapping:
+    """让解析结果支持 result['method']、result.get('body') 等字典式访问"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        if key not in RESULT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in RESULT_KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in RESULT_KEYS
+
+    def __iter__(self):
+        return iter(RESULT_KEYS)
+
+    def __len__(self) -> int:
+        return len(RESULT_KEYS)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in RESULT_KEYS else default
+
+    def keys(self):
+        return RESULT_KEYS
+
+    def values(self) -> list:
+        return [getattr(self, key) for key in RESULT_KEYS]
+
+    def items(self) -> list:
+        return [(key, getattr(self, key)) for key in RESULT_KEYS]
+
+    def to_dict(self) -> Dict[str, any]:
+        """转换为普通字典（例如需要 JSON 序列化时）"""
+        return dict(self.items())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (_ResultMapping, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class ParsedRequest(_ResultMapping):
+    """解析成功的请求，字段与旧版结果字典相同"""
+
+    __slots__ = ('method', 'path', 'url', 'protocol', 'headers', 'body')
+
+    success = True
+    error = ''
+
+    def __init__(self, method: str, path: str, url: str, protocol: str = 'HTTP/1.1',
+                 headers: Optional[Headers] = None, body: str = ''):
+        self.method = method
+        self.path = path
+        self.url = url
+        self.protocol = protocol
+        self.headers = headers if headers is not None else Headers()
+        self.body = body
+
+
+class ParseError(_ResultMapping):
+    """解析失败的结果，只保存错误信息，其余字段为空"""
+
+    __slots__ = ('error',)
+
+    success = False
+    method = ''
+    path = ''
+    url = ''
+    protocol = 'HTTP/1.1'
+    body = ''
+
+    def __init__(self, error: str):
+        self.error = error
+
+    @property
+    def headers(self) -> Headers:
+        return Headers()
+
+    def __bool__(self) -> bool:
+        return False
 
 
 class HTTPRequestParser:
     """HTTP请求解析器"""
 
     @staticmethod
-    def parse(raw_request: str) -> Dict[str, any]:
+    @traced('HTTPRequestParser.parse', 'parser')
+    def parse(raw_request: Union[str, bytes]) -> Union[ParsedRequest, ParseError]:
         """
         解析原始HTTP请求文本
 
         Args:
-            raw_request: 原始HTTP请求文本
+            raw_request: 原始HTTP请求文本（也可以是字节数据）
 
         Returns:
-            包含解析结果的字典:
+            ParsedRequest 或 ParseError，支持按以下键进行字典式访问:
             {
                 'method': str,      # 请求方法 (GET, POST, etc.)
                 'path': str,        # 请求路径
@@ -32,84 +232,117 @@ class HTTPRequestParser:
                 'error': str        # 错误信息（如果有）
             }
         """
-        result = {
-            'method': '',
-            'path': '',
-            'url': '',
-            'protocol': 'HTTP/1.1',
-            'headers': {},
-            'body': '',
-            'success': False,
-            'error': ''
-        }
-
         try:
-            # 分离请求头和请求体
-            parts = raw_request.split('\n\n', 1)
-            if len(parts) == 0:
-                parts = raw_request.split('\r\n\r\n', 1)
-
-            header_section = parts[0]
-            body_section = parts[1] if len(parts) > 1 else ''
-
-            # 按行分割请求头部分
-            lines = header_section.strip().split('\n')
-            if not lines:
-                result['error'] = '请求文本为空'
-                return result
-
-            # 解析请求行 (第一行)
-            request_line = lines[0].strip()
-            method, path, protocol = HTTPRequestParser._parse_request_line(request_line)
-
-            if not method:
-                result['error'] = '无法解析请求行'
-                return result
+            data = raw_request.encode('utf-8') if isinstance(raw_request, str) else raw_request
+            raw = HTTPRequestParser.parse_bytes(data, framing=False)
+            body = bytes(raw.body).decode('utf-8', errors='replace').strip()
+            return HTTPRequestParser.to_result(raw, body)
 
-            result['method'] = method
-            result['path'] = path
-            result['protocol'] = protocol
-
-            # 解析请求头
-            headers = {}
-            host = ''
-
-            for line in lines[1:]:
-                line = line.strip()
-                if not line:
-                    continue
+        except HTTPParseError as e:
+            return ParseError(str(e))
+        except Exception as e:
+            return ParseError(f'解析失败: {str(e)}')
 
-                # 解析 Key: Value 格式
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    headers[key] = value
+    @staticmethod
+    def parse_bytes(data: Union[bytes, bytearray, memoryview], start: int = 0, framing: bool = True) -> RawHTTPRequest:
+        """
+        字节级解析单个原始HTTP/1.x请求，只扫描一遍数据
 
-                    # 提取Host用于构建完整URL
-                    if key.lower() == 'host':
-                        host = value
+        同时支持 CRLF 和 LF 换行、以空白开头的续行（obs-fold）以及二进制请求体。
+        请求头以偏移量记录，请求体不复制。
 
-            result['headers'] = headers
+        Args:
+            data: 原始请求数据
+            start: 请求在 data 中的起始位置（会跳过开头的空行）
+            framing: 为 True 时按 Content-Length 截取请求体（没有时请求体为空），
+                为 False 时请求体延续到数据末尾（用于粘贴的单个请求）
 
-            # 构建完整URL
-            if host:
-                # 判断协议 (http/https)
-                scheme = 'https' if ':443' in host or 'https' in host.lower() else 'http'
-                result['url'] = f"{scheme}://{host}{path}"
-            else:
-                result['url'] = path
+        Returns:
+            RawHTTPRequest 对象
 
-            # 解析请求体
-            result['body'] = body_section.strip()
+        Raises:
+            HTTPParseError: 数据为空或请求行无效
+        """
+        size = len(data)
+        pos = _LEADING_BLANK_RE.match(data, start).end()
+        if pos >= size:
+            raise HTTPParseError('请求文本为空')
+
+        match = _START_LINE_RE.match(data, pos)
+        if not match:
+            raise HTTPParseError('无法解析请求行')
+        method = bytes(match.group(1)).decode('ascii').upper()
+        if method not in VALID_METHODS:
+            raise HTTPParseError('无法解析请求行')
+        target = bytes(match.group(2)).decode('utf-8', errors='replace')
+        version = bytes(match.group(3)).decode('ascii', errors='replace') if match.group(3) else 'HTTP/1.1'
+        pos = match.end()
+
+        # 请求行之后紧跟的空行标志请求头结束（pos - 1 是请求行末尾的换行符）
+        head_end = body_start = size
+        if pos < size:
+            match = _HEAD_BREAK_RE.search(data, pos - 1)
+            if match:
+                head_end, body_start = match.start() + 1, match.end()
+
+        spans = []
+        for match in _FIELD_LINE_RE.finditer(data, pos, head_end):
+            value_start, value_end = match.span(2)
+            if match.start(1) >= 0:
+                spans.append(match.span(1) + (value_start, value_end))
+            elif spans and value_end > value_start:
+                # 续行：把值的结束位置延伸到本行
+                name_start, name_end, first_start, first_end = spans[-1]
+                spans[-1] = (name_start, name_end, first_start if first_end > first_start else value_start, value_end)
+
+        raw = RawHTTPRequest(data, method, target, version, spans, head_end, body_start, size)
+        if framing:
+            length = raw.content_length
+            raw.body_end = min(body_start + length, size) if length is not None else body_start
+        return raw
 
-            result['success'] = True
+    @staticmethod
+    def to_result(raw: RawHTTPRequest, body: str) -> ParsedRequest:
+        """
+        把字节级解析结果转换为 parse 方法的结果
 
-        except Exception as e:
-            result['error'] = f'解析失败: {str(e)}'
-            result['success'] = False
+        Args:
+            raw: parse_bytes 的返回值
+            body: 已解码的请求体文本
 
-        return result
+        Returns:
+            ParsedRequest 对象
+        """
+        headers = Headers()
+        host = ''
+        data = raw.data
+        for name_start, name_end, value_start, value_end in raw.header_spans:
+            key = bytes(data[name_start:name_end]).decode('latin-1').strip()
+            value = bytes(data[value_start:value_end]).decode('utf-8', errors='replace')
+            if '\n' in value:
+                value = _FOLD_RE.sub(' ', value)
+            if key.startswith(':'):
+                # HTTP/2 伪头部只用来补全主机名
+                if key == ':authority':
+                    host = value
+                continue
+            headers.add(key, value)
+        host = headers.get('host', host)
+
+        path = raw.target
+        if path.startswith('http://') or path.startswith('https://'):
+            # 代理日志中的绝对形式请求目标
+            parsed = urllib.parse.urlsplit(path)
+            url = path
+            path = urllib.parse.urlunsplit(('', '', parsed.path or '/', parsed.query, parsed.fragment))
+        elif host:
+            # 判断协议 (http/https)
+            scheme = 'https' if ':443' in host or 'https' in host.lower() else 'http'
+            url = f"{scheme}://{host}{path}"
+        else:
+            url = path
+
+        return ParsedRequest(raw.method, path, url, raw.version, headers, body)
 
     @staticmethod
     def _parse_request_line(line: str) -> Tuple[str, str, str]:
@@ -132,8 +365,7 @@ class HTTPRequestParser:
         protocol = parts[2] if len(parts) > 2 else 'HTTP/1.1'
 
         # 验证HTTP方法
-        valid_methods = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS', 'CONNECT', 'TRACE']
-        if method not in valid_methods:
+        if method not in VALID_METHODS:
             return '', '', ''
 
         return method, path, protocol
@@ -177,192 +409,227 @@ class HTTPRequestParser:
             return False, '请求行格式不正确，应为: METHOD PATH [PROTOCOL]'
 
         # 验证HTTP方法
-        valid_methods = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS', 'CONNECT', 'TRACE']
         method = parts[0].upper()
 
-        if method not in valid_methods:
+        if method not in VALID_METHODS:
             return False, f'不支持的HTTP方法: {method}'
 
         return True, ''
 
     @staticmethod
-    def parse_curl_command(curl_command: str) -> Dict[str, any]:
+    @traced('HTTPRequestParser.parse_curl_command', 'parser')
+    def parse_curl_command(curl_command: str, base_dir: Optional[str] = None) -> Union[ParsedRequest, ParseError]:
         """
         解析cURL命令，转换为HTTP请求格式
 
+        支持 bash/PowerShell 的续行和 $'...' 引号、Windows cmd 的 ^ 转义和续行
+        （Chrome“复制为 cURL (cmd)”）以及组合短选项（如 -sSL、-XPOST）。
+        选项的含义由 _CURL_OPTIONS 表定义，表中没有的选项和未闭合的引号返回 ParseError。
+
         Args:
             curl_command: cURL命令字符串
+            base_dir: 解析 -d @file 等相对路径时使用的目录，默认为当前目录
 
         Returns:
-            包含解析结果的字典，格式与parse方法相同
+            ParsedRequest 或 ParseError，格式与parse方法相同
         """
-        result = {
-            'method': 'GET',
-            'path': '',
-            'url': '',
-            'protocol': 'HTTP/1.1',
-            'headers': {},
-            'body': '',
-            'success': False,
-            'error': ''
-        }
-
         try:
-            import shlex
-            args = shlex.split(curl_command)
-
-            url = ''
-            method = 'GET'
-            headers = {}
-            data = ''
-
-            i = 0
-            while i < len(args):
-                arg = args[i]
+            for args in _iter_shell_commands(curl_command):
+                curl_args = _curl_arguments(args)
+                if curl_args is not None:
+                    return HTTPRequestParser._parse_curl_args(curl_args, base_dir)
+        except Exception as e:
+            return ParseError(f'cURL命令解析失败: {str(e)}')
 
-                if arg == 'curl':
-                    # 下一个参数是URL（除非是其他选项）
-                    if i + 1 < len(args) and not args[i + 1].startswith('-'):
-                        url = args[i + 1]
-                        i += 1
-                elif arg == '-X':
-                    # HTTP方法
-                    if i + 1 < len(args):
-                        method = args[i + 1].upper()
-                        i += 1
-                elif arg == '-H' or arg == '--header':
-                    # 请求头
-                    if i + 1 < len(args):
-                        header_line = args[i + 1]
-                        if ':' in header_line:
-                            key, value = header_line.split(':', 1)
-                            headers[key.strip()] = value.strip()
-                        i += 1
-                elif arg == '-d' or arg == '--data' or arg == '--data-raw':
-                    # 请求数据
-                    if i + 1 < len(args):
-                        data = args[i + 1]
-                        i += 1
-                elif arg == '--data-urlencode':
-                    # URL编码的数据
-                    if i + 1 < len(args):
-                        data = args[i + 1]
-                        i += 1
-                elif arg == '--form' or arg == '-F':
-                    # 表单数据
-                    if i + 1 < len(args):
-                        form_data = args[i + 1]
-                        if '=' in form_data:
-                            key, value = form_data.split('=', 1)
-                            if not data:
-                                data = ''
-                            if data:
-                                data += '&'
-                            data += f"{urllib.parse.quote(key)}={urllib.parse.quote(value)}"
-                        i += 1
-                elif arg.startswith('-') and not arg.startswith('--'):
-                    # 单字符选项可能带参数
-                    single_char_opts = ['d', 'H', 'X', 'F']
-                    for opt in single_char_opts:
-                        if arg.startswith(f'-{opt}') and len(arg) > 2:
-                            # -d"data" 格式
-                            param = arg[2:]
-                            if opt == 'd':
-                                data = param.strip('"\'')
-                            elif opt == 'H':
-                                if ':' in param:
-                                    key, value = param.split(':', 1)
-                                    headers[key.strip()] = value.strip()
-                            elif opt == 'X':
-                                method = param.upper()
-                elif arg.startswith('--') and '=' in arg:
-                    # 长选项带等号格式
-                    if arg.startswith('--data='):
-                        data = arg[7:].strip('"\'')
-                    elif arg.startswith('--header='):
-                        header_line = arg[9:].strip('"\'')
-                        if ':' in header_line:
-                            key, value = header_line.split(':', 1)
-                            headers[key.strip()] = value.strip()
+        return ParseError('无法从cURL命令中提取URL')
 
-                i += 1
+    @staticmethod
+    def iter_curl_commands(source: Union[str, TextIO], base_dir: Optional[str] = None) -> Iterator[Union[ParsedRequest, ParseError]]:
+        """
+        从 shell 脚本或浏览器“全部复制为cURL”的内容中提取并解析全部 curl 命令
 
-            # 如果没有找到URL，尝试从参数中提取
-            if not url:
-                for arg in args:
-                    if not arg.startswith('-') and arg != 'curl' and ('http://' in arg or 'https://' in arg):
-                        url = arg
-                        break
+        Args:
+            source: 脚本文件路径或文本文件对象
+            base_dir: 解析 @file 相对路径的目录，默认为脚本所在目录
 
-            # 如果还是没有URL，尝试查找任何看起来像URL的参数
-            if not url:
-                for arg in args:
-                    if not arg.startswith('-') and arg != 'curl' and '.' in arg and '/' in arg:
-                        url = arg
-                        break
+        Yields:
+            每个 curl 命令的解析结果（与 parse_curl_command 相同）
+        """
+        if isinstance(source, str):
+            if base_dir is None:
+                base_dir = os.path.dirname(os.path.abspath(source))
+            with open(source, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        else:
+            text = source.read()
+
+        commands = _iter_shell_commands(text)
+        while True:
+            try:
+                args = next(commands, None)
+                if args is None:
+                    break
+                curl_args = _curl_arguments(args)
+                if curl_args is None:
+                    continue
+                result = HTTPRequestParser._parse_curl_args(curl_args, base_dir)
+            except ValueError as e:
+                # 词法错误（如引号没有闭合）之后的内容无法继续切分
+                yield ParseError(f'cURL命令解析失败: {str(e)}')
+                break
+            except Exception as e:
+                result = ParseError(f'cURL命令解析失败: {str(e)}')
+            yield result
 
-            if not url:
-                result['error'] = '无法从cURL命令中提取URL'
-                return result
+    @staticmethod
+    def _parse_curl_args(args: List[str], base_dir: Optional[str]) -> Union[ParsedRequest, ParseError]:
+        """按 _CURL_OPTIONS 表处理 curl 之后的参数"""
+        state = {
+            'method': None,
+            'url': '',
+            'headers': Headers(),
+            'data': [],
+            'form': [],
+            'get': False,
+            'upload_name': '',
+            'base_dir': base_dir or os.getcwd(),
+            'error': ''
+        }
 
-            # 确定协议和路径
-            if url.startswith('http://') or url.startswith('https://'):
-                # 完整URL
-                parsed = urllib.parse.urlparse(url)
-                path = parsed.path or '/'
-                if parsed.query:
-                    path += '?' + parsed.query
-                if parsed.fragment:
-                    path += '#' + parsed.fragment
-
-                result['url'] = url
-                result['path'] = path
+        i = 0
+        options_done = False
+        while i < len(args):
+            arg = args[i]
+            i += 1
+
+            if options_done or not arg.startswith('-') or arg == '-':
+                # 第一个非选项参数是URL
+                if not state['url']:
+                    state['url'] = arg
+                continue
+
+            if arg == '--':
+                options_done = True
+                continue
+
+            if arg.startswith('--'):
+                name, has_value, value = arg.partition('=')
+                option = _CURL_OPTIONS.get(name)
+                if option is None and name.startswith('--no-'):
+                    # --no-xxx 关闭一个开关选项
+                    option = _CURL_OPTIONS.get('--' + name[5:])
+                    option = (None, False) if option is not None and not option[1] else None
+                if option is None:
+                    state['error'] = f'不支持的 cURL 选项: {name}'
+                    break
+                handler, takes_value = option
+                if takes_value and not has_value:
+                    value = args[i] if i < len(args) else ''
+                    i += 1
+                if handler:
+                    handler(state, value)
+                continue
+
+            # 短选项，可能组合在一起：-sSL、-XPOST、-H"Accept: */*"
+            for position in range(1, len(arg)):
+                option = _CURL_OPTIONS.get('-' + arg[position])
+                if option is None:
+                    state['error'] = f'不支持的 cURL 选项: -{arg[position]}'
+                    break
+                handler, takes_value = option
+                if takes_value:
+                    value = arg[position + 1:]
+                    if not value:
+                        value = args[i] if i < len(args) else ''
+                        i += 1
+                    if handler:
+                        handler(state, value)
+                    break
+                if handler:
+                    handler(state, '')
+            if state['error']:
+                break
+
+        if state['error']:
+            return ParseError(state['error'])
+
+        url = state['url']
+        if not url:
+            return ParseError('无法从cURL命令中提取URL')
+        if state['upload_name'] and url.endswith('/'):
+            url += state['upload_name']
+        if '://' not in url and not url.startswith('/'):
+            # curl 默认使用 http
+            url = 'http://' + url
+
+        headers = state['headers']
+        data = '&'.join(state['data'])
+        method = state['method']
+
+        if state['form']:
+            # -F: 请求体编辑器中每行一个字段，发送时再流式编码为 multipart/form-data
+            if data:
+                return ParseError('-F 不能与 -d 同时使用')
+            data = '\n'.join(field.to_spec() for field in state['form'])
+            headers.setdefault('Content-Type', 'multipart/form-data')
+
+        if state['get'] and data:
+            # -G: 数据拼接到查询字符串
+            url += ('&' if '?' in url else '?') + data
+            data = ''
+            method = method or 'GET'
+
+        # 确定路径
+        if url.startswith('/'):
+            path = url
+        else:
+            parsed = urllib.parse.urlparse(url)
+            path = parsed.path or '/'
+            if parsed.query:
+                path += '?' + parsed.query
+            if parsed.fragment:
+                path += '#' + parsed.fragment
+
+        # 自动设置Content-Type
+        if data and 'content-type' not in headers:
+            if data.startswith('{') or data.startswith('['):
+                headers['Content-Type'] = 'application/json'
+            elif data.startswith('<'):
+                headers['Content-Type'] = 'application/xml'
             else:
-                # 相对URL
-                result['path'] = url
-                result['url'] = url
-
-            # 设置方法
-            result['method'] = method
-
-            # 自动设置Content-Type
-            if data and not any(h.lower() == 'content-type' for h in headers.keys()):
-                if data.startswith('{') or data.startswith('['):
-                    headers['Content-Type'] = 'application/json'
-                elif data.startswith('<'):
-                    headers['Content-Type'] = 'application/xml'
-                else:
-                    headers['Content-Type'] = 'application/x-www-form-urlencoded'
-
-            # 如果有数据但没有设置方法，自动设置为POST
-            if data and method == 'GET':
-                result['method'] = 'POST'
+                headers['Content-Type'] = 'application/x-www-form-urlencoded'
 
-            # 添加请求头
-            result['headers'] = headers
-
-            # 设置请求体
-            result['body'] = data
-
-            result['success'] = True
-
-        except Exception as e:
-            result['error'] = f'cURL命令解析失败: {str(e)}'
-            result['success'] = False
-
-        return result
+        # 有数据但没有指定方法时，curl 使用 POST
+        return ParsedRequest(method or ('POST' if data else 'GET'), path, url, 'HTTP/1.1', headers, data)
 
     @staticmethod
-    def format_form_data(data: str) -> Dict[str, str]:
+    def format_form_data(data: Union[str, bytes], content_type: Optional[str] = None) -> Dict[str, str]:
         """
         格式化表单数据
 
         Args:
             data: 表单数据字符串
+            content_type: 请求的 Content-Type；multipart/form-data 带 boundary 时按分隔行切分，
+                          不带 boundary 时按每行一个 curl -F 写法的字段解析
 
         Returns:
             解析后的表单数据字典
         """
+        if content_type and content_type.strip().lower().startswith('multipart/form-data'):
+            boundary = get_boundary(content_type)
+            try:
+                if boundary:
+                    return format_multipart(data.encode('utf-8') if isinstance(data, str) else data, boundary)
+                return {
+                    field.name: f'@{field.path}' if field.filename is not None else
+                    (f'<{field.path}' if field.is_file else field.value)
+                    for field in parse_form_specs(data)
+                }
+            except MultipartError:
+                return {'raw': data}
+
+        if isinstance(data, bytes):
+            data = data.decode('utf-8', errors='replace')
         result = {}
 
         try:
@@ -382,7 +649,7 @@ class HTTPRequestParser:
         return result
 
     @staticmethod
-    def format_query_string(query: str) -> Dict[str, str]:
+    def format_query_string(query: str) -> Dict[str, Union[str, List[str]]]:
         """
         格式化查询字符串
 
@@ -390,23 +657,946 @@ class HTTPRequestParser:
             query: 查询字符串
 
         Returns:
-            解析后的查询参数字典
+            解析后的查询参数字典，按首次出现的顺序；重复的参数值为列表（如 tag=a&tag=b 得到 ['a', 'b']）
         """
         result = {}
 
         try:
-            params = urllib.parse.parse_qs(query, keep_blank_values=True)
-            for key, values in params.items():
-                result[key] = values[0] if values else ''
+            for key, value in parse_query_pairs(query):
+                if key not in result:
+                    result[key] = value
+                elif isinstance(result[key], list):
+                    result[key].append(value)
+                else:
+                    result[key] = [result[key], value]
         except Exception:
             # 如果解析失败，返回原始查询字符串
             result['raw'] = query
 
         return result
 
+    @staticmethod
+    def iter_requests(source: Union[str, BinaryIO], chunk_size: int = BULK_CHUNK_SIZE) -> Iterator[Union[ParsedRequest, ParseError]]:
+        """
+        流式解析包含多个原始HTTP请求的文件（代理、WAF日志导出等）
+
+        请求之间以空行分隔；带 Content-Length 的请求按长度截取请求体，
+        否则请求体延续到下一个请求行之前。每次只在内存中保留当前请求。
+
+        Args:
+            source: 文件路径或以二进制模式打开的文件对象
+            chunk_size: 每次读取的字节数
+
+        Yields:
+            与 parse 方法格式相同的解析结果
+        """
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                yield from HTTPRequestParser.iter_requests(f, chunk_size)
+            return
+
+        buf = bytearray()
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal eof
+            if eof:
+                return False
+            chunk = source.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buf.extend(chunk)
+            return True
+
+        while True:
+            # 丢弃已解析的部分（只在两个请求之间压缩，保证偏移量在单个请求内有效）
+            if pos > chunk_size:
+                del buf[:pos]
+                pos = 0
+
+            # 跳过请求之间的空行
+            pos = _LEADING_BLANK_RE.match(buf, pos).end()
+            if pos >= len(buf):
+                if fill():
+                    continue
+                return
+
+            match = _HEAD_END_RE.search(buf, pos)
+            if not match:
+                if fill():
+                    continue
+                # 文件末尾没有空行的最后一个请求
+                head_end = body_start = len(buf)
+            else:
+                head_end, body_start = match.start(), match.end()
+
+            # 只解析请求头部分，请求体的边界由下面的分帧逻辑决定
+            try:
+                raw = HTTPRequestParser.parse_bytes(bytes(buf[pos:body_start]), framing=False)
+                error = ''
+            except HTTPParseError as e:
+                raw, error = None, str(e)
+            length = raw.content_length if raw is not None else None
+
+            if length is not None:
+                body_end = body_start + length
+                while len(buf) < body_end and fill():
+                    pass
+                body_end = next_pos = min(body_end, len(buf))
+            else:
+                # 请求体延续到下一个请求行
+                scan = body_start
+                while True:
+                    line_match = _REQUEST_LINE_RE.search(buf, scan)
+                    if line_match or eof:
+                        break
+                    # 只重新扫描可能被截断的最后一行
+                    scan = max(body_start, len(buf) - 64)
+                    fill()
+                body_end = next_pos = line_match.start() if line_match else len(buf)
+                # 去掉请求之间的分隔空行
+                while body_end > body_start and buf[body_end - 1] in b'\r\n':
+                    body_end -= 1
+
+            body = bytes(buf[body_start:body_end])
+            pos = next_pos
+
+            if raw is None:
+                yield ParseError(error)
+            else:
+                yield HTTPRequestParser.to_result(raw, body.decode('utf-8', errors='replace'))
+
+
+class IncrementalRequestParser:
+    """
+    实时预览使用的增量解析器
+
+    记住上次解析时空行之后的原文（请求体部分）。新文本仍以同样的请求体结尾、
+    且分隔空行位置不变时，只重新解析请求头，请求体直接复用上次的结果。
+    """
+
+    def __init__(self):
+        self._tail = None   # 上次原文中空行之后的部分
+        self._body = ''     # 上次解析得到的请求体
+        self.last_parse_was_partial = False
+
+    @traced('IncrementalRequestParser.parse', 'parser')
+    def parse(self, text: str) -> Union[ParsedRequest, ParseError]:
+        """
+        解析文本，尽量只重新解析请求头
+
+        Args:
+            text: 完整的原始请求文本
+
+        Returns:
+            与 HTTPRequestParser.parse 相同
+        """
+        start = len(text) - len(text.lstrip(' \t\r\n'))
+        tail = self._tail
+        if tail is not None and len(text) - start > len(tail) and text.endswith(tail):
+            head_length = len(text) - len(tail)
+            match = _TEXT_HEAD_END_RE.search(text, start, head_length)
+            if match and match.end() == head_length:
+                # 请求体没有变化：只解析请求头
+                result = HTTPRequestParser.parse(text[:head_length])
+                if result.success:
+                    result.body = self._body
+                self.last_parse_was_partial = True
+                return result
+
+        self.last_parse_was_partial = False
+        result = HTTPRequestParser.parse(text)
+        match = _TEXT_HEAD_END_RE.search(text, start)
+        if result.success and match:
+            self._tail = text[match.end():]
+            self._body = result.body
+        else:
+            self._tail = None
+            self._body = ''
+        return result
+
+
+# ---- cURL 命令解析 ----
+
+# shell 词法单元：续行、命令分隔符、注释、各种引号和普通字符
+_SHELL_TOKEN_RE = re.compile(r"""
+    (?P<space>[ \t]+|\\\r?\n|\^\r?\n|`\r?\n)
+  | (?P<sep>\r?\n|;|&&|\|\||\||&)
+  | (?P<comment>\#[^\n]*)
+  | (?P<redirect>\d*(?:>>|>|<)&?)
+  | (?P<ansi>\$'(?:[^'\\]|\\.)*')
+  | (?P<single>'[^']*')
+  | (?P<double>"(?:[^"\\]|\\.)*")
+  | (?P<escape>\\.)
+  | (?P<word>[^\s'"\\;&|<>]+|.)
+""", re.VERBOSE | re.DOTALL)
+
+_DOUBLE_QUOTE_ESCAPE_RE = re.compile(r'\\(\r?\n|[$`"\\])')
+_ANSI_ESCAPE_RE = re.compile(r"\\(x[0-9a-fA-F]{1,2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|[0-7]{1,3}|.)", re.DOTALL)
+_ANSI_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v', 'e': '\x1b', 'E': '\x1b'}
+
+
+def _ansi_unescape(match) -> str:
+    escape = match.group(1)
+    if escape[0] in 'xuU':
+        return chr(int(escape[1:], 16))
+    if escape[0] in '01234567':
+        return chr(int(escape, 8))
+    return _ANSI_ESCAPES.get(escape, escape)
+
+
+def _iter_shell_commands(text: str) -> Iterator[List[str]]:
+    """
+    把 shell 文本按命令分隔符（换行、;、&&、||、|）切分，逐条产出单词列表
+
+    只做引号、转义和续行处理，不展开变量；含有 ^" 或 ^ 续行时按 Windows cmd 处理，
+    见 _iter_cmd_commands()。引号没有闭合时抛出 ValueError。
+    """
+    if _CMD_SYNTAX_RE.search(text):
+        yield from _iter_cmd_commands(text)
+        return
+
+    args = []
+    word = None
+    skip_next = False
+
+    for match in _SHELL_TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        token = match.group()
+
+        if kind == 'comment' and word is not None:
+            kind = 'word'
+        elif kind == 'word' and token in ('"', "'"):
+            raise ValueError(f'引号没有闭合: {text[match.start():].splitlines()[0][:20]}')
+
+        if kind in ('space', 'sep', 'comment', 'redirect'):
+            if word is not None:
+                if not skip_next:
+                    args.append(word)
+                skip_next = False
+                word = None
+            if kind == 'redirect':
+                # 丢弃重定向目标
+                skip_next = True
+            elif kind == 'sep' and args:
+                yield args
+                args = []
+            continue
+
+        if kind == 'single':
+            piece = token[1:-1]
+        elif kind == 'double':
+            piece = _DOUBLE_QUOTE_ESCAPE_RE.sub(lambda m: '' if m.group(1) in ('\n', '\r\n') else m.group(1), token[1:-1])
+        elif kind == 'ansi':
+            piece = _ANSI_ESCAPE_RE.sub(_ansi_unescape, token[2:-1])
+        elif kind == 'escape':
+            piece = token[1]
+        else:
+            piece = token
+        word = piece if word is None else word + piece
+
+    if word is not None and not skip_next:
+        args.append(word)
+    if args:
+        yield args
+
+
+# Windows cmd 的 ^ 转义引号和 ^ 续行（Chrome “复制为 cURL (cmd)”的格式）
+_CMD_SYNTAX_RE = re.compile(r'\^"|\^\r?\n')
+
+
+def _split_msvcrt_args(command: str) -> List[str]:
+    """
+    按 MSVCRT 规则把命令行拆分为参数（即 curl.exe 收到的 argv）
+
+    2n 个反斜杠加引号得到 n 个反斜杠并切换引号状态，2n+1 个反斜杠加引号得到 n 个反斜杠和字面引号，
+    不在引号前的反斜杠原样保留；引号内的 "" 为字面引号。
+    """
+    args = []
+    word = []
+    in_word = False
+    in_quote = False
+    i = 0
+    length = len(command)
+    while i < length:
+        char = command[i]
+        if char == '\\':
+            start = i
+            while i < length and command[i] == '\\':
+                i += 1
+            count = i - start
+            if i < length and command[i] == '"':
+                word.append('\\' * (count // 2))
+                if count % 2:
+                    word.append('"')
+                    i += 1
+            else:
+                word.append('\\' * count)
+            in_word = True
+            continue
+        if char == '"':
+            if in_quote and command[i + 1:i + 2] == '"':
+                word.append('"')
+                i += 2
+                continue
+            in_quote = not in_quote
+            in_word = True
+        elif char in ' \t' and not in_quote:
+            if in_word:
+                args.append(''.join(word))
+                word = []
+                in_word = False
+        else:
+            word.append(char)
+            in_word = True
+        i += 1
+    if in_quote:
+        raise ValueError('引号没有闭合')
+    if in_word:
+        args.append(''.join(word))
+    return args
+
+
+def _iter_cmd_commands(text: str) -> Iterator[List[str]]:
+    """
+    按 Windows cmd 的规则切分命令，逐条产出 curl.exe 收到的参数
+
+    先按 cmd 处理：引号外 ^x 为字面量 x，行尾的 ^ 续行并使下一行的第一个字符成为字面量，
+    引号外的换行、&、| 分隔命令，<、> 重定向丢弃；再按 MSVCRT 规则拆分参数。
+    """
+    command = []
+    in_quote = False
+    i = 0
+    length = len(text)
+
+    def finish():
+        args = _split_msvcrt_args(''.join(command))
+        command.clear()
+        return args
+
+    while i < length:
+        char = text[i]
+        i += 1
+        if in_quote:
+            command.append(char)
+            if char == '"':
+                in_quote = False
+            elif char == '\n':
+                raise ValueError('引号没有闭合')
+            continue
+        if char == '^':
+            if text.startswith('\r\n', i):
+                i += 2
+            elif text.startswith('\n', i):
+                i += 1
+            if i < length:
+                command.append(text[i])
+                i += 1
+            continue
+        if char == '"':
+            in_quote = True
+            command.append(char)
+        elif char in '\r\n&|':
+            args = finish()
+            if args:
+                yield args
+        elif char in '<>':
+            # 丢弃重定向目标
+            while i < length and text[i] in ' \t':
+                i += 1
+            while i < length and text[i] not in ' \t\r\n&|':
+                i += 1
+        else:
+            command.append(char)
+    args = finish()
+    if args:
+        yield args
+
+
+# 可以出现在 curl 之前的 shell 关键字和前缀命令
+_SHELL_PREFIXES = ('do', 'then', 'else', 'time', 'exec', 'sudo', 'command', '!', '{', '(')
+_ENV_ASSIGNMENT_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*=')
+
+
+def _curl_arguments(args: List[str]) -> Optional[List[str]]:
+    """
+    如果命令是 curl（允许 curl.exe、带路径和 FOO=1 curl、do curl 等写法），
+    返回 curl 之后的参数，否则返回 None
+    """
+    for index, arg in enumerate(args):
+        name = arg.replace('\\', '/').rsplit('/', 1)[-1].lower()
+        if name in ('curl', 'curl.exe'):
+            return args[index + 1:]
+        if arg not in _SHELL_PREFIXES and not _ENV_ASSIGNMENT_RE.match(arg):
+            return None
+    return None
+
+
+def _read_curl_file(state: Dict, value: str, binary: bool) -> Optional[str]:
+    """读取 @file 形式的数据，文件不存在时记录错误"""
+    file_path = os.path.join(state['base_dir'], os.path.expanduser(value))
+    try:
+        with open(file_path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        state['error'] = f'无法读取数据文件: {value}'
+        return None
+    text = content.decode('utf-8', errors='replace')
+    # -d @file 会去掉文件中的换行，--data-binary 原样发送
+    return text if binary else text.replace('\r', '').replace('\n', '')
+
+
+def _curl_method(state: Dict, value: str):
+    state['method'] = value.upper()
+
+
+def _curl_head(state: Dict, value: str):
+    state['method'] = state['method'] or 'HEAD'
+
+
+def _curl_url(state: Dict, value: str):
+    state['url'] = value
+
+
+def _curl_header(state: Dict, value: str):
+    if ':' in value:
+        key, header_value = value.split(':', 1)
+        state['headers'].add(key.strip(), header_value.strip())
+
+
+def _curl_data(state: Dict, value: str):
+    if value.startswith('@'):
+        value = _read_curl_file(state, value[1:], binary=False)
+    if value is not None:
+        state['data'].append(value)
+
+
+def _curl_data_raw(state: Dict, value: str):
+    state['data'].append(value)
+
+
+def _curl_data_binary(state: Dict, value: str):
+    if value.startswith('@'):
+        value = _read_curl_file(state, value[1:], binary=True)
+    if value is not None:
+        state['data'].append(value)
+
+
+def _curl_data_urlencode(state: Dict, value: str):
+    # 支持 content、=content、name=content、@file、name@file 几种形式
+    name, content = '', value
+    if '=' in value:
+        name, content = value.split('=', 1)
+    elif '@' in value:
+        name, file_name = value.split('@', 1)
+        content = _read_curl_file(state, file_name, binary=True)
+        if content is None:
+            return
+    encoded = urllib.parse.quote_plus(content)
+    state['data'].append(f"{name}={encoded}" if name else encoded)
+
+
+def _curl_form(state: Dict, value: str, literal: bool = False):
+    try:
+        state['form'].append(parse_form_spec(value, state['base_dir'], literal))
+    except MultipartError as e:
+        state['error'] = str(e)
+
+
+def _curl_form_string(state: Dict, value: str):
+    _curl_form(state, value, literal=True)
+
+
+def _curl_user(state: Dict, value: str):
+    credentials = value if ':' in value else value + ':'
+    token = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+    state['headers']['Authorization'] = f'Basic {token}'
+
+
+def _curl_cookie(state: Dict, value: str):
+    # 不含 = 时是 cookie 文件，忽略
+    # curl 把多个 -b 合并为一个 Cookie 头
+    if '=' in value:
+        existing = state['headers'].get('Cookie')
+        state['headers']['Cookie'] = f'{existing}; {value}' if existing else value
+
+
+def _curl_user_agent(state: Dict, value: str):
+    state['headers']['User-Agent'] = value
+
+
+def _curl_referer(state: Dict, value: str):
+    state['headers']['Referer'] = value
+
+
+def _curl_compressed(state: Dict, value: str):
+    state['headers'].setdefault('Accept-Encoding', 'deflate, gzip, br, zstd')
+
+
+def _curl_get(state: Dict, value: str):
+    state['get'] = True
+
+
+def _curl_json(state: Dict, value: str):
+    # --json 等同于 --data-binary，并默认设置 JSON 的 Content-Type 和 Accept
+    _curl_data_binary(state, value)
+    state['headers'].setdefault('Content-Type', 'application/json')
+    state['headers'].setdefault('Accept', 'application/json')
+
+
+def _curl_upload_file(state: Dict, value: str):
+    # -T 以 PUT 上传文件内容；URL 以 / 结尾时 curl 会追加文件名
+    if value in ('-', '.'):
+        state['error'] = f'不支持从标准输入上传: -T {value}'
+        return
+    content = _read_curl_file(state, value, binary=True)
+    if content is None:
+        return
+    state['data'].append(content)
+    state['method'] = state['method'] or 'PUT'
+    state['upload_name'] = os.path.basename(value)
+
+
+def _curl_oauth2_bearer(state: Dict, value: str):
+    state['headers']['Authorization'] = f'Bearer {value}'
+
+
+# curl 选项表：选项 -> (处理函数, 是否带参数)；处理函数为 None 的选项只跳过
+_CURL_OPTIONS = {
+    '-X': (_curl_method, True), '--request': (_curl_method, True),
+    '-I': (_curl_head, False), '--head': (_curl_head, False),
+    '--url': (_curl_url, True),
+    '-H': (_curl_header, True), '--header': (_curl_header, True),
+    '-d': (_curl_data, True), '--data': (_curl_data, True), '--data-ascii': (_curl_data, True),
+    '--data-raw': (_curl_data_raw, True),
+    '--data-binary': (_curl_data_binary, True),
+    '--data-urlencode': (_curl_data_urlencode, True),
+    '-F': (_curl_form, True), '--form': (_curl_form, True), '--form-string': (_curl_form_string, True),
+    '-u': (_curl_user, True), '--user': (_curl_user, True),
+    '-b': (_curl_cookie, True), '--cookie': (_curl_cookie, True),
+    '-A': (_curl_user_agent, True), '--user-agent': (_curl_user_agent, True),
+    '-e': (_curl_referer, True), '--referer': (_curl_referer, True),
+    '--compressed': (_curl_compressed, False),
+    '-G': (_curl_get, False), '--get': (_curl_get, False),
+    '--json': (_curl_json, True),
+    '-T': (_curl_upload_file, True), '--upload-file': (_curl_upload_file, True),
+    '--oauth2-bearer': (_curl_oauth2_bearer, True),
+}
+
+# 与请求内容无关、带参数的选项（输出、连接、代理、TLS、重试等），只跳过参数
+_CURL_OPTIONS.update(dict.fromkeys([
+    '-o', '--output', '--output-dir', '-D', '--dump-header', '--stderr', '--trace', '--trace-ascii',
+    '-w', '--write-out', '-K', '--config', '--create-file-mode', '--etag-save', '--etag-compare',
+    '-m', '--max-time', '--connect-timeout', '--max-redirs', '--max-filesize', '--limit-rate',
+    '--retry', '--retry-delay', '--retry-max-time', '--expect100-timeout', '--keepalive-time',
+    '--happy-eyeballs-timeout-ms', '-y', '--speed-time', '-Y', '--speed-limit', '-z', '--time-cond',
+    '-C', '--continue-at', '--rate', '--parallel-max',
+    '-x', '--proxy', '-U', '--proxy-user', '--noproxy', '--proxy-header', '--preproxy',
+    '--socks4', '--socks4a', '--socks5', '--socks5-hostname', '--proxy-cacert', '--proxy-cert', '--proxy-key',
+    '-c', '--cookie-jar', '-E', '--cert', '--cert-type', '--key', '--key-type', '--pass',
+    '--cacert', '--capath', '--crlfile', '--pinnedpubkey', '--ciphers', '--tls13-ciphers', '--curves',
+    '--resolve', '--connect-to', '--interface', '--local-port', '--dns-servers', '--doh-url',
+    '--unix-socket', '--abstract-unix-socket', '--netrc-file', '--proto', '--proto-redir', '--proto-default',
+    '--hsts', '--alt-svc', '-r', '--range',
+], (None, True)))
+
+# 与请求内容无关的开关选项，只跳过
+_CURL_OPTIONS.update(dict.fromkeys([
+    '-s', '--silent', '-S', '--show-error', '-L', '--location', '--location-trusted',
+    '-k', '--insecure', '-v', '--verbose', '-i', '--include', '-f', '--fail', '--fail-with-body',
+    '--fail-early', '-#', '--progress-bar', '--progress-meter', '-N', '--buffer',
+    '-0', '--http1.0', '--http1.1', '--http2', '--http2-prior-knowledge', '--http3', '--http3-only',
+    '-4', '--ipv4', '-6', '--ipv6', '-1', '--tlsv1', '--tlsv1.0', '--tlsv1.1', '--tlsv1.2', '--tlsv1.3',
+    '--ssl', '--ssl-reqd', '--ssl-no-revoke', '--proxy-insecure', '--cert-status',
+    '-j', '--junk-session-cookies', '-n', '--netrc', '--netrc-optional', '-q', '--disable',
+    '-g', '--globoff', '-Z', '--parallel', '--raw', '--tr-encoding', '--path-as-is',
+    '-O', '--remote-name', '--remote-name-all', '-J', '--remote-header-name', '-R', '--remote-time',
+    '--create-dirs', '-p', '--proxytunnel', '--digest', '--basic', '--ntlm', '--negotiate', '--anyauth',
+    '--tcp-nodelay', '--tcp-fastopen', '--keepalive', '--sessionid', '--alpn', '--npn',
+    '--styled-output', '--post301', '--post302', '--post303', '--retry-connrefused', '--retry-all-errors',
+    '--suppress-connect-headers', '--ignore-content-length', '--false-start', '--xattr',
+], (None, False)))
+
+
+# ---- HTTP 响应解析 ----
+
+_STATUS_LINE_RE = re.compile(rb'[ \t\r\n]*(HTTP/\d(?:\.\d)?)[ \t]+(\d{3})(?:[ \t]+([^\r\n]*))?\r?\n')
+_CHUNK_LINE_RE = re.compile(rb'[ \t]*([0-9A-Fa-f]+)[^\r\n]*\r?\n')
+_LINE_END_RE = re.compile(rb'\r?\n')
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+class _DeflateDecoder:
+    """deflate 编码有的服务器带 zlib 头，有的是裸数据，按第一块数据自动判断"""
+
+    def __init__(self):
+        self._decoder = zlib.decompressobj()
+        self._first = True
+
+    def decompress(self, data: bytes) -> bytes:
+        if not self._first:
+            return self._decoder.decompress(data)
+        self._first = False
+        try:
+            return self._decoder.decompress(data)
+        except zlib.error:
+            self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._decoder.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._decoder.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self, brotli):
+        self._decoder = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decoder.process(data)
+
+    def flush(self) -> bytes:
+        return b''
+
+
+def _make_content_decoder(coding: str):
+    """
+    创建 Content-Encoding 对应的流式解码器
+
+    Returns:
+        带 decompress()/flush() 的对象；identity 返回 None；
+        不支持的编码或缺少解压模块时抛出 HTTPParseError，解析器据此保留原始响应体
+    """
+    if coding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if coding == 'deflate':
+        return _DeflateDecoder()
+    if coding == 'br':
+        try:
+            import brotli
+        except ImportError:
+            raise HTTPParseError('解压 br 编码需要安装 brotli')
+        return _BrotliDecoder(brotli)
+    if coding == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise HTTPParseError('解压 zstd 编码需要安装 zstandard')
+        return zstandard.ZstdDecompressor().decompressobj()
+    if coding in ('', 'identity'):
+        return None
+    raise HTTPParseError(f'不支持的内容编码: {coding}')
+
+
+class ParsedResponse:
+    """解析后的HTTP响应"""
+
+    __slots__ = ('protocol', 'status_code', 'reason', 'headers', 'body', 'complete', 'decoded')
+
+    def __init__(self, protocol: str, status_code: int, reason: str, headers: Headers, body: bytes,
+                 complete: bool = True, decoded: bool = True):
+        self.protocol = protocol
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.complete = complete  # 响应体是否完整（按 Content-Length/分块结束标记判断）
+        self.decoded = decoded    # 响应体是否已按 Content-Encoding 解压
+
+    @property
+    def encoding(self) -> str:
+        """Content-Type 中的字符集，默认 utf-8"""
+        match = _CHARSET_RE.search(self.headers.get('content-type', ''))
+        return match.group(1) if match else 'utf-8'
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.body.decode(self.encoding, errors='replace')
+        except LookupError:
+            return self.body.decode('utf-8', errors='replace')
+
+    def json(self):
+        """按 JSON 解析响应体，失败时返回 None"""
+        try:
+            return json.loads(self.text)
+        except ValueError:
+            return None
+
+    def to_result(self, url: str = '') -> Dict[str, any]:
+        """
+        转换为请求线程的结果字典格式，可直接交给响应查看器显示
+
+        离线响应没有耗时信息，response_time 和 ttfb 为 None。
+        """
+        return {
+            'status_code': self.status_code,
+            'headers': self.headers,
+            'text': self.text,
+            'json': self.json(),
+            'response_time': None,
+            'ttfb': None,
+            'url': url,
+            'request_headers': Headers(),
+            'request_method': '',
+            'request_data': None
+        }
+
+    def to_history(self) -> Dict[str, any]:
+        """转换为可保存到历史记录中的字典"""
+        return {
+            'status_code': self.status_code,
+            'reason': self.reason,
+            'headers': header_data(self.headers),
+            'body': self.text
+        }
+
+
+class HTTPResponseParser:
+    """
+    流式HTTP/1.x响应解析器
+
+    依次处理状态行、响应头、分块传输编码和内容压缩，每次 feed() 返回新解码出的响应体：
+
+        parser = HTTPResponseParser()
+        for chunk in chunks:
+            sink.write(parser.feed(chunk))
+        sink.write(parser.finish())
+    """
+
+    def __init__(self, decompress: bool = True, head_request: bool = False):
+        """
+        Args:
+            decompress: 是否按 Content-Encoding 解压响应体
+            head_request: 对应的请求是否为 HEAD（HEAD 响应没有响应体）
+        """
+        self.decompress = decompress
+        self.head_request = head_request
+        self.protocol = ''
+        self.status_code = 0
+        self.reason = ''
+        self.headers = Headers()
+        self.headers_complete = False
+        self.complete = False
+        self.decoded = False
+        self._buffer = bytearray()
+        self._framing = None      # 'length' / 'chunked' / 'eof'
+        self._remaining = 0       # length: 剩余字节；chunked: 当前分块剩余字节
+        self._chunk_state = 'size'
+        self._decoders = []
+
+    def feed(self, data: bytes) -> bytes:
+        """
+        输入一段原始数据
+
+        Returns:
+            本次新解码出的响应体字节（可能为空）
+        """
+        if self.complete:
+            return b''
+        self._buffer.extend(data)
+        output = []
+        if not self.headers_complete and not self._parse_head():
+            return b''
+        self._parse_body(output)
+        return self._decode(b''.join(output))
+
+    def finish(self) -> bytes:
+        """
+        数据已全部输入，返回剩余的响应体
+
+        Raises:
+            HTTPParseError: 没有找到完整的状态行和响应头
+        """
+        if not self.headers_complete:
+            # 只有状态行和响应头、没有空行结尾的数据
+            self._buffer.extend(b'\r\n\r\n')
+            if not self._parse_head():
+                raise HTTPParseError('无法解析响应状态行')
+        output = []
+        if not self.complete:
+            self._parse_body(output)
+            if self._framing == 'eof':
+                output.append(bytes(self._buffer))
+                self._buffer.clear()
+                self.complete = True
+        data = self._decode(b''.join(output))
+        tail = b''.join(decoder.flush() for decoder in self._decoders)
+        return data + tail
+
+    def _parse_head(self) -> bool:
+        """解析状态行和响应头，跳过 1xx 中间响应；数据不足时返回 False"""
+        while True:
+            match = _HEAD_END_RE.search(self._buffer)
+            if not match:
+                return False
+            head_end, body_start = match.start(), match.end()
+            status = _STATUS_LINE_RE.match(self._buffer, 0, body_start)
+            if not status:
+                raise HTTPParseError('无法解析响应状态行')
+
+            status_code = int(status.group(2))
+            if 100 <= status_code < 200 and status_code != 101:
+                # 100 Continue 等中间响应，继续解析后面的最终响应
+                del self._buffer[:body_start]
+                continue
+
+            self.protocol = status.group(1).decode('ascii')
+            self.status_code = status_code
+            self.reason = (status.group(3) or b'').decode('latin-1').strip()
+            data = bytes(self._buffer[:head_end + 2])
+            fields = []
+            for field in _FIELD_LINE_RE.finditer(data, status.end()):
+                value = field.group(2).decode('utf-8', errors='replace')
+                if field.start(1) >= 0:
+                    fields.append([field.group(1).decode('latin-1').strip(), value])
+                elif value and fields:
+                    # 续行合并到上一个字段
+                    fields[-1][1] = f'{fields[-1][1]} {value}'.strip()
+            self.headers = Headers(fields)
+            del self._buffer[:body_start]
+            self.headers_complete = True
+            self._setup_body()
+            return True
+
+    def _setup_body(self):
+        transfer_encoding = self.headers.get('transfer-encoding', '').lower()
+        length = self.headers.get('content-length', '').strip()
+
+        if self.head_request or self.status_code in (204, 304) or 100 <= self.status_code < 200:
+            self.complete = True
+        elif transfer_encoding.rsplit(',', 1)[-1].strip() == 'chunked':
+            self._framing = 'chunked'
+        elif length.isdigit():
+            self._framing = 'length'
+            self._remaining = int(length)
+            self.complete = self._remaining == 0
+        else:
+            self._framing = 'eof'
+
+        self.decoded = True
+        if self.decompress:
+            codings = [c.strip().lower() for c in self.headers.get('content-encoding', '').split(',')]
+            try:
+                decoders = [_make_content_decoder(coding) for coding in reversed(codings)]
+            except HTTPParseError:
+                # 缺少 brotli/zstandard 或未知的编码：保留原始响应体，不拒绝整个响应
+                self.decoded = False
+                return
+            self._decoders = [decoder for decoder in decoders if decoder is not None]
+        elif self.headers.get('content-encoding', 'identity').lower() != 'identity':
+            self.decoded = False
+
+    def _parse_body(self, output: List[bytes]):
+        buf = self._buffer
+        if self._framing == 'length':
+            take = min(self._remaining, len(buf))
+            output.append(bytes(buf[:take]))
+            del buf[:take]
+            self._remaining -= take
+            self.complete = self._remaining == 0
+        elif self._framing == 'eof':
+            output.append(bytes(buf))
+            buf.clear()
+        elif self._framing == 'chunked':
+            pos = 0
+            while not self.complete:
+                if self._chunk_state == 'size':
+                    match = _CHUNK_LINE_RE.match(buf, pos)
+                    if not match:
+                        if _LINE_END_RE.search(buf, pos):
+                            raise HTTPParseError('无效的分块长度')
+                        break
+                    self._remaining = int(match.group(1), 16)
+                    pos = match.end()
+                    self._chunk_state = 'data' if self._remaining else 'trailer'
+                elif self._chunk_state == 'data':
+                    take = min(self._remaining, len(buf) - pos)
+                    if not take:
+                        break
+                    output.append(bytes(buf[pos:pos + take]))
+                    pos += take
+                    self._remaining -= take
+                    if not self._remaining:
+                        self._chunk_state = 'data_end'
+                elif self._chunk_state == 'data_end':
+                    match = _LINE_END_RE.match(buf, pos)
+                    if not match:
+                        if len(buf) - pos >= 2:
+                            raise HTTPParseError('分块数据后缺少换行')
+                        break
+                    pos = match.end()
+                    self._chunk_state = 'size'
+                else:
+                    # 尾部字段，直到空行结束
+                    match = _LINE_END_RE.search(buf, pos)
+                    if not match:
+                        break
+                    line_empty = match.start() == pos
+                    pos = match.end()
+                    self.complete = line_empty
+            del buf[:pos]
+
+    def _decode(self, data: bytes) -> bytes:
+        for decoder in self._decoders:
+            if not data:
+                break
+            data = decoder.decompress(data)
+        return data
+
+    @staticmethod
+    def parse(data: Union[bytes, bytearray, memoryview], decompress: bool = True) -> ParsedResponse:
+        """
+        解析完整的原始HTTP响应
+
+        Args:
+            data: 原始响应数据
+            decompress: 是否解压响应体
+
+        Returns:
+            ParsedResponse 对象
+
+        Raises:
+            HTTPParseError: 状态行无效或响应体无法解码
+        """
+        parser = HTTPResponseParser(decompress)
+        body = parser.feed(bytes(data)) + parser.finish()
+        return ParsedResponse(parser.protocol, parser.status_code, parser.reason, parser.headers, body,
+                              parser.complete, parser.decoded)
+
+    @staticmethod
+    def parse_file(source: Union[str, BinaryIO], decompress: bool = True,
+                   chunk_size: int = BULK_CHUNK_SIZE) -> ParsedResponse:
+        """
+        分块读取并解析保存在文件中的原始HTTP响应（例如 tcpdump 重组结果）
+
+        Args:
+            source: 文件路径或以二进制模式打开的文件对象
+            decompress: 是否解压响应体
+            chunk_size: 每次读取的字节数
+
+        Returns:
+            ParsedResponse 对象
+        """
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                return HTTPResponseParser.parse_file(f, decompress, chunk_size)
+
+        parser = HTTPResponseParser(decompress)
+        body = []
+        while not parser.complete:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            body.append(parser.feed(chunk))
+        body.append(parser.finish())
+        return ParsedResponse(parser.protocol, parser.status_code, parser.reason, parser.headers, b''.join(body),
+                              parser.complete, parser.decoded)
+
 
 # 便捷函数
-def parse_http_request(raw_request: str) -> Dict[str, any]:
+def parse_http_request(raw_request: str) -> Union[ParsedRequest, ParseError]:
     """
     解析HTTP请求的便捷函数
 
@@ -414,19 +1604,61 @@ def parse_http_request(raw_request: str) -> Dict[str, any]:
         raw_request: 原始HTTP请求文本
 
     Returns:
-        解析结果字典
+        ParsedRequest 或 ParseError
     """
     return HTTPRequestParser.parse(raw_request)
 
 
-def parse_curl_command(curl_command: str) -> Dict[str, any]:
+def iter_http_requests(source: Union[str, BinaryIO], chunk_size: int = BULK_CHUNK_SIZE) -> Iterator[Union[ParsedRequest, ParseError]]:
+    """
+    批量流式解析原始HTTP请求的便捷函数
+
+    Args:
+        source: 文件路径或以二进制模式打开的文件对象
+        chunk_size: 每次读取的字节数
+
+    Returns:
+        逐个产出解析结果的生成器
+    """
+    return HTTPRequestParser.iter_requests(source, chunk_size)
+
+
+def parse_curl_command(curl_command: str, base_dir: Optional[str] = None) -> Union[ParsedRequest, ParseError]:
     """
     解析cURL命令的便捷函数
 
     Args:
         curl_command: cURL命令字符串
+        base_dir: 解析 @file 相对路径的目录
+
+    Returns:
+        ParsedRequest 或 ParseError
+    """
+    return HTTPRequestParser.parse_curl_command(curl_command, base_dir)
+
+
+def iter_curl_commands(source: Union[str, TextIO], base_dir: Optional[str] = None) -> Iterator[Union[ParsedRequest, ParseError]]:
+    """
+    批量提取并解析脚本中全部 curl 命令的便捷函数
+
+    Args:
+        source: 脚本文件路径或文本文件对象
+        base_dir: 解析 @file 相对路径的目录
+
+    Returns:
+        逐个产出解析结果的生成器
+    """
+    return HTTPRequestParser.iter_curl_commands(source, base_dir)
+
+
+def parse_http_response(raw_response: Union[bytes, bytearray, memoryview]) -> ParsedResponse:
+    """
+    解析原始HTTP响应的便捷函数
+
+    Args:
+        raw_response: 原始响应数据
 
     Returns:
-        解析结果字典
+        ParsedResponse 对象
     """
-    return HTTPRequestParser.parse_curl_command(curl_command)
+    return HTTPResponseParser.parse(raw_response)
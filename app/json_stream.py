@@ -0,0 +1,177 @@
+"""
+JSON流式读取
+按块扫描JSON文本，逐个产出数组元素，内存占用只与单个元素大小有关
+"""
+import re
+import json
+from typing import Iterator, TextIO
+
+
+CHUNK_SIZE = 64 * 1024
+
+# 扫描JSON结构时关心的记号：括号、完整字符串、未结束字符串的起始引号
+_TOKEN_RE = re.compile(r'[{}\[\]]|"[^"\\]*(?:\\.[^"\\]*)*"|"', re.DOTALL)
+_STRING_END_RE = re.compile(r'["\\]')
+_SPACE_RE = re.compile(r'\s*')
+_PRIMITIVE_END_RE = re.compile(r'[,\]}\s]')
+
+
+class JsonStreamError(ValueError):
+    """JSON格式错误或文件意外结束"""
+
+
+class JsonStreamReader:
+    """
+    按块读取JSON文本的扫描器
+
+    只追踪括号深度和字符串状态来定位数组元素的边界，
+    元素本身交给 json.loads 解析，因此内存占用只与单个元素大小有关。
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """读取下一块数据，返回是否读到了新数据"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # 丢弃已消费的部分
+        if self.pos > self.chunk_size:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def skip_space(self):
+        """跳过空白字符"""
+        while True:
+            self.pos = _SPACE_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return
+
+    def peek(self) -> str:
+        """查看下一个非空白字符"""
+        self.skip_space()
+        return self.buf[self.pos] if self.pos < len(self.buf) else ''
+
+    def expect(self, char: str):
+        """消费指定字符"""
+        if self.peek() != char:
+            raise JsonStreamError(f'期望 {char!r}，位置附近内容: {self.buf[self.pos:self.pos + 20]!r}')
+        self.pos += 1
+
+    def read_value_text(self) -> str:
+        """读取下一个完整JSON值的原始文本"""
+        self.skip_space()
+        start = self.pos
+        if start >= len(self.buf):
+            raise JsonStreamError('JSON数据意外结束')
+
+        if self.buf[start] not in '{["':
+            # 数字、true、false、null：读到分隔符为止
+            while True:
+                match = _PRIMITIVE_END_RE.search(self.buf, start)
+                if match or not self._fill():
+                    break
+                start = self.pos
+            end = match.start() if match else len(self.buf)
+            self.pos = end
+            return self.buf[start:end]
+
+        # 扫描状态跨块保留，每个字符只扫描一次
+        depth = 0
+        in_string = False
+        scan = start
+        while True:
+            buf = self.buf
+            size = len(buf)
+            while scan < size:
+                if in_string:
+                    match = _STRING_END_RE.search(buf, scan)
+                    if not match:
+                        scan = size
+                        break
+                    if match.group() == '\\':
+                        if match.end() >= size:
+                            # 转义符在块末尾，等待更多数据
+                            scan = match.start()
+                            break
+                        scan = match.end() + 1
+                        continue
+                    in_string = False
+                    scan = match.end()
+                    if depth == 0:
+                        self.pos = scan
+                        return buf[start:scan]
+                else:
+                    for match in _TOKEN_RE.finditer(buf, scan):
+                        char = match.group()
+                        scan = match.end()
+                        if char == '"':
+                            # 字符串跨越块边界
+                            in_string = True
+                            break
+                        if char[0] == '"':
+                            if depth == 0:
+                                self.pos = scan
+                                return buf[start:scan]
+                        elif char in '{[':
+                            depth += 1
+                        else:
+                            depth -= 1
+                            if depth == 0:
+                                self.pos = scan
+                                return buf[start:scan]
+                    else:
+                        scan = size
+
+            # 数据不完整，读取更多内容后继续扫描（_fill 可能压缩缓冲区）
+            offset = scan - start
+            if not self._fill():
+                raise JsonStreamError('JSON数据意外结束')
+            start = self.pos
+            scan = start + offset
+
+    def read_value(self):
+        """读取并解析下一个JSON值"""
+        return json.loads(self.read_value_text())
+
+    def iter_object_keys(self) -> Iterator[str]:
+        """遍历当前对象的键，调用方需在每次迭代中消费对应的值"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise JsonStreamError('对象格式错误')
+
+    def iter_array_items(self) -> Iterator:
+        """逐个解析当前数组的元素"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise JsonStreamError('数组格式错误')
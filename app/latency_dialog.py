@@ -0,0 +1,138 @@
+"""
+接口耗时统计对话框
+在首次打开时才导入
+"""
+from datetime import datetime
+from PySide6.QtWidgets import (
+    QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPainter, QPen, QColor
+
+from metrics_store import daily_percentiles, downsample
+
+
+class LatencyChart(QWidget):
+    """接口耗时趋势图：平均耗时折线 + 最小/最大值区间"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.points = []
+        self.setMinimumHeight(220)
+
+    def set_points(self, points):
+        """设置降采样后的数据点 [(时间戳, 最小, 平均, 最大)]"""
+        self.points = points
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect().adjusted(50, 10, -10, -25)
+        painter.drawRect(rect)
+
+        if not self.points:
+            painter.drawText(rect, Qt.AlignCenter, "暂无数据")
+            return
+
+        start = self.points[0][0]
+        span = (self.points[-1][0] - start) or 1.0
+        peak = max(point[3] for point in self.points) or 1.0
+
+        def to_x(timestamp):
+            return rect.left() + (timestamp - start) / span * rect.width()
+
+        def to_y(value):
+            return rect.bottom() - value / peak * rect.height()
+
+        # 最小/最大值区间
+        painter.setPen(QPen(QColor("#9ecae1"), 1))
+        for timestamp, low, _, high in self.points:
+            x = to_x(timestamp)
+            painter.drawLine(int(x), int(to_y(low)), int(x), int(to_y(high)))
+
+        # 平均耗时折线
+        painter.setPen(QPen(QColor("#17a2b8"), 2))
+        previous = None
+        for timestamp, _, average, _ in self.points:
+            current = (int(to_x(timestamp)), int(to_y(average)))
+            if previous:
+                painter.drawLine(previous[0], previous[1], current[0], current[1])
+            previous = current
+
+        # 坐标标注
+        painter.setPen(QPen(QColor("#333333")))
+        painter.drawText(2, rect.top() + 10, f"{peak:.0f}ms")
+        painter.drawText(2, rect.bottom(), "0ms")
+        painter.drawText(rect.left(), self.height() - 5,
+                         datetime.fromtimestamp(start).strftime('%m-%d %H:%M'))
+        end_text = datetime.fromtimestamp(self.points[-1][0]).strftime('%m-%d %H:%M')
+        painter.drawText(rect.right() - painter.fontMetrics().horizontalAdvance(end_text),
+                         self.height() - 5, end_text)
+
+
+class LatencyDialog(QDialog):
+    """接口耗时统计对话框"""
+
+    def __init__(self, metrics, current_key=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("接口耗时统计")
+        self.setMinimumSize(800, 600)
+        self.metrics = metrics
+        self.setup_ui()
+
+        endpoints = sorted(self.metrics.endpoints())
+        self.endpoint_combo.addItems(endpoints)
+        if current_key in endpoints:
+            self.endpoint_combo.setCurrentText(current_key)
+
+    def setup_ui(self):
+        """设置UI"""
+        layout = QVBoxLayout(self)
+
+        endpoint_layout = QHBoxLayout()
+        endpoint_layout.addWidget(QLabel("接口:"))
+        self.endpoint_combo = QComboBox()
+        self.endpoint_combo.currentTextChanged.connect(self.load_endpoint)
+        endpoint_layout.addWidget(self.endpoint_combo, 1)
+        layout.addLayout(endpoint_layout)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.chart = LatencyChart()
+        layout.addWidget(self.chart, 1)
+
+        # 每日分位数
+        self.daily_table = QTableWidget()
+        self.daily_table.setColumnCount(5)
+        self.daily_table.setHorizontalHeaderLabels(["日期", "请求数", "P50 (ms)", "P90 (ms)", "P99 (ms)"])
+        self.daily_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.daily_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.daily_table)
+
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.accept)
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def load_endpoint(self, key):
+        """加载接口的耗时记录"""
+        samples = self.metrics.samples(key) if key else []
+        self.chart.set_points(downsample(samples, max(100, self.chart.width() // 2)))
+
+        if samples:
+            errors = sum(1 for sample in samples if sample.status >= 400)
+            self.summary_label.setText(f"共 {len(samples)} 次请求，错误 {errors} 次")
+        else:
+            self.summary_label.setText("暂无数据")
+
+        rows = daily_percentiles(samples)
+        self.daily_table.setRowCount(len(rows))
+        for i, row in enumerate(reversed(rows)):
+            values = [row['date'], str(row['count']), str(row['p50']), str(row['p90']), str(row['p99'])]
+            for column, value in enumerate(values):
+                self.daily_table.setItem(i, column, QTableWidgetItem(value))
@@ -2,149 +2,68 @@
 HTTP请求解析器GUI主界面 - 保持原有UI结构，使用默认样式
 """
 import sys
+import html
 import json
 import time
 import os
+import threading
+from collections import deque
 from datetime import datetime
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
-    QHBoxLayout, QComboBox, QLineEdit, QTextEdit,
+    QHBoxLayout, QComboBox, QLineEdit, QTextEdit, QPlainTextEdit,
     QPushButton, QLabel, QTabWidget, QTableWidget,
     QTableWidgetItem, QHeaderView, QSplitter, QListWidget,
     QStatusBar, QMenuBar, QFileDialog, QMessageBox,
     QProgressBar, QFrame, QScrollArea, QGroupBox,
-    QGridLayout, QSpinBox, QCheckBox, QDialog
+    QGridLayout, QSpinBox, QCheckBox, QDialog,
+    QTreeWidget, QTreeWidgetItem, QInputDialog
 )
 from PySide6.QtCore import Qt, QThread, Signal as QSignal, QTimer
-from PySide6.QtGui import QFont
-import requests
-
-from http_parser import HTTPRequestParser
-
-
-class RawRequestDialog(QDialog):
-    """原始HTTP请求导入对话框"""
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("导入原始HTTP请求")
-        self.setMinimumSize(800, 600)
-        self.parsed_data = None
-        self.setup_ui()
-
-    def setup_ui(self):
-        """设置UI"""
-        layout = QVBoxLayout(self)
-
-        # 说明文本
-        hint_label = QLabel(
-            "粘贴原始HTTP请求文本（从浏览器开发者工具、Postman等复制）\n"
-            "格式示例:\n"
-            "GET /api/data HTTP/1.1\n"
-            "Host: example.com\n"
-            "Content-Type: application/json\n"
-            "\n"
-            "{\"key\": \"value\"}"
-        )
-        layout.addWidget(hint_label)
-
-        # 输入区域
-        input_label = QLabel("原始HTTP请求:")
-        layout.addWidget(input_label)
-
-        self.request_input = QTextEdit()
-        self.request_input.setPlaceholderText(
-            "GET /admin/inspection.Report/getInspectionData HTTP/1.1\n"
-            "Accept: application/json, text/plain, */*\n"
-            "Host: localhost:8000\n"
-            "User-Agent: Mozilla/5.0...\n"
-            "..."
-        )
-        self.request_input.setFont(QFont("Consolas", 10))
-        layout.addWidget(self.request_input)
-
-        # 按钮区域
-        button_layout = QHBoxLayout()
-
-        self.parse_btn = QPushButton("解析")
-        self.parse_btn.clicked.connect(self.parse_request)
-
-        self.import_btn = QPushButton("导入")
-        self.import_btn.clicked.connect(self.accept)
-        self.import_btn.setEnabled(False)
-
-        cancel_btn = QPushButton("取消")
-        cancel_btn.clicked.connect(self.reject)
-
-        button_layout.addStretch()
-        button_layout.addWidget(self.parse_btn)
-        button_layout.addWidget(self.import_btn)
-        button_layout.addWidget(cancel_btn)
-
-        layout.addLayout(button_layout)
-
-        # 预览区域
-        preview_label = QLabel("解析预览:")
-        layout.addWidget(preview_label)
-
-        self.preview_text = QTextEdit()
-        self.preview_text.setReadOnly(True)
-        self.preview_text.setMaximumHeight(200)
-        layout.addWidget(self.preview_text)
-
-    def parse_request(self):
-        """解析请求"""
-        raw_request = self.request_input.toPlainText()
-
-        if not raw_request.strip():
-            QMessageBox.warning(self, "输入错误", "请输入HTTP请求文本")
-            return
-
-        # 使用解析器解析
-        result = HTTPRequestParser.parse(raw_request)
-
-        if not result['success']:
-            QMessageBox.critical(self, "解析失败", result['error'])
-            self.preview_text.clear()
-            self.import_btn.setEnabled(False)
-            return
+from PySide6.QtGui import QTextCursor
+
+# requests、http_parser、har 和各对话框在首次使用时才导入，缩短启动时间
+from headers import Headers, header_data, response_headers
+from query_params import QueryParamsModel
+import tracing
+from tracing import async_begin, async_end, instant, traced
+from request_engine import (
+    COMPRESSION_METHODS, METHODS_WITH_BODY, PreparedBody, RequestBodyError,
+    check_json, compress_body, describe_request_error, format_json_text, looks_like_json,
+    new_session, normalize_url, prepare_body, send_prepared
+)
+from history_store import HistoryWriter, get_history_file, iter_history_pages
+from collections_store import CollectionStore, get_workspace_file
+from metrics_store import MetricsStore, endpoint_key
+from environments import EnvironmentStore
+from templates import TemplateError, render_request
 
-        # 保存解析结果
-        self.parsed_data = result
 
-        # 显示预览
-        preview = []
-        preview.append(f"方法: {result['method']}")
-        preview.append(f"URL: {result['url']}")
-        preview.append(f"路径: {result['path']}")
-        preview.append(f"协议: {result['protocol']}")
-        preview.append(f"\n请求头数量: {len(result['headers'])}")
+class JsonCheckThread(QThread):
+    """后台检查请求体 JSON 是否有效"""
+    finished = QSignal(object, int)
 
-        if result['headers']:
-            preview.append("\n请求头:")
-            for key, value in list(result['headers'].items())[:5]:
-                preview.append(f"  {key}: {value}")
-            if len(result['headers']) > 5:
-                preview.append(f"  ... 还有 {len(result['headers']) - 5} 个请求头")
+    def __init__(self, text, generation):
+        super().__init__()
+        self.text = text
+        self.generation = generation
 
-        if result['body']:
-            preview.append(f"\n请求体长度: {len(result['body'])} 字符")
-            body_preview = result['body'][:200]
-            if len(result['body']) > 200:
-                body_preview += "..."
-            preview.append(f"请求体预览:\n{body_preview}")
+    def run(self):
+        self.finished.emit(check_json(self.text), self.generation)
 
-        self.preview_text.setPlainText("\n".join(preview))
 
-        # 启用导入按钮
-        self.import_btn.setEnabled(True)
+class FormatBodyThread(QThread):
+    """后台格式化请求体 JSON；revision 为取出文本时文档的版本"""
+    finished = QSignal(object, object, int)
 
-        # 显示成功消息
-        QMessageBox.information(self, "解析成功", "HTTP请求解析成功！点击\"导入\"按钮将数据填充到主界面。")
+    def __init__(self, text, revision):
+        super().__init__()
+        self.text = text
+        self.revision = revision
 
-    def get_parsed_data(self):
-        """获取解析后的数据"""
-        return self.parsed_data
+    def run(self):
+        formatted, error = format_json_text(self.text)
+        self.finished.emit(formatted, error, self.revision)
 
 
 class RequestThread(QThread):
@@ -152,14 +71,18 @@ class RequestThread(QThread):
     finished = QSignal(dict)
     error = QSignal(str)
     cancelled = QSignal()
+    # 已发送字节数, 总字节数（分块传输时为 None）, 已用秒数
+    upload_progress = QSignal(object, object, float)
 
-    def __init__(self, method, url, headers, data, timeout=30):
+    def __init__(self, method, url, headers, data, timeout=30, metrics=None, compression=None):
         super().__init__()
         self.method = method
         self.url = url
-        self.headers = headers
+        self.headers = Headers(headers)
         self.data = data
         self.timeout = timeout
+        self.metrics = metrics  # 可选的 MetricsStore，记录每次请求的耗时
+        self.compression = compression  # 请求体压缩方式：gzip/deflate/zstd，None 表示不压缩
         self._should_stop = False
         self._session = None
 
@@ -173,6 +96,7 @@ class RequestThread(QThread):
             except:
                 pass
 
+    @traced('RequestThread.run', 'engine')
     def run(self):
         try:
             # 检查是否需要停止
@@ -180,39 +104,14 @@ class RequestThread(QThread):
                 self.cancelled.emit()
                 return
 
-            start_time = time.time()
+            # 在请求线程中压缩请求体，不计入响应时间
+            prepared, compression = compress_body(PreparedBody(self.data, self.headers), self.compression)
 
             # 创建session以便中断请求
-            self._session = requests.Session()
-
-            # 设置较短的超时时间以便及时响应中断
-            connect_timeout = min(5, self.timeout)
-            read_timeout = self.timeout
-
-            if self.method in ["POST", "PUT", "PATCH"]:
-                if isinstance(self.data, dict):
-                    response = self._session.request(
-                        method=self.method,
-                        url=self.url,
-                        headers=self.headers,
-                        json=self.data,
-                        timeout=(connect_timeout, read_timeout)
-                    )
-                else:
-                    response = self._session.request(
-                        method=self.method,
-                        url=self.url,
-                        headers=self.headers,
-                        data=self.data,
-                        timeout=(connect_timeout, read_timeout)
-                    )
-            else:
-                response = self._session.request(
-                    method=self.method,
-                    url=self.url,
-                    headers=self.headers,
-                    timeout=(connect_timeout, read_timeout)
-                )
+            self._session = new_session()
+            response, response_time, ttfb = send_prepared(
+                self._session, self.method, self.url, prepared, self.timeout, self.upload_progress.emit
+            )
 
             # 检查是否在请求过程中被停止
             if self._should_stop:
@@ -221,18 +120,27 @@ class RequestThread(QThread):
                 self.cancelled.emit()
                 return
 
-            end_time = time.time()
-            response_time = round((end_time - start_time) * 1000, 2)  # 毫秒
+            if self.metrics:
+                try:
+                    self.metrics.record(
+                        endpoint_key(self.method, self.url),
+                        response.status_code, ttfb, response_time, len(response.content)
+                    )
+                except Exception:
+                    pass  # 统计失败不影响请求结果
 
             result = {
                 'status_code': response.status_code,
-                'headers': dict(response.headers),
+                'headers': response_headers(response),
                 'text': response.text,
                 'response_time': response_time,
+                'ttfb': ttfb,
                 'url': response.url,
                 'request_headers': self.headers,
                 'request_method': self.method,
-                'request_data': self.data
+                'request_data': self.data,
+                # 流式请求体的压缩统计在发送完成后才完整，此时读取
+                'compression': compression.to_dict() if compression else None
             }
 
             try:
@@ -250,35 +158,184 @@ class RequestThread(QThread):
             if not self._should_stop:
                 self.finished.emit(result)
 
-        except requests.exceptions.Timeout:
-            if self._should_stop:
-                self.cancelled.emit()
-            else:
-                self.error.emit("请求超时")
-        except requests.exceptions.ConnectionError:
-            if self._should_stop:
-                self.cancelled.emit()
-            else:
-                self.error.emit("连接错误")
         except Exception as e:
             if self._should_stop:
                 self.cancelled.emit()
             else:
-                self.error.emit(str(e))
+                self.error.emit(describe_request_error(e))
         finally:
             self._session = None
 
 
+class HistoryLoadThread(QThread):
+    """历史记录分页加载线程"""
+    page_loaded = QSignal(list)
+    loaded = QSignal()
+
+    def __init__(self, history_file, page_size=20):
+        super().__init__()
+        self.history_file = history_file
+        self.page_size = page_size
+
+    def run(self):
+        try:
+            for page in iter_history_pages(self.history_file, self.page_size):
+                if self.isInterruptionRequested():
+                    return
+                self.page_loaded.emit(page)
+        except Exception:
+            pass  # 历史文件损坏时保留已加载的部分
+        self.loaded.emit()
+
+
+class HarImportThread(QThread):
+    """HAR流式导入线程"""
+    progress = QSignal(int)
+    finished = QSignal(list, int)
+    error = QSignal(str)
+
+    def __init__(self, file_path, keep=50):
+        super().__init__()
+        self.file_path = file_path
+        self.keep = keep
+
+    def run(self):
+        from har import import_har
+
+        try:
+            # 只保留最新的 keep 条记录，内存占用与文件大小无关
+            recent = deque(maxlen=self.keep)
+            count = 0
+            for item in import_har(self.file_path):
+                recent.append(item)
+                count += 1
+                if count % 1000 == 0:
+                    self.progress.emit(count)
+            self.finished.emit(list(recent), count)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class ResponseLoadThread(QThread):
+    """原始HTTP响应文件解析线程（分块解码、解压在后台进行）"""
+    finished = QSignal(object)
+    error = QSignal(str)
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+
+    def run(self):
+        from http_parser import HTTPResponseParser
+
+        try:
+            self.finished.emit(HTTPResponseParser.parse_file(self.file_path))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class DataRunThread(QThread):
+    """数据驱动执行线程：按数据文件的每一行发送一次请求，结果逐条写入结果文件"""
+    progress = QSignal(int, int)
+    finished = QSignal(int, int, float)
+    error = QSignal(str)
+
+    def __init__(self, request, data_path, output_path, variables, concurrency, compression=None):
+        super().__init__()
+        self.request = request
+        self.data_path = data_path
+        self.output_path = output_path
+        self.variables = variables
+        self.concurrency = concurrency
+        self.compression = compression
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        """不再读取新的行，在途的请求完成后结束"""
+        self.stop_event.set()
+
+    def run(self):
+        from data_runner import ResultWriter, iter_rows, run_rows
+
+        counts = {'done': 0, 'failed': 0}
+        last_emit = time.monotonic()
+        start = time.monotonic()
+
+        try:
+            with ResultWriter(self.output_path) as writer:
+                def on_result(result):
+                    nonlocal last_emit
+                    writer.write(result)
+                    counts['done'] += 1
+                    if result['error'] or (result['status_code'] or 0) >= 400:
+                        counts['failed'] += 1
+                    # 限制信号频率，避免大量行时阻塞界面
+                    now = time.monotonic()
+                    if now - last_emit >= 0.2:
+                        last_emit = now
+                        self.progress.emit(counts['done'], counts['failed'])
+
+                run_rows(self.request, iter_rows(self.data_path), on_result, self.variables,
+                         self.concurrency, self.compression, stop=self.stop_event)
+            self.finished.emit(counts['done'], counts['failed'], time.monotonic() - start)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class CollectionImportThread(QThread):
+    """批量导入请求到集合的线程"""
+    finished = QSignal(int, int)
+    error = QSignal(str)
+
+    def __init__(self, workspace_path, collection_name, source_factory):
+        super().__init__()
+        self.workspace_path = workspace_path
+        self.collection_name = collection_name
+        self.source_factory = source_factory
+
+    def run(self):
+        store = None
+        try:
+            # 使用独立连接写入，主界面的读取不受影响
+            store = CollectionStore(self.workspace_path)
+            collection_id = store.create_collection(self.collection_name)
+            count = store.add_requests(collection_id, self.source_factory())
+            self.finished.emit(collection_id, count)
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            if store:
+                store.close()
+
+
 class HTTPClient(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup_time=None):
         super().__init__()
+        # 启动计时起点（由 main.py 传入进程启动时间）
+        self.startup_time = startup_time or time.perf_counter()
+        self.first_paint_ms = None
+
         self.setWindowTitle("HTTP 请求工具 - 专业版")
         self.setMinimumSize(1200, 800)
         self.resize(1400, 900)
 
         # 初始化变量
         self.request_history = []
+        self.history_loaded = False
+        self.history_save_pending = False
+        self.history_load_thread = None
         self.current_request_thread = None
+        self.history_writer = HistoryWriter(get_history_file())
+        self.har_import_thread = None
+        self.collection_import_thread = None
+        self.response_load_thread = None
+        self.data_run_thread = None
+        self.query_params = QueryParamsModel()
+        self.syncing_params = False  # URL与参数表格互相更新时避免循环触发
+        self.collection_store = CollectionStore(get_workspace_file())
+        self.metrics_store = MetricsStore()
+        self.environment_store = EnvironmentStore()
+        self.request_trace_id = 0  # 性能追踪：每次发送请求加一
 
         # 使用默认样式，不设置自定义样式表
 
@@ -294,8 +351,10 @@ class HTTPClient(QMainWindow):
         # 添加默认请求头
         self.add_default_headers()
 
-        # 加载历史记录
-        self.load_history()
+        # 加载集合（只加载顶层节点，文件夹展开时再读取）
+        self.refresh_collection_tree()
+
+        # 历史记录在窗口首次绘制后于后台加载，见 paintEvent
 
     def create_menu_bar(self):
         menubar = self.menuBar()
@@ -311,6 +370,22 @@ class HTTPClient(QMainWindow):
 
         file_menu.addSeparator()
 
+        open_workspace_action = file_menu.addAction('打开工作区...')
+        open_workspace_action.triggered.connect(self.open_workspace)
+
+        file_menu.addSeparator()
+
+        import_har_action = file_menu.addAction('导入HAR...')
+        import_har_action.triggered.connect(self.import_har_file)
+
+        export_har_action = file_menu.addAction('导出HAR...')
+        export_har_action.triggered.connect(self.export_har_file)
+
+        import_har_collection_action = file_menu.addAction('导入HAR到集合...')
+        import_har_collection_action.triggered.connect(self.import_har_to_collection)
+
+        file_menu.addSeparator()
+
         clear_history_action = file_menu.addAction('清空历史')
         clear_history_action.triggered.connect(self.clear_history)
 
@@ -320,11 +395,89 @@ class HTTPClient(QMainWindow):
         import_raw_action = tools_menu.addAction('导入原始请求')
         import_raw_action.triggered.connect(self.import_raw_request)
 
+        bulk_import_raw_action = tools_menu.addAction('批量导入原始请求文件...')
+        bulk_import_raw_action.triggered.connect(self.import_raw_requests_file)
+
+        bulk_import_curl_action = tools_menu.addAction('批量导入cURL脚本...')
+        bulk_import_curl_action.triggered.connect(self.import_curl_script)
+
+        load_response_action = tools_menu.addAction('加载原始响应...')
+        load_response_action.triggered.connect(self.load_raw_response)
+
         tools_menu.addSeparator()
 
         format_json_action = tools_menu.addAction('格式化JSON')
         format_json_action.triggered.connect(self.format_json)
 
+        latency_action = tools_menu.addAction('接口耗时统计')
+        latency_action.triggered.connect(self.show_latency_stats)
+
+        self.data_run_action = tools_menu.addAction('数据驱动执行...')
+        self.data_run_action.triggered.connect(self.run_data_file)
+
+        tools_menu.addSeparator()
+
+        # 性能追踪：记录启动和请求各阶段的耗时，导出后在 Perfetto 或 chrome://tracing 中查看
+        self.trace_action = tools_menu.addAction('记录性能追踪')
+        self.trace_action.setCheckable(True)
+        self.trace_action.setChecked(tracing.is_enabled())
+        self.trace_action.toggled.connect(self.toggle_tracing)
+
+        export_trace_action = tools_menu.addAction('导出性能追踪...')
+        export_trace_action.triggered.connect(self.export_trace)
+
+    def refresh_environment_combo(self):
+        """重新填充环境下拉框并选中当前环境"""
+        self.environment_combo.blockSignals(True)
+        self.environment_combo.clear()
+        self.environment_combo.addItem("无环境", None)
+        for name in self.environment_store.names():
+            self.environment_combo.addItem(name, name)
+        index = self.environment_combo.findData(self.environment_store.active)
+        self.environment_combo.setCurrentIndex(max(index, 0))
+        self.environment_combo.blockSignals(False)
+
+    def on_environment_selected(self, index):
+        """切换当前环境并保存选择"""
+        try:
+            self.environment_store.set_active(self.environment_combo.itemData(index))
+            self.environment_store.save()
+        except (KeyError, OSError) as e:
+            self.status_bar.showMessage(f"无法切换环境: {e}", 5000)
+            return
+        name = self.environment_store.active or "无环境"
+        self.status_bar.showMessage(f"当前环境: {name}", 3000)
+
+    def edit_environments(self):
+        """打开环境管理对话框"""
+        from environment_dialog import EnvironmentDialog
+        dialog = EnvironmentDialog(self.environment_store, self)
+        if dialog.exec() == QDialog.Accepted:
+            self.refresh_environment_combo()
+
+    def toggle_tracing(self, checked):
+        """开始或停止记录性能追踪"""
+        if checked:
+            tracing.enable()
+            self.status_bar.showMessage("开始记录性能追踪", 3000)
+        else:
+            tracing.disable()
+            self.status_bar.showMessage("已停止记录性能追踪", 3000)
+
+    def export_trace(self):
+        """导出性能追踪为 Chrome trace-event JSON"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出性能追踪", "trace.json", "Chrome Trace (*.json)"
+        )
+        if file_path:
+            try:
+                count = tracing.export_chrome_trace(file_path)
+                self.status_bar.showMessage(
+                    f"已导出 {count} 个事件到 {file_path}，可在 ui.perfetto.dev 或 chrome://tracing 中打开", 5000
+                )
+            except OSError as e:
+                QMessageBox.critical(self, "导出失败", f"无法导出性能追踪: {str(e)}")
+
     def create_status_bar(self):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
@@ -360,6 +513,10 @@ class HTTPClient(QMainWindow):
         history_group = QGroupBox("请求历史")
         history_layout = QVBoxLayout(history_group)
 
+        self.history_loading_label = QLabel("正在加载历史记录...")
+        self.history_loading_label.setVisible(False)
+        history_layout.addWidget(self.history_loading_label)
+
         self.history_list = QListWidget()
         self.history_list.itemClicked.connect(self.load_from_history)
         history_layout.addWidget(self.history_list)
@@ -379,6 +536,50 @@ class HTTPClient(QMainWindow):
         history_layout.addLayout(history_buttons_layout)
         left_layout.addWidget(history_group)
 
+        # 集合组
+        collections_group = QGroupBox("集合")
+        collections_layout = QVBoxLayout(collections_group)
+
+        # 搜索框（输入停止后再查询）
+        self.collection_search_timer = QTimer(self)
+        self.collection_search_timer.setSingleShot(True)
+        self.collection_search_timer.setInterval(200)
+        self.collection_search_timer.timeout.connect(self.search_collections)
+
+        self.collection_search = QLineEdit()
+        self.collection_search.setPlaceholderText("搜索集合中的请求...")
+        self.collection_search.textChanged.connect(lambda: self.collection_search_timer.start())
+        collections_layout.addWidget(self.collection_search)
+
+        self.collection_tree = QTreeWidget()
+        self.collection_tree.setHeaderHidden(True)
+        self.collection_tree.itemExpanded.connect(self.on_collection_item_expanded)
+        self.collection_tree.itemDoubleClicked.connect(self.on_collection_item_activated)
+        collections_layout.addWidget(self.collection_tree)
+
+        # 集合操作按钮
+        collection_buttons_layout = QGridLayout()
+
+        new_collection_btn = QPushButton("新建集合")
+        new_collection_btn.clicked.connect(self.new_collection)
+
+        new_folder_btn = QPushButton("新建文件夹")
+        new_folder_btn.clicked.connect(self.new_collection_folder)
+
+        save_to_collection_btn = QPushButton("保存到集合")
+        save_to_collection_btn.clicked.connect(self.save_to_collection)
+
+        delete_collection_item_btn = QPushButton("删除")
+        delete_collection_item_btn.clicked.connect(self.delete_collection_item)
+
+        collection_buttons_layout.addWidget(new_collection_btn, 0, 0)
+        collection_buttons_layout.addWidget(new_folder_btn, 0, 1)
+        collection_buttons_layout.addWidget(save_to_collection_btn, 1, 0)
+        collection_buttons_layout.addWidget(delete_collection_item_btn, 1, 1)
+
+        collections_layout.addLayout(collection_buttons_layout)
+        left_layout.addWidget(collections_group)
+
         return left_widget
 
     def create_right_panel(self):
@@ -402,6 +603,7 @@ class HTTPClient(QMainWindow):
         url_label = QLabel("URL:")
         self.url_input = QLineEdit()
         self.url_input.setPlaceholderText("请输入完整的URL地址")
+        self.url_input.textChanged.connect(self.on_url_changed)
 
         first_row.addWidget(method_label)
         first_row.addWidget(self.method_combo)
@@ -434,8 +636,20 @@ class HTTPClient(QMainWindow):
         save_button = QPushButton("保存")
         save_button.clicked.connect(self.save_request)
 
+        # 环境：发送时用所选环境的变量替换 {{变量}}
+        environment_label = QLabel("环境:")
+        self.environment_combo = QComboBox()
+        self.environment_combo.setMinimumWidth(120)
+        self.environment_combo.currentIndexChanged.connect(self.on_environment_selected)
+        environment_button = QPushButton("环境...")
+        environment_button.clicked.connect(self.edit_environments)
+        self.refresh_environment_combo()
+
         second_row.addWidget(timeout_label)
         second_row.addWidget(self.timeout_spin)
+        second_row.addWidget(environment_label)
+        second_row.addWidget(self.environment_combo)
+        second_row.addWidget(environment_button)
         second_row.addStretch()
         second_row.addWidget(save_button)
         second_row.addWidget(self.stop_button)
@@ -447,23 +661,250 @@ class HTTPClient(QMainWindow):
         # 标签页区域
         self.tab_widget = QTabWidget()
 
+        # 查询参数标签页
+        params_widget = self.create_params_tab()
+        self.tab_widget.addTab(params_widget, "参数")
+
         # 请求头标签页
-        headers_widget = self.create_headers_tab()
-        self.tab_widget.addTab(headers_widget, "请求头")
+        self.headers_widget = self.create_headers_tab()
+        self.tab_widget.addTab(self.headers_widget, "请求头")
 
         # 请求体标签页
-        self.body_edit = QTextEdit()
-        self.body_edit.setPlaceholderText("请输入请求体内容（JSON、XML、文本等）")
-        self.tab_widget.addTab(self.body_edit, "请求体")
+        self.body_widget = self.create_body_tab()
+        self.tab_widget.addTab(self.body_widget, "请求体")
 
         # 响应标签页
-        response_widget = self.create_response_tab()
-        self.tab_widget.addTab(response_widget, "响应")
+        self.response_widget = self.create_response_tab()
+        self.tab_widget.addTab(self.response_widget, "响应")
 
         right_layout.addWidget(self.tab_widget)
 
         return right_widget
 
+    def create_body_tab(self):
+        body_widget = QWidget()
+        body_layout = QVBoxLayout(body_widget)
+        body_layout.setContentsMargins(0, 0, 0, 0)
+
+        # 从文件发送：文件在发送时按块读取，不载入编辑器
+        body_file_layout = QHBoxLayout()
+
+        choose_file_btn = QPushButton("从文件发送...")
+        choose_file_btn.clicked.connect(self.choose_body_file)
+
+        self.body_file_label = QLabel("")
+
+        # JSON 有效性提示，在后台线程中检查，只用于显示
+        self.body_hint_label = QLabel("")
+
+        self.clear_body_file_btn = QPushButton("改用文本")
+        self.clear_body_file_btn.clicked.connect(lambda: self.set_body_file(None))
+
+        self.chunked_check = QCheckBox("分块传输")
+        self.chunked_check.setToolTip("不预先计算 Content-Length，使用 Transfer-Encoding: chunked 发送")
+
+        body_file_layout.addWidget(choose_file_btn)
+        body_file_layout.addWidget(self.body_file_label)
+        body_file_layout.addWidget(self.body_hint_label)
+        body_file_layout.addStretch()
+        body_file_layout.addWidget(self.chunked_check)
+        body_file_layout.addWidget(self.clear_body_file_btn)
+
+        # 请求体压缩，压缩在请求线程中进行
+        compression_label = QLabel("压缩:")
+        self.compression_combo = QComboBox()
+        self.compression_combo.addItem("不压缩", None)
+        for encoding in COMPRESSION_METHODS:
+            self.compression_combo.addItem(encoding, encoding)
+        self.compression_combo.setToolTip("压缩请求体并设置 Content-Encoding，服务器需要支持对应的编码")
+        body_file_layout.addWidget(compression_label)
+        body_file_layout.addWidget(self.compression_combo)
+        body_layout.addLayout(body_file_layout)
+
+        # QPlainTextEdit 的文档按文本块分段存储，大请求体的输入和编辑不需要重排整个文档；
+        # JSON 检查和格式化在后台线程中处理取出的文本
+        self.body_edit = QPlainTextEdit()
+        self.body_edit.setPlaceholderText("请输入请求体内容（JSON、XML、文本等）")
+        body_layout.addWidget(self.body_edit)
+        self.format_body_thread = None
+
+        self.json_check_thread = None
+        self.json_check_generation = 0
+        self.json_check_timer = QTimer(self)
+        self.json_check_timer.setSingleShot(True)
+        self.json_check_timer.setInterval(500)
+        self.json_check_timer.timeout.connect(self.start_json_check)
+        self.body_edit.textChanged.connect(self.on_body_text_changed)
+
+        self.set_body_file(None)
+        return body_widget
+
+    def on_body_text_changed(self):
+        """请求体变化后重新计时，停止输入后再检查 JSON"""
+        self.json_check_generation += 1
+        self.json_check_timer.start()
+
+    def start_json_check(self):
+        """在后台检查请求体是否为有效 JSON；上一次检查未结束时等其完成后再检查"""
+        if self.json_check_thread and self.json_check_thread.isRunning():
+            return
+        text = self.body_edit.toPlainText()
+        if not looks_like_json(text):
+            self.body_hint_label.setText("")
+            return
+        self.json_check_thread = JsonCheckThread(text, self.json_check_generation)
+        self.json_check_thread.finished.connect(self.on_json_checked)
+        self.json_check_thread.start()
+
+    def on_json_checked(self, error, generation):
+        """显示 JSON 检查结果；期间文本又变化时检查最新的文本"""
+        if generation != self.json_check_generation:
+            self.start_json_check()
+            return
+        if error is None:
+            self.body_hint_label.setText("<span style='color: green;'>JSON 有效</span>")
+            self.body_hint_label.setToolTip("")
+        else:
+            self.body_hint_label.setText(f"<span style='color: red;'>JSON 无效: {html.escape(error)}</span>")
+            self.body_hint_label.setToolTip(error)
+
+    def choose_body_file(self):
+        """选择作为请求体发送的文件"""
+        file_path, _ = QFileDialog.getOpenFileName(self, "选择请求体文件", "", "所有文件 (*)")
+        if file_path:
+            self.set_body_file(file_path)
+
+    def set_body_file(self, file_path):
+        """设置或清除文件请求体；使用文件时禁用文本编辑器"""
+        self.body_file_path = file_path
+        self.body_edit.setEnabled(file_path is None)
+        self.clear_body_file_btn.setVisible(file_path is not None)
+        self.chunked_check.setVisible(file_path is not None)
+        if file_path is None:
+            self.body_file_label.setText("")
+            return
+        try:
+            size = self.format_size(os.path.getsize(file_path))
+        except OSError:
+            size = "文件不存在"
+        self.body_file_label.setText(f"{os.path.basename(file_path)} ({size})")
+        self.body_file_label.setToolTip(file_path)
+
+    def create_params_tab(self):
+        params_widget = QWidget()
+        params_layout = QVBoxLayout(params_widget)
+
+        # 参数操作按钮
+        params_buttons_layout = QHBoxLayout()
+
+        add_param_btn = QPushButton("添加参数")
+        add_param_btn.clicked.connect(self.add_param_row)
+
+        remove_param_btn = QPushButton("删除选中")
+        remove_param_btn.clicked.connect(self.remove_selected_params)
+
+        params_buttons_layout.addWidget(add_param_btn)
+        params_buttons_layout.addWidget(remove_param_btn)
+        params_buttons_layout.addStretch()
+        params_layout.addLayout(params_buttons_layout)
+
+        # 参数表格，与URL中的查询字符串双向同步，重复的参数各占一行
+        self.params_table = QTableWidget()
+        self.params_table.setColumnCount(2)
+        self.params_table.setHorizontalHeaderLabels(["Key", "Value"])
+        self.params_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.params_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.params_table.itemChanged.connect(self.on_param_item_changed)
+        params_layout.addWidget(self.params_table)
+
+        return params_widget
+
+    def on_url_changed(self, url):
+        """URL变化时只更新参数表格中发生变化的行"""
+        if self.syncing_params:
+            return
+        change = self.query_params.set_url(url)
+        if change is None:
+            return
+
+        start, removed, pairs = change
+        self.syncing_params = True
+        self.params_table.setUpdatesEnabled(False)
+        try:
+            common = min(removed, len(pairs))
+            for offset in range(common):
+                self.set_param_row(start + offset, *pairs[offset])
+            for _ in range(removed - common):
+                self.params_table.removeRow(start + common)
+            for offset in range(common, len(pairs)):
+                self.params_table.insertRow(start + offset)
+                self.set_param_row(start + offset, *pairs[offset])
+        finally:
+            self.params_table.setUpdatesEnabled(True)
+            self.syncing_params = False
+
+    def set_param_row(self, row, key, value):
+        """设置参数表格一行的内容，内容相同时不触发重绘"""
+        for column, text in ((0, key), (1, value)):
+            item = self.params_table.item(row, column)
+            if item is None:
+                self.params_table.setItem(row, column, QTableWidgetItem(text))
+            elif item.text() != text:
+                item.setText(text)
+
+    def param_row_text(self, row):
+        """读取参数表格一行的 (key, value)"""
+        key_item = self.params_table.item(row, 0)
+        value_item = self.params_table.item(row, 1)
+        return (key_item.text() if key_item else '', value_item.text() if value_item else '')
+
+    def update_url_from_params(self, url):
+        """参数表格被编辑后写回URL，保持光标位置"""
+        self.syncing_params = True
+        try:
+            cursor = self.url_input.cursorPosition()
+            self.url_input.setText(url)
+            self.url_input.setCursorPosition(min(cursor, len(url)))
+        finally:
+            self.syncing_params = False
+
+    def on_param_item_changed(self, item):
+        """参数单元格被编辑：只重新编码这一个参数"""
+        if self.syncing_params:
+            return
+        row = item.row()
+        if row >= len(self.query_params):
+            return
+        self.update_url_from_params(self.query_params.set_param(row, *self.param_row_text(row)))
+
+    def add_param_row(self):
+        """在末尾添加空参数"""
+        row = len(self.query_params)
+        url = self.query_params.insert_param(row)
+        self.syncing_params = True
+        try:
+            self.params_table.insertRow(row)
+            self.set_param_row(row, '', '')
+        finally:
+            self.syncing_params = False
+        self.update_url_from_params(url)
+        self.params_table.editItem(self.params_table.item(row, 0))
+
+    def remove_selected_params(self):
+        """删除选中的参数"""
+        selected_rows = {item.row() for item in self.params_table.selectedItems()}
+        if not selected_rows:
+            return
+        url = self.url_input.text()
+        self.syncing_params = True
+        try:
+            for row in sorted(selected_rows, reverse=True):
+                url = self.query_params.remove_param(row)
+                self.params_table.removeRow(row)
+        finally:
+            self.syncing_params = False
+        self.update_url_from_params(url)
+
     def create_headers_tab(self):
         headers_widget = QWidget()
         headers_layout = QVBoxLayout(headers_widget)
@@ -535,10 +976,12 @@ class HTTPClient(QMainWindow):
         self.status_label = QLabel("状态: 未发送")
         self.time_label = QLabel("响应时间: -")
         self.size_label = QLabel("大小: -")
+        self.compression_label = QLabel("")
 
         response_info_layout.addWidget(self.status_label)
         response_info_layout.addWidget(self.time_label)
         response_info_layout.addWidget(self.size_label)
+        response_info_layout.addWidget(self.compression_label)
         response_info_layout.addStretch()
 
         # 格式化按钮
@@ -671,23 +1114,40 @@ class HTTPClient(QMainWindow):
 
     def format_json(self):
         """格式化当前标签页的JSON内容"""
-        current_tab = self.tab_widget.currentIndex()
-        if current_tab == 1:  # 请求体标签页
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab is self.body_widget:  # 请求体标签页
             self.format_body_json()
-        elif current_tab == 2:  # 响应标签页
+        elif current_tab is self.response_widget:  # 响应标签页
             self.format_response_json()
 
     def format_body_json(self):
-        """格式化请求体JSON"""
-        try:
-            text = self.body_edit.toPlainText()
-            if text.strip():
-                parsed = json.loads(text)
-                formatted = json.dumps(parsed, indent=2, ensure_ascii=False)
-                self.body_edit.setPlainText(formatted)
-                self.status_bar.showMessage("JSON格式化成功", 2000)
-        except json.JSONDecodeError as e:
-            QMessageBox.warning(self, "JSON格式错误", f"无法解析JSON: {str(e)}")
+        """在后台格式化请求体JSON，界面不等待"""
+        if self.format_body_thread and self.format_body_thread.isRunning():
+            return
+        self.status_bar.showMessage("正在格式化JSON...")
+        document = self.body_edit.document()
+        self.format_body_thread = FormatBodyThread(document.toPlainText(), document.revision())
+        self.format_body_thread.finished.connect(self.on_body_formatted)
+        self.format_body_thread.start()
+
+    def on_body_formatted(self, formatted, error, revision):
+        """把格式化结果作为一次编辑应用，可以用撤销恢复；期间请求体又被修改时丢弃结果"""
+        if error is not None:
+            self.status_bar.clearMessage()
+            QMessageBox.warning(self, "JSON格式错误", f"无法解析JSON: {error}")
+            return
+        if formatted is None:
+            self.status_bar.clearMessage()
+            return
+        if revision != self.body_edit.document().revision():
+            self.status_bar.showMessage("请求体在格式化期间被修改，请重新格式化", 3000)
+            return
+        cursor = QTextCursor(self.body_edit.document())
+        cursor.beginEditBlock()
+        cursor.select(QTextCursor.SelectionType.Document)
+        cursor.insertText(formatted)
+        cursor.endEditBlock()
+        self.status_bar.showMessage("JSON格式化成功", 2000)
 
     def format_response_json(self):
         """格式化响应JSON"""
@@ -723,10 +1183,12 @@ class HTTPClient(QMainWindow):
             request_data = {
                 'method': self.method_combo.currentText(),
                 'url': self.url_input.text(),
-                'headers': self.get_headers(),
+                'headers': header_data(self.get_headers()),
                 'body': self.body_edit.toPlainText(),
                 'timeout': self.timeout_spin.value()
             }
+            if self.body_file_path:
+                request_data['body_file'] = self.body_file_path
 
             try:
                 with open(file_path, 'w', encoding='utf-8') as f:
@@ -750,6 +1212,7 @@ class HTTPClient(QMainWindow):
                 self.method_combo.setCurrentText(request_data.get('method', 'GET'))
                 self.url_input.setText(request_data.get('url', ''))
                 self.body_edit.setPlainText(request_data.get('body', ''))
+                self.set_body_file(request_data.get('body_file'))
                 self.timeout_spin.setValue(request_data.get('timeout', 30))
 
                 # 设置请求头
@@ -760,11 +1223,11 @@ class HTTPClient(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "加载失败", f"无法加载文件: {str(e)}")
 
-    def load_headers(self, headers_dict):
-        """加载请求头到表格"""
+    def load_headers(self, headers):
+        """加载请求头到表格（字典、[[名称, 值], ...] 或 Headers，重复字段各占一行）"""
         self.headers_table.setRowCount(0)
 
-        for key, value in headers_dict.items():
+        for key, value in Headers(headers or {}).items():
             row_count = self.headers_table.rowCount()
             self.headers_table.insertRow(row_count)
 
@@ -777,6 +1240,345 @@ class HTTPClient(QMainWindow):
             self.headers_table.setItem(row_count, 1, QTableWidgetItem(key))
             self.headers_table.setItem(row_count, 2, QTableWidgetItem(value))
 
+    def import_har_file(self):
+        """从HAR文件导入请求到历史记录"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "导入HAR", "", "HAR文件 (*.har);;所有文件 (*)"
+        )
+
+        if not file_path:
+            return
+        if self.har_import_thread and self.har_import_thread.isRunning():
+            QMessageBox.warning(self, "导入中", "已有HAR文件正在导入")
+            return
+
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.status_bar.showMessage("正在导入HAR文件...")
+
+        self.har_import_thread = HarImportThread(file_path)
+        self.har_import_thread.progress.connect(
+            lambda count: self.status_bar.showMessage(f"正在导入HAR文件... 已读取 {count} 条")
+        )
+        self.har_import_thread.finished.connect(self.on_har_imported)
+        self.har_import_thread.error.connect(self.on_har_import_error)
+        self.har_import_thread.start()
+
+    def on_har_imported(self, items, total):
+        """HAR导入完成处理"""
+        self.progress_bar.setVisible(False)
+
+        # HAR按时间顺序排列，历史记录最新的在前
+        self.request_history = self.dedupe_history(list(reversed(items)) + self.request_history)
+        self.update_history_list()
+        self.save_history()
+        self.status_bar.showMessage(f"HAR导入完成: 共 {total} 条请求，已加入最近 {len(items)} 条", 5000)
+
+    def on_har_import_error(self, error_message):
+        """HAR导入错误处理"""
+        self.progress_bar.setVisible(False)
+        self.status_bar.showMessage("HAR导入失败", 3000)
+        QMessageBox.critical(self, "导入失败", f"无法导入HAR文件: {error_message}")
+
+    def export_har_file(self):
+        """将历史记录导出为HAR文件"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出HAR", "", "HAR文件 (*.har)"
+        )
+
+        if file_path:
+            try:
+                from har import export_har
+                count = export_har(self.request_history, file_path)
+                self.status_bar.showMessage(f"已导出 {count} 条请求到 {file_path}", 3000)
+            except Exception as e:
+                QMessageBox.critical(self, "导出失败", f"无法导出HAR文件: {str(e)}")
+
+    def open_workspace(self):
+        """打开或新建工作区文件"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "打开工作区", self.collection_store.path, "工作区文件 (*.db)",
+            options=QFileDialog.DontConfirmOverwrite
+        )
+
+        if file_path:
+            try:
+                store = CollectionStore(file_path)
+            except Exception as e:
+                QMessageBox.critical(self, "打开失败", f"无法打开工作区: {str(e)}")
+                return
+
+            self.collection_store.close()
+            self.collection_store = store
+            self.collection_search.clear()
+            self.refresh_collection_tree()
+            self.status_bar.showMessage(f"已打开工作区 {file_path}", 3000)
+
+    def refresh_collection_tree(self):
+        """重新加载集合树的顶层节点"""
+        self.collection_tree.clear()
+        for collection in self.collection_store.list_collections():
+            self.add_collection_node(
+                self.collection_tree, 'collection', collection['id'], collection['id'],
+                collection['name'], True
+            )
+
+    def add_collection_node(self, parent, kind, node_id, collection_id, text, has_children=False):
+        """添加集合树节点，集合和文件夹的子节点在展开时才加载"""
+        item = QTreeWidgetItem(parent, [text])
+        item.setData(0, Qt.UserRole, (kind, node_id, collection_id))
+        if kind != 'request':
+            item.setData(0, Qt.UserRole + 1, False)  # 子节点是否已加载
+            item.setChildIndicatorPolicy(
+                QTreeWidgetItem.ShowIndicator if has_children else QTreeWidgetItem.DontShowIndicator
+            )
+        return item
+
+    def load_collection_children(self, item):
+        """加载集合或文件夹的直接子节点"""
+        kind, node_id, collection_id = item.data(0, Qt.UserRole)
+        folder_id = node_id if kind == 'folder' else None
+
+        item.takeChildren()
+        children = self.collection_store.list_children(collection_id, folder_id)
+        for folder in children['folders']:
+            self.add_collection_node(
+                item, 'folder', folder['id'], collection_id, folder['name'], bool(folder['has_children'])
+            )
+        for request in children['requests']:
+            child = self.add_collection_node(item, 'request', request['id'], collection_id, request['name'])
+            child.setToolTip(0, f"{request['method']} {request['url']}")
+
+        item.setData(0, Qt.UserRole + 1, True)
+        item.setChildIndicatorPolicy(
+            QTreeWidgetItem.ShowIndicator if item.childCount() else QTreeWidgetItem.DontShowIndicator
+        )
+
+    def on_collection_item_expanded(self, item):
+        """展开节点时懒加载子节点"""
+        if not item.data(0, Qt.UserRole + 1):
+            self.load_collection_children(item)
+
+    def on_collection_item_activated(self, item, column):
+        """双击请求节点时加载到编辑区"""
+        kind, node_id, _ = item.data(0, Qt.UserRole)
+        if kind != 'request':
+            return
+
+        request_data = self.collection_store.get_request(node_id)
+        if request_data:
+            self.apply_request_data(request_data)
+            self.status_bar.showMessage(f"已从集合加载请求: {request_data['name']}", 2000)
+
+    def search_collections(self):
+        """搜索集合中的请求，结果以平铺列表显示"""
+        query = self.collection_search.text().strip()
+        if not query:
+            self.refresh_collection_tree()
+            return
+
+        self.collection_tree.clear()
+        for request in self.collection_store.search(query):
+            item = self.add_collection_node(
+                self.collection_tree, 'request', request['id'], request['collection_id'], request['name']
+            )
+            item.setToolTip(0, f"{request['method']} {request['url']}")
+
+    def get_collection_target(self):
+        """获取当前选中的集合/文件夹，选中请求时返回其所在的节点"""
+        item = self.collection_tree.currentItem()
+        while item and item.data(0, Qt.UserRole)[0] == 'request':
+            item = item.parent()
+        if not item:
+            return None, None, None
+
+        kind, node_id, collection_id = item.data(0, Qt.UserRole)
+        folder_id = node_id if kind == 'folder' else None
+        return item, collection_id, folder_id
+
+    def reload_collection_item(self, item):
+        """重新加载节点的子节点并展开"""
+        self.load_collection_children(item)
+        item.setExpanded(True)
+
+    def new_collection(self):
+        """新建集合"""
+        name, ok = QInputDialog.getText(self, "新建集合", "集合名称:")
+        if ok and name.strip():
+            self.collection_store.create_collection(name.strip())
+            self.collection_search.clear()
+            self.refresh_collection_tree()
+
+    def new_collection_folder(self):
+        """在选中的集合或文件夹下新建文件夹"""
+        item, collection_id, folder_id = self.get_collection_target()
+        if not item:
+            QMessageBox.warning(self, "未选择集合", "请先选择一个集合或文件夹")
+            return
+
+        name, ok = QInputDialog.getText(self, "新建文件夹", "文件夹名称:")
+        if ok and name.strip():
+            self.collection_store.create_folder(collection_id, name.strip(), folder_id)
+            self.reload_collection_item(item)
+
+    def save_to_collection(self):
+        """将当前请求保存到选中的集合或文件夹"""
+        item, collection_id, folder_id = self.get_collection_target()
+        if not item:
+            QMessageBox.warning(self, "未选择集合", "请先选择一个集合或文件夹")
+            return
+
+        method = self.method_combo.currentText()
+        url = self.url_input.text().strip()
+        name, ok = QInputDialog.getText(self, "保存到集合", "请求名称:", text=f"{method} {url}")
+        if not ok or not name.strip():
+            return
+
+        request_data = {
+            'method': method,
+            'url': url,
+            'headers': self.get_headers(),
+            'body': self.body_edit.toPlainText(),
+            'timeout': self.timeout_spin.value()
+        }
+        if self.body_file_path:
+            request_data['body_file'] = self.body_file_path
+        self.collection_store.add_request(collection_id, request_data, folder_id, name.strip())
+        self.reload_collection_item(item)
+        self.status_bar.showMessage(f"请求已保存到集合: {name.strip()}", 2000)
+
+    def delete_collection_item(self):
+        """删除选中的集合、文件夹或请求"""
+        item = self.collection_tree.currentItem()
+        if not item:
+            return
+
+        kind, node_id, _ = item.data(0, Qt.UserRole)
+        reply = QMessageBox.question(
+            self, "确认删除", f"确定要删除 \"{item.text(0)}\" 吗？",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        if kind == 'collection':
+            self.collection_store.delete_collection(node_id)
+        elif kind == 'folder':
+            self.collection_store.delete_folder(node_id)
+        else:
+            self.collection_store.delete_request(node_id)
+
+        parent = item.parent()
+        (parent or self.collection_tree.invisibleRootItem()).removeChild(item)
+
+    def start_collection_import(self, collection_name, source_factory):
+        """在后台线程中把请求批量导入到集合"""
+        if self.collection_import_thread and self.collection_import_thread.isRunning():
+            QMessageBox.warning(self, "导入中", "已有导入任务正在进行")
+            return
+
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.status_bar.showMessage(f"正在导入到集合 {collection_name}...")
+
+        self.collection_import_thread = CollectionImportThread(
+            self.collection_store.path, collection_name, source_factory
+        )
+        self.collection_import_thread.finished.connect(self.on_collection_imported)
+        self.collection_import_thread.error.connect(self.on_collection_import_error)
+        self.collection_import_thread.start()
+
+    def on_collection_imported(self, collection_id, count):
+        """集合导入完成处理"""
+        self.progress_bar.setVisible(False)
+        self.collection_search.clear()
+        self.refresh_collection_tree()
+        self.status_bar.showMessage(f"已导入 {count} 个请求到集合", 5000)
+
+    def on_collection_import_error(self, error_message):
+        """集合导入错误处理"""
+        self.progress_bar.setVisible(False)
+        self.status_bar.showMessage("导入失败", 3000)
+        QMessageBox.critical(self, "导入失败", f"无法导入到集合: {error_message}")
+
+    def import_har_to_collection(self):
+        """将HAR文件中的全部请求导入为新集合"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "导入HAR到集合", "", "HAR文件 (*.har);;所有文件 (*)"
+        )
+
+        if file_path:
+            from har import import_har
+            collection_name = os.path.splitext(os.path.basename(file_path))[0]
+            self.start_collection_import(collection_name, lambda: import_har(file_path))
+
+    def import_raw_requests_file(self):
+        """将包含多个原始HTTP请求的文件（代理/WAF导出）导入为新集合"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "批量导入原始请求", "", "文本文件 (*.txt *.http *.log);;所有文件 (*)"
+        )
+
+        if file_path:
+            from http_parser import iter_http_requests
+            collection_name = os.path.splitext(os.path.basename(file_path))[0]
+            self.start_collection_import(
+                collection_name,
+                lambda: (result for result in iter_http_requests(file_path) if result['success'])
+            )
+
+    def import_curl_script(self):
+        """将 shell 脚本或“全部复制为cURL”内容中的 curl 命令导入为新集合"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "批量导入cURL脚本", "", "脚本文件 (*.sh *.bat *.cmd *.ps1 *.txt);;所有文件 (*)"
+        )
+
+        if file_path:
+            from http_parser import iter_curl_commands
+            collection_name = os.path.splitext(os.path.basename(file_path))[0]
+            self.start_collection_import(
+                collection_name,
+                lambda: (result for result in iter_curl_commands(file_path) if result['success'])
+            )
+
+    def load_raw_response(self):
+        """加载保存在文件中的原始HTTP响应，显示在响应区并记录到当前请求的历史中"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "加载原始响应", "", "所有文件 (*);;文本文件 (*.txt *.http *.bin)"
+        )
+
+        if file_path:
+            self.progress_bar.setVisible(True)
+            self.progress_bar.setRange(0, 0)
+            self.status_bar.showMessage("正在解析原始响应...")
+
+            self.response_load_thread = ResponseLoadThread(file_path)
+            self.response_load_thread.finished.connect(self.on_raw_response_loaded)
+            self.response_load_thread.error.connect(self.on_raw_response_error)
+            self.response_load_thread.start()
+
+    def on_raw_response_loaded(self, response):
+        """原始响应解析完成处理"""
+        self.progress_bar.setVisible(False)
+        self.tab_widget.setCurrentWidget(self.response_widget)
+        self.on_request_finished(response.to_result(self.url_input.text().strip()))
+
+        url = self.url_input.text().strip()
+        if url:
+            self.add_to_history(
+                self.method_combo.currentText(), url, self.get_headers(),
+                self.body_edit.toPlainText().strip(), self.timeout_spin.value(),
+                response=response.to_history()
+            )
+
+        state = "" if response.complete else "（响应体不完整）"
+        self.status_bar.showMessage(f"已加载离线响应 - {response.status_code} {response.reason}{state}", 5000)
+
+    def on_raw_response_error(self, error_message):
+        """原始响应解析错误处理"""
+        self.progress_bar.setVisible(False)
+        self.status_bar.showMessage("解析失败", 3000)
+        QMessageBox.critical(self, "解析失败", f"无法解析原始响应: {error_message}")
+
     def clear_history(self):
         """清空历史记录"""
         reply = QMessageBox.question(
@@ -785,6 +1587,10 @@ class HTTPClient(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
+            if self.history_load_thread and not self.history_loaded:
+                # 放弃尚未加载完的历史记录
+                self.history_load_thread.requestInterruption()
+                self.finish_history_loading()
             self.request_history.clear()
             self.history_list.clear()
             self.save_history()
@@ -805,72 +1611,160 @@ class HTTPClient(QMainWindow):
         row = self.history_list.row(item)
         if row < len(self.request_history):
             request_data = self.request_history[row]
-
-            self.method_combo.setCurrentText(request_data.get('method', 'GET'))
-            self.url_input.setText(request_data.get('url', ''))
-            self.body_edit.setPlainText(request_data.get('body', ''))
-            self.timeout_spin.setValue(request_data.get('timeout', 30))
-
-            # 加载请求头
-            headers = request_data.get('headers', {})
-            self.load_headers(headers)
-
+            self.apply_request_data(request_data)
+            if request_data.get('response'):
+                self.show_saved_response(request_data['response'])
             self.status_bar.showMessage("已从历史记录加载请求", 2000)
 
-    def save_history(self):
-        """保存历史记录到文件"""
+    def show_saved_response(self, response):
+        """在响应区显示历史记录中保存的离线响应"""
+        text = response.get('body', '')
         try:
-            history_file = os.path.join(os.path.expanduser('~'), '.http_client_history.json')
-            with open(history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.request_history, f, indent=2, ensure_ascii=False)
-        except Exception:
-            pass  # 静默失败
+            parsed_json = json.loads(text)
+        except ValueError:
+            parsed_json = None
+        self.on_request_finished({
+            'status_code': response.get('status_code', 0),
+            'headers': Headers(response.get('headers') or {}),
+            'text': text,
+            'json': parsed_json,
+            'response_time': None,
+            'ttfb': None
+        })
+
+    def apply_request_data(self, request_data):
+        """将请求数据填充到编辑区"""
+        self.method_combo.setCurrentText(request_data.get('method', 'GET'))
+        self.url_input.setText(request_data.get('url', ''))
+        self.body_edit.setPlainText(request_data.get('body', ''))
+        self.set_body_file(request_data.get('body_file'))
+        self.timeout_spin.setValue(request_data.get('timeout', 30))
+
+        # 加载请求头
+        headers = request_data.get('headers', {})
+        self.load_headers(headers)
+
+    def save_history(self):
+        """保存历史记录到文件（交给后台写入器，合并后异步原子写入）"""
+        if not self.history_loaded:
+            # 历史尚未加载完，避免用不完整的列表覆盖文件
+            self.history_save_pending = True
+            return
+        self.history_writer.schedule(self.request_history)
+
+    def paintEvent(self, event):
+        """首次绘制完成后记录启动耗时并开始加载历史记录"""
+        super().paintEvent(event)
+        if self.first_paint_ms is None:
+            self.first_paint_ms = round((time.perf_counter() - self.startup_time) * 1000, 1)
+            instant('first_paint', 'gui', first_paint_ms=self.first_paint_ms)
+            QTimer.singleShot(0, self.load_history)
 
     def load_history(self):
-        """从文件加载历史记录"""
-        try:
-            history_file = os.path.join(os.path.expanduser('~'), '.http_client_history.json')
-            if os.path.exists(history_file):
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    self.request_history = json.load(f)
+        """在后台线程中分页加载历史记录"""
+        self.history_loaded = False
+        self.history_loading_label.setText("正在加载历史记录...")
+        self.history_loading_label.setVisible(True)
+        self.status_bar.showMessage(f"就绪 (启动用时 {self.first_paint_ms} ms)", 5000)
+
+        self.history_load_thread = HistoryLoadThread(self.history_writer.path)
+        self.history_load_thread.page_loaded.connect(self.on_history_page_loaded)
+        self.history_load_thread.loaded.connect(self.on_history_loaded)
+        self.history_load_thread.start()
+
+    def on_history_page_loaded(self, page):
+        """追加一页历史记录到列表末尾"""
+        if self.history_loaded:
+            return
 
-                # 更新历史列表显示
-                self.update_history_list()
-        except Exception:
-            self.request_history = []
+        self.request_history.extend(page)
+        for request in page:
+            self.history_list.addItem(self.format_history_item(request))
+        self.history_loading_label.setText(f"正在加载历史记录... 已加载 {len(self.request_history)} 条")
+
+    def on_history_loaded(self):
+        """历史记录加载完成处理"""
+        if self.history_loaded:
+            return
+
+        self.finish_history_loading()
+        if self.history_save_pending:
+            # 加载期间有新请求加入，合并后统一保存
+            self.history_save_pending = False
+            self.request_history = self.dedupe_history(self.request_history)
+            self.update_history_list()
+            self.save_history()
+
+    def finish_history_loading(self):
+        """结束加载状态"""
+        self.history_loaded = True
+        self.history_loading_label.setVisible(False)
+
+    def dedupe_history(self, requests):
+        """按方法、URL、请求体去重并限制历史记录数量"""
+        merged = []
+        seen = set()
+        for request in requests:
+            key = (request.get('method'), request.get('url'), request.get('body'))
+            if key not in seen:
+                seen.add(key)
+                merged.append(request)
+        return merged[:50]
+
+    def closeEvent(self, event):
+        """窗口关闭时写入尚未保存的历史记录"""
+        if self.history_load_thread and self.history_load_thread.isRunning():
+            self.history_load_thread.requestInterruption()
+            self.history_load_thread.wait()
+        if self.data_run_thread and self.data_run_thread.isRunning():
+            self.data_run_thread.stop()
+            self.data_run_thread.wait()
+        self.history_writer.close()
+        self.collection_store.close()
+        super().closeEvent(event)
 
     def update_history_list(self):
         """更新历史记录列表显示"""
         self.history_list.clear()
         for request in self.request_history:
-            method = request.get('method', 'GET')
-            url = request.get('url', '')
-            timestamp = request.get('timestamp', '')
+            self.history_list.addItem(self.format_history_item(request))
 
-            # 截断长URL
-            display_url = url if len(url) <= 50 else url[:47] + '...'
-            display_text = f"{method} {display_url}\n{timestamp}"
+    def format_history_item(self, request):
+        """生成历史记录列表项的显示文本"""
+        method = request.get('method', 'GET')
+        url = request.get('url', '')
+        timestamp = request.get('timestamp', '')
 
-            self.history_list.addItem(display_text)
+        # 截断长URL
+        display_url = url if len(url) <= 50 else url[:47] + '...'
+        return f"{method} {display_url}\n{timestamp}"
 
-    def add_to_history(self, method, url, headers, body, timeout):
-        """添加请求到历史记录"""
+    def add_to_history(self, method, url, headers, body, timeout, response=None, body_file=None):
+        """添加请求到历史记录（response 为离线加载的响应，body_file 为文件请求体的路径，均可选）"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
         request_data = {
             'method': method,
             'url': url,
-            'headers': headers,
+            'headers': header_data(headers),
             'body': body,
             'timeout': timeout,
             'timestamp': timestamp
         }
+        if response:
+            request_data['response'] = response
+        if body_file:
+            request_data['body_file'] = body_file
 
         # 避免重复记录
         for existing in self.request_history:
             if (existing.get('method') == method and
                 existing.get('url') == url and
-                existing.get('body') == body):
+                existing.get('body') == body and
+                existing.get('body_file') == body_file):
+                if response:
+                    existing['response'] = response
+                    self.save_history()
                 return
 
         self.request_history.insert(0, request_data)
@@ -883,8 +1777,8 @@ class HTTPClient(QMainWindow):
         self.save_history()
 
     def get_headers(self):
-        """获取启用的请求头"""
-        headers = {}
+        """获取启用的请求头（保留同名的多行请求头）"""
+        headers = Headers()
 
         if self.headers_mode == "table":
             # 从表格模式获取请求头
@@ -895,7 +1789,7 @@ class HTTPClient(QMainWindow):
                     key_item = self.headers_table.item(row, 1)
                     value_item = self.headers_table.item(row, 2)
                     if key_item and value_item and key_item.text().strip() and value_item.text().strip():
-                        headers[key_item.text().strip()] = value_item.text().strip()
+                        headers.add(key_item.text().strip(), value_item.text().strip())
         else:
             # 从文本模式获取请求头
             text = self.headers_text.toPlainText()
@@ -912,7 +1806,7 @@ class HTTPClient(QMainWindow):
                     key = parts[0].strip()
                     value = parts[1].strip() if len(parts) > 1 else ""
                     if key:
-                        headers[key] = value
+                        headers.add(key, value)
 
         return headers
 
@@ -928,21 +1822,27 @@ class HTTPClient(QMainWindow):
             QMessageBox.warning(self, "输入错误", "请输入URL")
             return
 
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-            self.url_input.setText(url)
+        # 准备请求体：按 Content-Type 编码一次，JSON 按编辑器中的原文发送
+        body_file = self.body_file_path if method in METHODS_WITH_BODY else None
+        body = '' if body_file else self.body_edit.toPlainText()
 
-        # 准备请求体数据
-        body = self.body_edit.toPlainText().strip()
-        data = None
+        # 替换 {{变量}}；历史记录中保存替换前的模板，切换环境后可以重新发送
+        try:
+            rendered = render_request(method, url, headers, body, self.environment_store.active_variables())
+        except TemplateError as e:
+            QMessageBox.warning(self, "变量错误", f"{e}\n请在“环境...”中定义该变量或选择其他环境")
+            return
+        send_url = rendered['url']
 
-        if method in ["POST", "PUT", "PATCH"] and body:
-            try:
-                # 尝试解析为JSON
-                data = json.loads(body)
-            except json.JSONDecodeError:
-                # 如果不是JSON，作为文本处理
-                data = body
+        url = self.normalize_url_input(url)
+        send_url = normalize_url(send_url)
+
+        try:
+            prepared = prepare_body(method, rendered['headers'], rendered['body'], body_file,
+                                    self.chunked_check.isChecked())
+        except RequestBodyError as e:
+            QMessageBox.warning(self, "请求体错误", str(e))
+            return
 
         # 停止之前的请求
         if self.current_request_thread and self.current_request_thread.isRunning():
@@ -961,22 +1861,46 @@ class HTTPClient(QMainWindow):
         self.status_label.setText("状态: 发送中...")
         self.time_label.setText("响应时间: -")
         self.size_label.setText("大小: -")
+        self.compression_label.setText("")
 
         # 切换到响应标签页
-        self.tab_widget.setCurrentIndex(2)
+        self.tab_widget.setCurrentWidget(self.response_widget)
 
         # 创建并启动请求线程
-        self.current_request_thread = RequestThread(method, url, headers, data, timeout)
+        self.request_trace_id += 1
+        async_begin('request', self.request_trace_id, 'gui', method=method, url=send_url)
+        self.current_request_thread = RequestThread(
+            method, send_url, prepared.headers, prepared.data, timeout, self.metrics_store,
+            compression=self.compression_combo.currentData()
+        )
         self.current_request_thread.finished.connect(self.on_request_finished)
         self.current_request_thread.error.connect(self.on_request_error)
         self.current_request_thread.cancelled.connect(self.on_request_cancelled)
+        self.current_request_thread.upload_progress.connect(self.on_upload_progress)
         self.current_request_thread.start()
 
         # 添加到历史记录
-        self.add_to_history(method, url, headers, body, timeout)
+        self.add_to_history(method, url, headers, body, timeout, body_file=body_file)
+
+    def on_upload_progress(self, sent, total, elapsed):
+        """显示上传进度和吞吐量"""
+        speed = self.format_size(int(sent / elapsed)) + "/s" if elapsed > 0 else "-"
+        if total is not None and sent >= total:
+            # 上传完成，等待响应
+            self.progress_bar.setRange(0, 0)
+            self.status_bar.showMessage(f"已上传 {self.format_size(sent)} ({speed})，等待响应...")
+        elif total:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(int(sent * 100 / total))
+            self.status_bar.showMessage(f"正在上传 {self.format_size(sent)} / {self.format_size(total)} ({speed})")
+        else:
+            self.status_bar.showMessage(f"正在上传 {self.format_size(sent)} ({speed})")
 
+    @traced('on_request_finished', 'gui')
     def on_request_finished(self, result):
         """请求完成处理"""
+        if result['response_time'] is not None:
+            async_end('request', self.request_trace_id, 'gui', status_code=result['status_code'])
         # 恢复UI状态
         self.send_button.setEnabled(True)
         self.send_button.setText("发送请求")
@@ -992,13 +1916,27 @@ class HTTPClient(QMainWindow):
         # 更新状态标签
         status_color = self.get_status_color(status_code)
         self.status_label.setText(f"状态: <span style='color: {status_color}; font-weight: bold;'>{status_code}</span>")
-        self.time_label.setText(f"响应时间: {response_time} ms")
+        if response_time is None:
+            self.time_label.setText("响应时间: - (离线响应)")
+        else:
+            self.time_label.setText(f"响应时间: {response_time} ms (首字节 {result['ttfb']} ms)")
 
         # 计算响应大小
         response_size = len(response_text.encode('utf-8'))
         size_text = self.format_size(response_size)
         self.size_label.setText(f"大小: {size_text}")
 
+        # 请求体压缩统计
+        compression = result.get('compression')
+        if compression:
+            ratio = compression['compressed_size'] / compression['original_size'] if compression['original_size'] else 1
+            self.compression_label.setText(
+                f"请求体 {compression['encoding']}: {self.format_size(compression['original_size'])} → "
+                f"{self.format_size(compression['compressed_size'])} ({ratio:.0%}, 压缩 {compression['compression_ms']} ms)"
+            )
+        else:
+            self.compression_label.setText("")
+
         # 显示响应内容
         self.response_edit.clear()
 
@@ -1020,10 +1958,12 @@ class HTTPClient(QMainWindow):
             self.response_edit.append(response_text)
 
         # 更新状态栏
-        self.status_bar.showMessage(f"请求完成 - {status_code} ({response_time} ms)", 5000)
+        if response_time is not None:
+            self.status_bar.showMessage(f"请求完成 - {status_code} ({response_time} ms)", 5000)
 
     def on_request_error(self, error_message):
         """请求错误处理"""
+        async_end('request', self.request_trace_id, 'gui', error=error_message)
         # 恢复UI状态
         self.send_button.setEnabled(True)
         self.send_button.setText("发送请求")
@@ -1073,8 +2013,97 @@ class HTTPClient(QMainWindow):
         else:
             return f"{size_bytes / (1024 * 1024):.1f} MB"
 
+    def normalize_url_input(self, url):
+        """地址栏中省略协议时补上 https:// 并更新地址栏；以 {{ 开头的模板在渲染后再补全"""
+        if url.startswith('{{'):
+            return url
+        normalized = normalize_url(url)
+        if normalized != url:
+            self.url_input.setText(normalized)
+        return normalized
+
+    def run_data_file(self):
+        """按数据文件（CSV / JSONL）的每一行发送一次当前请求，列名作为变量；运行中再次点击则停止"""
+        if self.data_run_thread and self.data_run_thread.isRunning():
+            self.data_run_thread.stop()
+            self.status_bar.showMessage("正在停止数据驱动执行，等待在途的请求完成...")
+            return
+
+        url = self.url_input.text().strip()
+        if not url:
+            QMessageBox.warning(self, "输入错误", "请输入URL")
+            return
+        url = self.normalize_url_input(url)
+
+        data_path, _ = QFileDialog.getOpenFileName(
+            self, "选择数据文件", "", "数据文件 (*.csv *.jsonl *.ndjson);;所有文件 (*)"
+        )
+        if not data_path:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "保存结果", os.path.splitext(data_path)[0] + ".results.jsonl",
+            "JSON Lines (*.jsonl);;CSV文件 (*.csv)"
+        )
+        if not output_path:
+            return
+        concurrency, ok = QInputDialog.getInt(self, "数据驱动执行", "同时发送的请求数:", 8, 1, 64)
+        if not ok:
+            return
+
+        from request_runner import RunnerRequest
+
+        method = self.method_combo.currentText()
+        body_file = self.body_file_path if method in METHODS_WITH_BODY else None
+        request = RunnerRequest(
+            method, url, self.get_headers(), '' if body_file else self.body_edit.toPlainText(),
+            body_file, self.timeout_spin.value(), os.path.basename(data_path)
+        )
+
+        self.data_run_thread = DataRunThread(
+            request, data_path, output_path, self.environment_store.active_variables(),
+            concurrency, self.compression_combo.currentData()
+        )
+        self.data_run_thread.progress.connect(
+            lambda done, failed: self.status_bar.showMessage(f"数据驱动执行中... 已完成 {done} 行，失败 {failed} 行")
+        )
+        self.data_run_thread.finished.connect(
+            lambda done, failed, elapsed: self.on_data_run_finished(done, failed, elapsed, output_path)
+        )
+        self.data_run_thread.error.connect(self.on_data_run_error)
+        self.data_run_action.setText('停止数据驱动执行')
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.status_bar.showMessage("数据驱动执行中...")
+        self.data_run_thread.start()
+
+    def on_data_run_finished(self, done, failed, elapsed, output_path):
+        """数据驱动执行完成"""
+        self.data_run_action.setText('数据驱动执行...')
+        self.progress_bar.setVisible(False)
+        rate = done / elapsed if elapsed > 0 else 0
+        self.status_bar.showMessage(
+            f"数据驱动执行完成: {done} 行，失败 {failed} 行，用时 {elapsed:.1f} 秒 ({rate:.1f} 行/秒)，"
+            f"结果: {output_path}"
+        )
+
+    def on_data_run_error(self, error_message):
+        """数据驱动执行出错"""
+        self.data_run_action.setText('数据驱动执行...')
+        self.progress_bar.setVisible(False)
+        self.status_bar.showMessage("数据驱动执行失败", 3000)
+        QMessageBox.critical(self, "执行失败", f"数据驱动执行失败: {error_message}")
+
+    def show_latency_stats(self):
+        """显示接口耗时统计，默认选中当前URL对应的接口"""
+        url = self.url_input.text().strip()
+        current_key = endpoint_key(self.method_combo.currentText(), url) if url else None
+        from latency_dialog import LatencyDialog
+        dialog = LatencyDialog(self.metrics_store, current_key, self)
+        dialog.exec()
+
     def import_raw_request(self):
         """导入原始HTTP请求"""
+        from raw_request_dialog import RawRequestDialog
         dialog = RawRequestDialog(self)
 
         if dialog.exec() == QDialog.Accepted:
@@ -1091,6 +2120,7 @@ class HTTPClient(QMainWindow):
                 self.load_headers(parsed_data['headers'])
 
                 # 填充请求体
+                self.set_body_file(None)
                 if parsed_data['body']:
                     self.body_edit.setPlainText(parsed_data['body'])
                 else:
@@ -1102,7 +2132,7 @@ class HTTPClient(QMainWindow):
                 )
 
                 # 切换到请求头标签页查看导入的数据
-                self.tab_widget.setCurrentIndex(0)
+                self.tab_widget.setCurrentWidget(self.headers_widget)
 
     def stop_request(self):
         """停止当前请求"""
@@ -1129,6 +2159,7 @@ class HTTPClient(QMainWindow):
 
     def on_request_cancelled(self):
         """请求被取消处理"""
+        async_end('request', self.request_trace_id, 'gui', cancelled=True)
         # 恢复UI状态
         self.send_button.setEnabled(True)
         self.send_button.setText("发送请求")
@@ -0,0 +1,208 @@
+"""
+接口耗时时序存储
+每次请求完成后追加一条定长二进制记录，按接口统计耗时趋势和每日分位数
+"""
+import os
+import re
+import struct
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+
+METRICS_DIR_NAME = '.http_client_metrics'
+
+# 记录格式: 接口ID, 时间戳, 状态码, 首字节耗时(ms), 总耗时(ms), 响应字节数
+RECORD = struct.Struct('<IdHffI')
+
+# 每次读取的记录数
+READ_BATCH = 8192
+
+_ID_SEGMENT_RE = re.compile(r'^(?:\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$')
+
+
+class Sample(NamedTuple):
+    """单次请求的耗时记录"""
+    timestamp: float
+    status: int
+    ttfb_ms: float
+    total_ms: float
+    size: int
+
+
+def get_metrics_dir() -> str:
+    """获取默认的时序数据目录"""
+    return os.path.join(os.path.expanduser('~'), METRICS_DIR_NAME)
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """
+    生成接口标识：方法 + 主机 + 路径，路径中的数字/UUID段归并为 {id}
+
+    Args:
+        method: 请求方法
+        url: 请求URL
+
+    Returns:
+        例如 "GET https://api.example.com/users/{id}"
+    """
+    parsed = urllib.parse.urlsplit(url)
+    segments = [
+        '{id}' if _ID_SEGMENT_RE.match(segment) else segment
+        for segment in parsed.path.split('/')
+    ]
+    path = '/'.join(segments) or '/'
+    return f"{method.upper()} {parsed.scheme}://{parsed.netloc}{path}"
+
+
+class MetricsStore:
+    """
+    追加写入的耗时时序存储
+
+    samples.bin 保存定长记录，endpoints.txt 每行一个接口标识（行号即接口ID），
+    两个文件都只追加不修改。
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or get_metrics_dir()
+        self.samples_path = os.path.join(self.directory, 'samples.bin')
+        self.endpoints_path = os.path.join(self.directory, 'endpoints.txt')
+        self._lock = threading.Lock()
+        self._endpoint_ids = None
+
+    def _load_endpoints(self) -> Dict[str, int]:
+        if self._endpoint_ids is None:
+            self._endpoint_ids = {}
+            if os.path.exists(self.endpoints_path):
+                with open(self.endpoints_path, 'r', encoding='utf-8') as f:
+                    for index, line in enumerate(f):
+                        self._endpoint_ids[line.rstrip('\n')] = index
+        return self._endpoint_ids
+
+    def endpoints(self) -> List[str]:
+        """列出所有已记录的接口"""
+        with self._lock:
+            return list(self._load_endpoints())
+
+    def record(self, key: str, status: int, ttfb_ms: float, total_ms: float, size: int,
+               timestamp: Optional[float] = None):
+        """
+        追加一条记录（线程安全，可在请求线程中调用）
+
+        Args:
+            key: 接口标识，见 endpoint_key()
+            status: HTTP状态码
+            ttfb_ms: 收到响应头的耗时
+            total_ms: 包含下载响应体的总耗时
+            size: 响应体字节数
+            timestamp: 完成时间，默认为当前时间
+        """
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            ids = self._load_endpoints()
+            endpoint_id = ids.get(key)
+            if endpoint_id is None:
+                endpoint_id = len(ids)
+                with open(self.endpoints_path, 'a', encoding='utf-8') as f:
+                    f.write(key.replace('\n', ' ') + '\n')
+                ids[key] = endpoint_id
+
+            record = RECORD.pack(
+                endpoint_id,
+                time.time() if timestamp is None else timestamp,
+                max(0, min(status, 0xFFFF)),
+                ttfb_ms,
+                total_ms,
+                max(0, min(size, 0xFFFFFFFF))
+            )
+            with open(self.samples_path, 'ab') as f:
+                f.write(record)
+
+    def samples(self, key: str, since: Optional[float] = None) -> List[Sample]:
+        """
+        读取某个接口的全部记录
+
+        Args:
+            key: 接口标识
+            since: 只返回该时间戳之后的记录
+
+        Returns:
+            按时间顺序排列的记录列表
+        """
+        with self._lock:
+            endpoint_id = self._load_endpoints().get(key)
+        if endpoint_id is None or not os.path.exists(self.samples_path):
+            return []
+
+        result = []
+        with open(self.samples_path, 'rb') as f:
+            while True:
+                data = f.read(RECORD.size * READ_BATCH)
+                # 忽略写入中断导致的不完整尾部记录
+                usable = len(data) - len(data) % RECORD.size
+                if not usable:
+                    break
+                for record in RECORD.iter_unpack(memoryview(data)[:usable]):
+                    if record[0] == endpoint_id and (since is None or record[1] >= since):
+                        result.append(Sample(*record[1:]))
+        return result
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """计算已排序数据的分位数（线性插值）"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def daily_percentiles(samples: Iterable[Sample], percentiles: Sequence[float] = (50, 90, 99)) -> List[Dict]:
+    """
+    按天统计总耗时分位数
+
+    Returns:
+        [{'date': 'YYYY-MM-DD', 'count': int, 'p50': float, ...}]，按日期排序
+    """
+    by_day: Dict[str, List[float]] = {}
+    for sample in samples:
+        day = datetime.fromtimestamp(sample.timestamp).strftime('%Y-%m-%d')
+        by_day.setdefault(day, []).append(sample.total_ms)
+
+    rows = []
+    for day in sorted(by_day):
+        values = sorted(by_day[day])
+        row = {'date': day, 'count': len(values)}
+        for p in percentiles:
+            row[f'p{p:g}'] = round(percentile(values, p), 2)
+        rows.append(row)
+    return rows
+
+
+def downsample(samples: Sequence[Sample], max_points: int = 500) -> List[Tuple[float, float, float, float]]:
+    """
+    把记录降采样为固定数量的时间桶，用于绘图
+
+    Returns:
+        [(桶起始时间, 最小耗时, 平均耗时, 最大耗时)]，保留尖峰
+    """
+    if not samples:
+        return []
+    if len(samples) <= max_points:
+        return [(s.timestamp, s.total_ms, s.total_ms, s.total_ms) for s in samples]
+
+    start = samples[0].timestamp
+    span = (samples[-1].timestamp - start) or 1.0
+    buckets: Dict[int, List[float]] = {}
+    for sample in samples:
+        index = min(int((sample.timestamp - start) / span * max_points), max_points - 1)
+        buckets.setdefault(index, []).append(sample.total_ms)
+
+    return [
+        (start + index * span / max_points, min(values), sum(values) / len(values), max(values))
+        for index, values in sorted(buckets.items())
+    ]
@@ -0,0 +1,345 @@
+"""
+multipart/form-data 编码与解析
+编码器按块读取文件，发送前即可算出 Content-Length，不把文件读入内存；
+解析器按 boundary 切分请求体，各部分内容以 memoryview 返回，不复制数据
+"""
+import os
+import re
+import secrets
+import mimetypes
+from typing import Iterator, List, Optional, Union
+
+from headers import Headers
+
+
+# 读取文件部分时每块的字节数
+CHUNK_SIZE = 64 * 1024
+
+# curl -F 的附加参数：name=@file;type=text/plain;filename=a.txt
+_FORM_OPTION_RE = re.compile(r';[ \t]*(type|filename|headers|encoder)=')
+# 双引号括起的值按字面使用：name="@不是文件;也不是参数"
+_QUOTED_VALUE_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+# Content-Type / Content-Disposition 中的参数
+_PARAM_RE = re.compile(r';[ \t]*([\w.*-]+)[ \t]*=[ \t]*("(?:[^"\\]|\\.)*"|[^;]*)')
+# 各部分的头部：若干行后跟一个空行
+_PART_HEAD_RE = re.compile(rb'((?:[^\r\n]+\r?\n)*?)\r?\n')
+
+
+class MultipartError(ValueError):
+    """multipart 数据格式错误"""
+
+
+class FormField:
+    """
+    表单中的一个字段
+
+    普通字段只有 value；文件字段的内容在发送时才从 path 读取。
+    filename 为 None 时不带 filename 参数（curl 的 name=<file 写法）。
+    """
+
+    __slots__ = ('name', 'value', 'path', 'filename', 'content_type')
+
+    def __init__(self, name: str, value: Union[str, bytes] = '', path: Optional[str] = None,
+                 filename: Optional[str] = None, content_type: Optional[str] = None):
+        self.name = name
+        self.value = value
+        self.path = path
+        self.filename = filename
+        self.content_type = content_type
+
+    @property
+    def is_file(self) -> bool:
+        return self.path is not None
+
+    def size(self) -> int:
+        """内容的字节数，文件字段读取文件大小"""
+        if self.path is not None:
+            return os.path.getsize(self.path)
+        value = self.value
+        return len(value.encode('utf-8') if isinstance(value, str) else value)
+
+    def header_bytes(self, boundary: str) -> bytes:
+        """分隔行和该部分的头部"""
+        disposition = f'form-data; name="{_quote(self.name)}"'
+        if self.filename is not None:
+            disposition += f'; filename="{_quote(self.filename)}"'
+        lines = [f'--{boundary}', f'Content-Disposition: {disposition}']
+        if self.content_type:
+            lines.append(f'Content-Type: {self.content_type}')
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8')
+
+    def iter_content(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """逐块产出内容"""
+        if self.path is None:
+            value = self.value
+            yield value.encode('utf-8') if isinstance(value, str) else value
+            return
+        with open(self.path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def to_spec(self) -> str:
+        """转换回 curl -F 的写法"""
+        if self.path is None:
+            value = self.value
+            if isinstance(value, bytes):
+                value = value.decode('utf-8', errors='replace')
+            if value[:1] in ('"', '@', '<') or _FORM_OPTION_RE.search(value):
+                value = '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+            spec = f'{self.name}={value}'
+        elif self.filename is None:
+            spec = f'{self.name}=<{self.path}'
+        else:
+            spec = f'{self.name}=@{self.path}'
+            if self.filename != os.path.basename(self.path):
+                spec += f';filename={self.filename}'
+        if self.content_type and not (self.path and self.content_type == _guess_type(self.path)):
+            spec += f';type={self.content_type}'
+        return spec
+
+    def __repr__(self) -> str:
+        return f"FormField({self.to_spec()!r})"
+
+
+def _quote(value: str) -> str:
+    """按 HTML 表单的规则转义字段名和文件名中的引号和换行"""
+    return value.replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+
+def _guess_type(path: str) -> str:
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def parse_form_spec(spec: str, base_dir: Optional[str] = None, literal: bool = False) -> FormField:
+    """
+    解析 curl -F 写法的字段
+
+    支持 name=value、name=@file（上传文件）、name=<file（文件内容作为字段值），
+    以及 ;type=...、;filename=... 参数。
+
+    Args:
+        spec: 字段描述，如 "avatar=@photo.jpg;type=image/jpeg"
+        base_dir: 解析相对路径时使用的目录，默认为当前目录
+        literal: 为 True 时值按原样使用（curl 的 --form-string）
+
+    Returns:
+        FormField 对象；文件路径转换为绝对路径
+    """
+    name, has_value, content = spec.partition('=')
+    if not has_value or not name:
+        raise MultipartError(f'无效的表单字段: {spec}')
+    if literal:
+        return FormField(name, content)
+
+    options = {}
+    quoted = _QUOTED_VALUE_RE.match(content)
+    match = _FORM_OPTION_RE.search(content, quoted.end() if quoted else 0)
+    if match:
+        content, option_text = content[:match.start()], content[match.start():]
+        for key, value in _PARAM_RE.findall(option_text):
+            options[key.lower()] = _unquote(value.strip())
+
+    if quoted and quoted.end() == len(content):
+        return FormField(name, _unquote(content), filename=options.get('filename'), content_type=options.get('type'))
+
+    if content[:1] in ('@', '<'):
+        path = os.path.join(base_dir or os.getcwd(), os.path.expanduser(content[1:]))
+        path = os.path.abspath(path)
+        if content[0] == '@':
+            return FormField(name, path=path, filename=options.get('filename', os.path.basename(path)),
+                             content_type=options.get('type') or _guess_type(path))
+        return FormField(name, path=path, filename=options.get('filename'), content_type=options.get('type'))
+
+    return FormField(name, content, filename=options.get('filename'), content_type=options.get('type'))
+
+
+def parse_form_specs(text: str, base_dir: Optional[str] = None) -> List[FormField]:
+    """
+    解析请求体编辑器中的表单：每行一个 curl -F 写法的字段，忽略空行
+
+    Args:
+        text: 表单文本
+        base_dir: 解析相对路径时使用的目录
+
+    Returns:
+        FormField 列表
+    """
+    return [parse_form_spec(line, base_dir) for line in text.splitlines() if line.strip()]
+
+
+class MultipartEncoder:
+    """
+    流式 multipart/form-data 编码器
+
+    创建时只计算各部分头部和文件大小，len() 即为 Content-Length；
+    迭代时逐块读取文件。可以直接作为 requests 的 data 参数，
+    requests 会根据 len() 设置 Content-Length 而不是使用分块传输。
+    """
+
+    def __init__(self, fields: List[FormField], boundary: Optional[str] = None, chunk_size: int = CHUNK_SIZE):
+        self.fields = list(fields)
+        self.boundary = boundary or '----HttpToolBoundary' + secrets.token_hex(12)
+        self.chunk_size = chunk_size
+        self._parts = [(field, field.header_bytes(self.boundary), field.size()) for field in self.fields]
+        self._closing = f'--{self.boundary}--\r\n'.encode('ascii')
+        self.content_length = sum(len(head) + size + 2 for _, head, size in self._parts) + len(self._closing)
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self) -> int:
+        return self.content_length
+
+    def __iter__(self) -> Iterator[bytes]:
+        for field, head, size in self._parts:
+            yield head
+            remaining = size
+            for chunk in field.iter_content(self.chunk_size):
+                if len(chunk) > remaining:
+                    chunk = chunk[:remaining]
+                remaining -= len(chunk)
+                if chunk:
+                    yield chunk
+                if not remaining:
+                    break
+            if remaining:
+                # 文件在计算长度之后被截短，继续发送会与 Content-Length 不符
+                raise MultipartError(f'文件大小发生变化: {field.path}')
+            yield b'\r\n'
+        yield self._closing
+
+    def to_bytes(self) -> bytes:
+        """一次性编码为 bytes（用于预览和测试）"""
+        return b''.join(self)
+
+
+class MultipartPart:
+    """解析出的一个部分，content 是原始数据的 memoryview 切片"""
+
+    __slots__ = ('headers', 'content')
+
+    def __init__(self, headers: Headers, content: memoryview):
+        self.headers = headers
+        self.content = content
+
+    def _disposition(self, key: str) -> Optional[str]:
+        return get_param(self.headers.get('Content-Disposition', ''), key)
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._disposition('name')
+
+    @property
+    def filename(self) -> Optional[str]:
+        return self._disposition('filename')
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get('Content-Type', 'text/plain')
+
+    @property
+    def text(self) -> str:
+        charset = get_param(self.content_type, 'charset') or 'utf-8'
+        return str(self.content, charset, errors='replace')
+
+    def __repr__(self) -> str:
+        return f"MultipartPart(name={self.name!r}, filename={self.filename!r}, size={len(self.content)})"
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return value
+
+
+def get_param(header_value: str, key: str) -> Optional[str]:
+    """
+    读取头部值中的参数，如 Content-Type 的 boundary、Content-Disposition 的 filename
+
+    Args:
+        header_value: 头部值
+        key: 参数名（不区分大小写）
+
+    Returns:
+        参数值，不存在时返回 None
+    """
+    key = key.lower()
+    for name, value in _PARAM_RE.findall(header_value or ''):
+        if name.lower() == key:
+            return _unquote(value.strip())
+    return None
+
+
+def get_boundary(content_type: Optional[str]) -> Optional[str]:
+    """从 multipart Content-Type 中取出 boundary，不是 multipart 时返回 None"""
+    if not content_type or not content_type.strip().lower().startswith('multipart/'):
+        return None
+    return get_param(content_type, 'boundary')
+
+
+def iter_multipart(body: Union[bytes, bytearray, memoryview], boundary: str) -> Iterator[MultipartPart]:
+    """
+    按 boundary 切分 multipart 请求体
+
+    正则直接在原始缓冲区上匹配，各部分内容是 memoryview 切片，不复制数据。
+    同时接受 CRLF 和 LF 换行，忽略首个分隔行之前的前导内容。
+
+    Args:
+        body: 完整的请求体
+        boundary: Content-Type 中的 boundary
+
+    Yields:
+        MultipartPart 对象
+
+    Raises:
+        MultipartError: 找不到分隔行或缺少结束分隔行
+    """
+    view = memoryview(body)
+    if view.ndim != 1 or view.itemsize != 1:
+        view = view.cast('B')
+    delimiter = re.compile(
+        rb'(?:\A|\r?\n)--' + re.escape(boundary.encode('latin-1')) + rb'(--)?[ \t]*(?:\r?\n|\Z)'
+    )
+
+    match = delimiter.search(view)
+    if not match:
+        raise MultipartError('请求体中找不到 multipart 分隔行')
+
+    while not match.group(1):
+        start = match.end()
+        match = delimiter.search(view, start)
+        if not match:
+            raise MultipartError('multipart 请求体缺少结束分隔行')
+
+        head = _PART_HEAD_RE.match(view, start, match.start())
+        headers = Headers()
+        if head:
+            for line in bytes(head.group(1)).decode('utf-8', errors='replace').splitlines():
+                name, _, value = line.partition(':')
+                headers.add(name.strip(), value.strip())
+            start = head.end()
+        yield MultipartPart(headers, view[start:match.start()])
+
+
+def format_multipart(body: Union[bytes, bytearray, memoryview], boundary: str) -> dict:
+    """
+    把 multipart 请求体整理为 {字段名: 值}，文件字段只显示文件名和大小
+
+    Args:
+        body: 请求体
+        boundary: Content-Type 中的 boundary
+
+    Returns:
+        表单数据字典
+    """
+    result = {}
+    for part in iter_multipart(body, boundary):
+        if part.filename is not None:
+            result[part.name] = f'<文件: {part.filename}, {len(part.content)} 字节>'
+        else:
+            result[part.name] = part.text
+    return result
@@ -0,0 +1,161 @@
+"""
+URL查询参数模型
+把URL的查询字符串按 & 切分为片段，保留顺序、重复参数和原始编码；
+URL被编辑时只重新解析发生变化的片段，并返回需要更新的行范围，供参数表格增量刷新
+"""
+import bisect
+import urllib.parse
+from typing import List, Optional, Tuple
+
+
+# 编辑参数时不转义的字符（与浏览器地址栏的习惯一致）
+_SAFE_CHARS = "/:@!$'()*,;"
+
+
+def split_url(url: str) -> Tuple[str, str, str]:
+    """
+    拆分为 (查询字符串之前的部分, 查询字符串, 片段)
+
+    前两部分不含 ? 和 #；没有 ? 时查询字符串为 None 以区分 "http://a/?" 和 "http://a/"
+    """
+    base, has_fragment, fragment = url.partition('#')
+    base, has_query, query = base.partition('?')
+    return base, (query if has_query else None), ('#' + fragment if has_fragment else '')
+
+
+def decode_segment(segment: str) -> Tuple[str, str]:
+    """解码一个 key=value 片段"""
+    key, _, value = segment.partition('=')
+    return urllib.parse.unquote_plus(key), urllib.parse.unquote_plus(value)
+
+
+def encode_segment(key: str, value: str) -> str:
+    """编码一个参数；值为空时保留 key=，与表格中的显示一致"""
+    return f"{urllib.parse.quote(key, safe=_SAFE_CHARS)}={urllib.parse.quote(value, safe=_SAFE_CHARS)}"
+
+
+def parse_query_pairs(query: str) -> List[Tuple[str, str]]:
+    """按顺序解析查询字符串，保留重复参数和空值"""
+    return urllib.parse.parse_qsl(query, keep_blank_values=True)
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """两个字符串公共前缀的长度（二分比较切片，避免逐字符的 Python 循环）"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """公共后缀的长度，不超过 limit"""
+    low, high = 0, min(limit, len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:] == b[len(b) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class QueryParamsModel:
+    """
+    URL与参数表格之间的同步模型
+
+    set_url() 在URL变化时调用，返回 (起始行, 删除行数, 新的参数列表)，
+    表格只需替换这一段；set_param()/insert_param()/remove_param() 在表格被编辑时调用，
+    只重新编码被编辑的片段并返回新的URL，其余参数保持原始写法。
+    """
+
+    def __init__(self, url: str = ''):
+        self.base = ''
+        self.fragment = ''
+        self._query: Optional[str] = None
+        self._segments: List[str] = []           # 原始片段
+        self._pairs: List[Tuple[str, str]] = []  # 解码后的 (key, value)
+        self._starts: List[int] = []             # 各片段在查询字符串中的起始位置
+        self.set_url(url)
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        """按顺序返回全部参数，包括重复参数"""
+        return list(self._pairs)
+
+    def url(self) -> str:
+        if self._query is None:
+            return self.base + self.fragment
+        return f"{self.base}?{self._query}{self.fragment}"
+
+    def set_url(self, url: str) -> Optional[Tuple[int, int, List[Tuple[str, str]]]]:
+        """
+        同步新的URL
+
+        Args:
+            url: 编辑后的完整URL
+
+        Returns:
+            (起始行, 删除行数, 插入的参数)；参数没有变化时返回 None
+        """
+        self.base, query, self.fragment = split_url(url)
+        old_query = self._query
+        self._query = query
+        if query == old_query:
+            return None
+
+        if not old_query or not query:
+            # 查询字符串从无到有或被清空：整体替换
+            removed = len(self._segments)
+            self._replace(0, removed, query.split('&') if query else [])
+            return 0, removed, self.pairs()
+
+        prefix = _common_prefix(old_query, query)
+        suffix = _common_suffix(old_query, query, min(len(old_query), len(query)) - prefix)
+        old_end = len(old_query) - suffix
+
+        # 变化范围涉及的片段：包含 prefix 的片段到包含 old_end 的片段
+        first = bisect.bisect_right(self._starts, prefix) - 1
+        last = bisect.bisect_right(self._starts, old_end) - 1
+        start = self._starts[first]
+        end = self._starts[last] + len(self._segments[last]) + len(query) - len(old_query)
+
+        segments = query[start:end].split('&')
+        self._replace(first, last - first + 1, segments)
+        return first, last - first + 1, self._pairs[first:first + len(segments)]
+
+    def set_param(self, index: int, key: str, value: str) -> str:
+        """修改一个参数，返回新的URL"""
+        self._replace(index, 1, [encode_segment(key, value)])
+        self._rebuild_query()
+        return self.url()
+
+    def insert_param(self, index: int, key: str = '', value: str = '') -> str:
+        """在 index 处插入参数，返回新的URL"""
+        self._replace(index, 0, [encode_segment(key, value)])
+        self._rebuild_query()
+        return self.url()
+
+    def remove_param(self, index: int) -> str:
+        """删除一个参数，返回新的URL"""
+        self._replace(index, 1, [])
+        self._rebuild_query()
+        return self.url()
+
+    def _replace(self, index: int, count: int, segments: List[str]):
+        """替换片段并更新其后片段的起始位置"""
+        self._segments[index:index + count] = segments
+        self._pairs[index:index + count] = [decode_segment(segment) for segment in segments]
+        del self._starts[index:]
+        position = self._starts[-1] + len(self._segments[index - 1]) + 1 if index else 0
+        for segment in self._segments[index:]:
+            self._starts.append(position)
+            position += len(segment) + 1
+
+    def _rebuild_query(self):
+        self._query = '&'.join(self._segments) if self._segments else None
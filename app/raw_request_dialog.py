@@ -0,0 +1,221 @@
+"""
+原始HTTP请求导入对话框
+在首次打开时才导入，解析器随之加载，不影响主窗口的启动时间
+"""
+import json
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, QPlainTextEdit, QPushButton, QMessageBox
+)
+from PySide6.QtCore import QThread, Signal as QSignal, QTimer
+from PySide6.QtGui import QFont
+
+from http_parser import HTTPRequestParser, IncrementalRequestParser
+
+
+class RawParseThread(QThread):
+    """原始请求后台解析线程"""
+    finished = QSignal(object, int)
+
+    def __init__(self, parser, text, generation):
+        super().__init__()
+        self.parser = parser
+        self.text = text
+        self.generation = generation
+
+    def run(self):
+        if self.text.lstrip().lower().startswith('curl'):
+            result = HTTPRequestParser.parse_curl_command(self.text)
+        else:
+            result = self.parser.parse(self.text)
+        self.finished.emit(result, self.generation)
+
+
+class RawRequestDialog(QDialog):
+    """原始HTTP请求导入对话框"""
+
+    # 输入停止多久后开始解析（毫秒）
+    PARSE_DELAY = 300
+    # 预览中显示的请求体字符数
+    BODY_PREVIEW_CHARS = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("导入原始HTTP请求")
+        self.setMinimumSize(800, 600)
+        self.parsed_data = None
+        self.parser = IncrementalRequestParser()
+        self.parse_thread = None
+        self.generation = 0
+        self.parsed_generation = -1
+        self.setup_ui()
+
+        # 输入防抖：停止输入一段时间后在后台解析
+        self.parse_timer = QTimer(self)
+        self.parse_timer.setSingleShot(True)
+        self.parse_timer.setInterval(self.PARSE_DELAY)
+        self.parse_timer.timeout.connect(self.start_background_parse)
+        self.request_input.textChanged.connect(self.on_text_changed)
+
+    def setup_ui(self):
+        """设置UI"""
+        layout = QVBoxLayout(self)
+
+        # 说明文本
+        hint_label = QLabel(
+            "粘贴原始HTTP请求文本（从浏览器开发者工具、Postman等复制），也可以直接粘贴cURL命令\n"
+            "格式示例:\n"
+            "GET /api/data HTTP/1.1\n"
+            "Host: example.com\n"
+            "Content-Type: application/json\n"
+            "\n"
+            "{\"key\": \"value\"}"
+        )
+        layout.addWidget(hint_label)
+
+        # 输入区域
+        input_label = QLabel("原始HTTP请求:")
+        layout.addWidget(input_label)
+
+        # QPlainTextEdit 处理大段文本比 QTextEdit 快得多
+        self.request_input = QPlainTextEdit()
+        self.request_input.setPlaceholderText(
+            "GET /admin/inspection.Report/getInspectionData HTTP/1.1\n"
+            "Accept: application/json, text/plain, */*\n"
+            "Host: localhost:8000\n"
+            "User-Agent: Mozilla/5.0...\n"
+            "..."
+        )
+        self.request_input.setFont(QFont("Consolas", 10))
+        layout.addWidget(self.request_input)
+
+        # 按钮区域
+        button_layout = QHBoxLayout()
+
+        self.parse_status_label = QLabel("")
+        button_layout.addWidget(self.parse_status_label)
+
+        self.parse_btn = QPushButton("解析")
+        self.parse_btn.clicked.connect(self.parse_request)
+
+        self.import_btn = QPushButton("导入")
+        self.import_btn.clicked.connect(self.accept)
+        self.import_btn.setEnabled(False)
+
+        cancel_btn = QPushButton("取消")
+        cancel_btn.clicked.connect(self.reject)
+
+        button_layout.addStretch()
+        button_layout.addWidget(self.parse_btn)
+        button_layout.addWidget(self.import_btn)
+        button_layout.addWidget(cancel_btn)
+
+        layout.addLayout(button_layout)
+
+        # 预览区域
+        preview_label = QLabel("解析预览:")
+        layout.addWidget(preview_label)
+
+        self.preview_text = QTextEdit()
+        self.preview_text.setReadOnly(True)
+        self.preview_text.setMaximumHeight(200)
+        layout.addWidget(self.preview_text)
+
+    def on_text_changed(self):
+        """文本变化后重新计时，并让旧的解析结果失效"""
+        self.generation += 1
+        self.import_btn.setEnabled(False)
+        self.parse_timer.start()
+
+    def parse_request(self):
+        """立即解析请求"""
+        if not self.request_input.toPlainText().strip():
+            QMessageBox.warning(self, "输入错误", "请输入HTTP请求文本")
+            return
+
+        self.parse_timer.stop()
+        self.start_background_parse()
+
+    def start_background_parse(self):
+        """在后台线程中解析当前文本；上一次解析未结束时等待其完成后再解析"""
+        if self.parse_thread and self.parse_thread.isRunning():
+            return
+
+        if self.parsed_generation == self.generation:
+            return
+
+        text = self.request_input.toPlainText()
+        if not text.strip():
+            self.parsed_data = None
+            self.parsed_generation = self.generation
+            self.preview_text.clear()
+            self.parse_status_label.setText("")
+            return
+
+        self.parse_status_label.setText("解析中...")
+        self.parse_thread = RawParseThread(self.parser, text, self.generation)
+        self.parse_thread.finished.connect(self.on_parse_finished)
+        self.parse_thread.start()
+
+    def on_parse_finished(self, result, generation):
+        """后台解析完成"""
+        if generation != self.generation:
+            # 解析期间文本又发生了变化，解析最新的文本
+            self.start_background_parse()
+            return
+
+        self.parsed_generation = generation
+        self.show_preview(result)
+
+    def show_preview(self, result):
+        """显示解析预览，请求体只显示摘要"""
+        if not result['success']:
+            self.parsed_data = None
+            self.import_btn.setEnabled(False)
+            self.parse_status_label.setText("解析失败")
+            self.preview_text.setPlainText(f"解析失败: {result['error']}")
+            return
+
+        # 保存解析结果
+        self.parsed_data = result
+
+        preview = []
+        preview.append(f"方法: {result['method']}")
+        preview.append(f"URL: {result['url']}")
+        preview.append(f"路径: {result['path']}")
+        preview.append(f"协议: {result['protocol']}")
+        preview.append(f"\n请求头数量: {len(result['headers'])}")
+
+        if result['headers']:
+            preview.append("\n请求头:")
+            for key, value in list(result['headers'].items())[:5]:
+                preview.append(f"  {key}: {value}")
+            if len(result['headers']) > 5:
+                preview.append(f"  ... 还有 {len(result['headers']) - 5} 个请求头")
+
+        body = result['body']
+        if body:
+            preview.append(f"\n请求体长度: {len(body)} 字符, {body.count(chr(10)) + 1} 行")
+            body_preview = body[:self.BODY_PREVIEW_CHARS]
+            if len(body) > self.BODY_PREVIEW_CHARS:
+                body_preview += f"... (省略 {len(body) - self.BODY_PREVIEW_CHARS} 字符)"
+            preview.append(f"请求体预览:\n{body_preview}")
+
+        self.preview_text.setPlainText("\n".join(preview))
+        self.parse_status_label.setText("解析成功")
+        self.import_btn.setEnabled(True)
+
+    def accept(self):
+        """导入前确保解析结果对应当前文本"""
+        if self.parsed_generation != self.generation:
+            if self.parse_thread and self.parse_thread.isRunning():
+                self.parse_thread.wait()
+            self.parse_timer.stop()
+            self.parsed_generation = self.generation
+            self.show_preview(self.parser.parse(self.request_input.toPlainText()))
+            if not self.parsed_data:
+                return
+        super().accept()
+
+    def get_parsed_data(self):
+        """获取解析后的数据"""
+        return self.parsed_data
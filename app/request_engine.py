@@ -0,0 +1,467 @@
+"""
+请求引擎（不依赖 Qt）
+准备要发送的请求体：按 Content-Type 把编辑器文本编码为字节（JSON 原样发送，不再解析和重新序列化），
+文件请求体按块读取，不载入内存，并在发送过程中报告上传进度；可选 gzip/deflate/zstd 压缩请求体；
+发送请求（requests 在首次发送时才导入，界面和命令行启动时不加载）
+"""
+import os
+import json
+import time
+import zlib
+import mimetypes
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from headers import Headers
+from multipart_form import MultipartEncoder, MultipartError, get_boundary, get_param, parse_form_specs
+from tracing import traced
+
+
+# 从文件发送请求体时每块的字节数
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# 上传进度回调的最小间隔（秒）
+PROGRESS_INTERVAL = 0.1
+
+# 会发送请求体的方法
+METHODS_WITH_BODY = ('POST', 'PUT', 'PATCH')
+
+# 支持的请求体压缩方式（Content-Encoding 的值）
+COMPRESSION_METHODS = ('gzip', 'deflate', 'zstd')
+
+# zlib 压缩级别：在速度和压缩率之间折中
+COMPRESSION_LEVEL = 6
+
+# progress(已发送字节数, 总字节数或 None, 已用秒数)
+ProgressCallback = Callable[[int, Optional[int], float], None]
+
+
+def iter_file_chunks(path: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """逐块读取文件"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def guess_content_type(path: str) -> str:
+    """按扩展名推断文件请求体的 Content-Type"""
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+class StreamBody:
+    """
+    流式请求体（分块传输）
+
+    requests 遇到没有长度的可迭代对象时使用 Transfer-Encoding: chunked。
+    迭代时统计已发送的字节数，按 PROGRESS_INTERVAL 限频调用 progress。
+    """
+
+    size: Optional[int] = None
+
+    def __init__(self, chunks: Iterable[bytes], progress: Optional[ProgressCallback] = None):
+        self.chunks = chunks
+        self.progress = progress
+        self.sent = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        start = last_report = time.perf_counter()
+        for chunk in self.chunks:
+            yield chunk
+            self.sent += len(chunk)
+            now = time.perf_counter()
+            if self.progress and now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                self.progress(self.sent, self.size, now - start)
+        if self.progress:
+            self.progress(self.sent, self.size, time.perf_counter() - start)
+
+
+class SizedStreamBody(StreamBody):
+    """长度已知的流式请求体，requests 会据 len() 设置 Content-Length"""
+
+    def __init__(self, chunks: Iterable[bytes], size: int, progress: Optional[ProgressCallback] = None):
+        super().__init__(chunks, progress)
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def file_body(path: str, chunked: bool = False, progress: Optional[ProgressCallback] = None,
+              chunk_size: int = UPLOAD_CHUNK_SIZE) -> StreamBody:
+    """
+    创建从文件读取的请求体
+
+    Args:
+        path: 文件路径
+        chunked: True 时使用分块传输，否则预先读取文件大小作为 Content-Length
+        progress: 上传进度回调
+        chunk_size: 每次读取的字节数
+
+    Returns:
+        可以直接作为 requests 的 data 参数的 StreamBody
+
+    Raises:
+        OSError: 文件不存在或无法读取
+    """
+    size = os.path.getsize(path)
+    chunks = iter_file_chunks(path, chunk_size)
+    if chunked:
+        return StreamBody(chunks, progress)
+    return SizedStreamBody(chunks, size, progress)
+
+
+def with_progress(body, progress: Optional[ProgressCallback]):
+    """
+    给已有的可迭代请求体（如 MultipartEncoder）加上上传进度；
+    字节串和字典等其他请求体原样返回
+
+    Args:
+        body: 请求体
+        progress: 上传进度回调
+
+    Returns:
+        StreamBody 或原请求体
+    """
+    if isinstance(body, StreamBody):
+        body.progress = progress
+        return body
+    if progress is None or body is None or isinstance(body, (bytes, str, dict)):
+        return body
+    if hasattr(body, '__len__'):
+        return SizedStreamBody(body, len(body), progress)
+    return StreamBody(body, progress)
+
+
+class RequestBodyError(ValueError):
+    """请求体无法准备（文件无法读取、表单格式错误等）"""
+
+
+class PreparedBody:
+    """
+    准备好的请求体
+
+    data 可以直接作为 requests 的 data 参数：None、bytes 或流式请求体；
+    headers 是实际发送的请求头（可能补充了 Content-Type）。
+    """
+
+    __slots__ = ('data', 'headers')
+
+    def __init__(self, data, headers: Headers):
+        self.data = data
+        self.headers = headers
+
+    @property
+    def size(self) -> Optional[int]:
+        """请求体字节数，分块传输时为 None"""
+        if self.data is None:
+            return 0
+        if isinstance(self.data, StreamBody):
+            return self.data.size
+        return len(self.data)
+
+
+def looks_like_json(text: str) -> bool:
+    """文本是否像 JSON（只看第一个非空白字符，不解析）"""
+    stripped = text.lstrip()
+    return stripped[:1] in ('{', '[')
+
+
+def is_json_content_type(content_type: str) -> bool:
+    """application/json、application/problem+json 等"""
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return media_type == 'application/json' or media_type.endswith('+json')
+
+
+@traced('prepare_body', 'engine')
+def prepare_body(method: str, headers: Headers, text: str = '', body_file: Optional[str] = None,
+                 chunked: bool = False) -> PreparedBody:
+    """
+    按 Content-Type 准备请求体，每次发送只调用一次
+
+    - 文件请求体：按块读取，Content-Type 默认按扩展名推断
+    - multipart/form-data 且不带 boundary：编辑器中每行一个 curl -F 字段，流式编码
+    - 其余文本按 Content-Type 的 charset（默认 UTF-8）编码后原样发送，
+      JSON 不会被解析再序列化，键顺序、空白和数字写法与编辑器中完全一致；
+      没有 Content-Type 且文本以 { 或 [ 开头时补充 application/json
+
+    Args:
+        method: 请求方法，只有 POST/PUT/PATCH 会带请求体
+        headers: 编辑器中的请求头（不会被修改）
+        text: 请求体编辑器中的文本
+        body_file: 文件请求体的路径
+        chunked: 文件请求体是否使用分块传输
+
+    Returns:
+        PreparedBody
+
+    Raises:
+        RequestBodyError: 文件无法读取或表单格式错误
+    """
+    if method not in METHODS_WITH_BODY or (not body_file and not text.strip()):
+        return PreparedBody(None, headers)
+
+    content_type = headers.get('Content-Type', '')
+    prepared_headers = headers.copy()
+
+    if body_file:
+        try:
+            data = file_body(body_file, chunked=chunked)
+        except OSError as e:
+            raise RequestBodyError(f'无法读取请求体文件: {e}') from e
+        if not content_type:
+            prepared_headers['Content-Type'] = guess_content_type(body_file)
+        return PreparedBody(data, prepared_headers)
+
+    if content_type.strip().lower().startswith('multipart/form-data') and not get_boundary(content_type):
+        try:
+            encoder = MultipartEncoder(parse_form_specs(text))
+        except (MultipartError, OSError) as e:
+            raise RequestBodyError(f'无法构建 multipart 表单: {e}') from e
+        prepared_headers['Content-Type'] = encoder.content_type
+        return PreparedBody(encoder, prepared_headers)
+
+    if not content_type and looks_like_json(text):
+        prepared_headers['Content-Type'] = 'application/json'
+
+    charset = get_param(content_type, 'charset') or 'utf-8'
+    try:
+        data = text.encode(charset)
+    except (LookupError, UnicodeEncodeError):
+        data = text.encode('utf-8')
+    return PreparedBody(data, prepared_headers)
+
+
+def check_json(text: str) -> Optional[str]:
+    """
+    检查 JSON 是否有效，只用于界面提示（在后台线程中调用）
+
+    Args:
+        text: 请求体文本
+
+    Returns:
+        None 表示有效，否则为错误说明
+    """
+    try:
+        json.loads(text)
+    except ValueError as e:
+        if isinstance(e, json.JSONDecodeError):
+            return f"第 {e.lineno} 行第 {e.colno} 列: {e.msg}"
+        return str(e)
+    return None
+
+
+def format_json_text(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    格式化 JSON 文本（在后台线程中调用）
+
+    Args:
+        text: 请求体文本
+
+    Returns:
+        (格式化后的文本, 错误说明)；文本为空时两者都为 None
+    """
+    if not text.strip():
+        return None, None
+    try:
+        parsed = json.loads(text)
+    except ValueError as e:
+        if isinstance(e, json.JSONDecodeError):
+            return None, f"第 {e.lineno} 行第 {e.colno} 列: {e.msg}"
+        return None, str(e)
+    return json.dumps(parsed, indent=2, ensure_ascii=False), None
+
+
+class CompressionStats:
+    """请求体压缩的统计：原始大小、压缩后大小和压缩耗时"""
+
+    __slots__ = ('encoding', 'original_size', 'compressed_size', 'elapsed')
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        self.original_size = 0
+        self.compressed_size = 0
+        self.elapsed = 0.0  # 秒
+
+    @property
+    def ratio(self) -> float:
+        """压缩后大小 / 原始大小"""
+        return self.compressed_size / self.original_size if self.original_size else 1.0
+
+    def to_dict(self) -> dict:
+        return {
+            'encoding': self.encoding,
+            'original_size': self.original_size,
+            'compressed_size': self.compressed_size,
+            'compression_ms': round(self.elapsed * 1000, 2)
+        }
+
+
+def make_compressor(encoding: str):
+    """
+    创建流式压缩器
+
+    Args:
+        encoding: gzip、deflate 或 zstd
+
+    Returns:
+        带 compress()/flush() 的对象
+
+    Raises:
+        RequestBodyError: 不支持的压缩方式，或 zstd 缺少 zstandard 库
+    """
+    if encoding == 'gzip':
+        return zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        # HTTP 的 deflate 是带 zlib 头的格式
+        return zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS)
+    if encoding == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise RequestBodyError('使用 zstd 压缩需要安装 zstandard')
+        return zstandard.ZstdCompressor().compressobj()
+    raise RequestBodyError(f'不支持的压缩方式: {encoding}')
+
+
+def _iter_compressed(chunks: Iterable[bytes], compressor, stats: CompressionStats) -> Iterator[bytes]:
+    """边读边压缩，统计随发送过程更新"""
+    for chunk in chunks:
+        start = time.perf_counter()
+        output = compressor.compress(chunk)
+        stats.elapsed += time.perf_counter() - start
+        stats.original_size += len(chunk)
+        if output:
+            stats.compressed_size += len(output)
+            yield output
+    start = time.perf_counter()
+    output = compressor.flush()
+    stats.elapsed += time.perf_counter() - start
+    stats.compressed_size += len(output)
+    if output:
+        yield output
+
+
+@traced('compress_body', 'engine')
+def compress_body(prepared: PreparedBody, encoding: str) -> Tuple[PreparedBody, Optional[CompressionStats]]:
+    """
+    压缩准备好的请求体，并设置 Content-Encoding（在请求线程中调用，不阻塞界面）
+
+    字节请求体一次压缩完成，Content-Length 为压缩后的长度；流式请求体（文件、multipart）
+    边发送边压缩，压缩后的长度事先未知，改用分块传输，统计在发送完成后才完整。
+
+    Args:
+        prepared: prepare_body 的结果
+        encoding: gzip、deflate 或 zstd；为空时不压缩
+
+    Returns:
+        (新的 PreparedBody, CompressionStats)；没有请求体或不压缩时统计为 None
+
+    Raises:
+        RequestBodyError: 不支持的压缩方式
+    """
+    if not encoding or prepared.data is None:
+        return prepared, None
+
+    compressor = make_compressor(encoding)
+    stats = CompressionStats(encoding)
+    headers = prepared.headers.copy()
+    headers['Content-Encoding'] = encoding
+    headers.pop('Content-Length')
+
+    data = prepared.data
+    if isinstance(data, dict):
+        data = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/json')
+    elif isinstance(data, str):
+        data = data.encode('utf-8')
+
+    if isinstance(data, bytes):
+        start = time.perf_counter()
+        compressed = compressor.compress(data) + compressor.flush()
+        stats.elapsed = time.perf_counter() - start
+        stats.original_size = len(data)
+        stats.compressed_size = len(compressed)
+        return PreparedBody(compressed, headers), stats
+
+    source = data.chunks if isinstance(data, StreamBody) else data
+    progress = data.progress if isinstance(data, StreamBody) else None
+    return PreparedBody(StreamBody(_iter_compressed(source, compressor, stats), progress), headers), stats
+
+
+def normalize_url(url: str) -> str:
+    """
+    补全地址栏中省略的协议：没有 http:// 或 https:// 时按 https 发送
+
+    Args:
+        url: 输入或渲染后的 URL
+
+    Returns:
+        带协议的 URL
+    """
+    if url.startswith(('http://', 'https://')):
+        return url
+    return 'https://' + url
+
+
+# 连接超时的上限（秒），读取超时使用请求设置的超时时间
+CONNECT_TIMEOUT = 5
+
+
+def new_session():
+    """创建 requests.Session（首次调用时导入 requests）"""
+    import requests
+    return requests.Session()
+
+
+@traced('send_prepared', 'engine')
+def send_prepared(session, method: str, url: str, prepared: PreparedBody, timeout: float = 30,
+                  progress: Optional[ProgressCallback] = None):
+    """
+    发送准备好的请求并读取完整响应
+
+    Args:
+        session: new_session() 创建的会话，关闭它可以中断请求
+        method: 请求方法
+        url: 请求URL
+        prepared: prepare_body/compress_body 的结果
+        timeout: 读取超时（秒）
+        progress: 流式请求体的上传进度回调
+
+    Returns:
+        (response, 总耗时毫秒, 首字节耗时毫秒)
+
+    Raises:
+        requests.exceptions.RequestException: 请求失败
+    """
+    kwargs = {}
+    if method in METHODS_WITH_BODY:
+        # 流式请求体（文件、multipart）在发送过程中报告上传进度
+        data = with_progress(prepared.data, progress)
+        kwargs['json' if isinstance(data, dict) else 'data'] = data
+
+    start_time = time.time()
+    response = session.request(
+        method=method,
+        url=url,
+        # requests 的请求头是普通字典，同名字段合并后发送
+        headers=prepared.headers.to_dict(),
+        timeout=(min(CONNECT_TIMEOUT, timeout), timeout),
+        **kwargs
+    )
+    response_time = round((time.time() - start_time) * 1000, 2)
+    # requests 的 elapsed 为发送请求到解析完响应头的耗时
+    ttfb = round(response.elapsed.total_seconds() * 1000, 2)
+    return response, response_time, ttfb
+
+
+def describe_request_error(error: Exception) -> str:
+    """请求失败时显示的说明"""
+    import requests
+    if isinstance(error, requests.exceptions.Timeout):
+        return "请求超时"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "连接错误"
+    return str(error)
@@ -0,0 +1,452 @@
+"""
+命令行请求执行器（不依赖 Qt）
+执行保存的请求（“保存请求”生成的 JSON）、历史记录、原始HTTP请求文件或脚本中的 curl 命令，
+输出状态码和耗时；启动时不导入 PySide6，解析器和 requests 在用到时才导入
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Dict, Iterator, List, Optional, Union
+
+from headers import Headers
+from request_engine import (
+    COMPRESSION_METHODS, RequestBodyError, compress_body, describe_request_error,
+    new_session, prepare_body, send_prepared
+)
+from templates import TemplateError, render_request
+import tracing
+
+
+DEFAULT_TIMEOUT = 30
+
+
+class RunnerRequest:
+    """要执行的一个请求"""
+
+    __slots__ = ('method', 'url', 'headers', 'body', 'body_file', 'timeout', 'source')
+
+    def __init__(self, method: str, url: str, headers: Headers, body: str = '',
+                 body_file: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT, source: str = ''):
+        self.method = method.upper()
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.body_file = body_file
+        self.timeout = timeout
+        self.source = source  # 来源说明，如 "api.http#2"
+
+
+class SourceError:
+    """输入中无法解析的条目"""
+
+    __slots__ = ('source', 'error')
+
+    def __init__(self, source: str, error: str):
+        self.source = source
+        self.error = error
+
+
+def request_from_saved(data: Dict, source: str, timeout: Optional[float] = None) -> Union[RunnerRequest, SourceError]:
+    """
+    由保存的请求或历史记录条目创建请求
+
+    Args:
+        data: {'method', 'url', 'headers', 'body', 'body_file', 'timeout'}
+        source: 来源说明
+        timeout: 覆盖保存的超时时间
+
+    Returns:
+        RunnerRequest，缺少URL时为 SourceError
+    """
+    if not isinstance(data, dict) or not data.get('url'):
+        return SourceError(source, '缺少URL')
+    return RunnerRequest(
+        data.get('method') or 'GET',
+        data['url'],
+        Headers(data.get('headers') or {}),
+        data.get('body') or '',
+        data.get('body_file'),
+        timeout or data.get('timeout') or DEFAULT_TIMEOUT,
+        source
+    )
+
+
+def _is_curl_script(path: str) -> bool:
+    """第一条有效行以 curl 开头时按脚本处理，否则按原始HTTP请求处理"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped and not stripped.startswith(('#', 'REM ', 'rem ', '::')):
+                return stripped.lower().startswith('curl')
+    return False
+
+
+def load_requests(path: str, timeout: Optional[float] = None) -> Iterator[Union[RunnerRequest, SourceError]]:
+    """
+    从文件逐个读取请求
+
+    - .json：保存的请求（对象）或历史记录文件（数组）
+    - 第一条有效行以 curl 开头：脚本中的全部 curl 命令
+    - 其他：一个或多个原始HTTP请求
+
+    Args:
+        path: 文件路径
+        timeout: 覆盖请求的超时时间
+
+    Returns:
+        逐个产出 RunnerRequest 或 SourceError 的生成器
+    """
+    name = os.path.basename(path)
+
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            for index, item in enumerate(data):
+                yield request_from_saved(item, f"{name}#{index}", timeout)
+        else:
+            yield request_from_saved(data, name, timeout)
+        return
+
+    from http_parser import iter_curl_commands, iter_http_requests
+
+    if _is_curl_script(path):
+        results = iter_curl_commands(path, os.path.dirname(os.path.abspath(path)))
+    else:
+        results = iter_http_requests(path)
+    for index, result in enumerate(results):
+        source = f"{name}#{index}"
+        if not result['success']:
+            yield SourceError(source, result['error'])
+            continue
+        yield RunnerRequest(
+            result['method'], result['url'], Headers(result['headers']), result.get('body') or '',
+            result.get('body_file'), timeout or DEFAULT_TIMEOUT, source
+        )
+
+
+def load_history_requests(indexes: List[int], timeout: Optional[float] = None,
+                          history_file: Optional[str] = None) -> Iterator[Union[RunnerRequest, SourceError]]:
+    """
+    读取历史记录中的请求，0 为最近一次
+
+    Args:
+        indexes: 历史记录序号
+        timeout: 覆盖请求的超时时间
+        history_file: 历史记录文件，默认为用户目录下的文件
+
+    Returns:
+        逐个产出 RunnerRequest 或 SourceError 的生成器
+    """
+    from history_store import load_history
+
+    history = load_history(history_file)
+    for index in indexes:
+        source = f"历史#{index}"
+        if not 0 <= index < len(history):
+            yield SourceError(source, f'历史记录只有 {len(history)} 条')
+            continue
+        yield request_from_saved(history[index], source, timeout)
+
+
+def apply_variables(request: RunnerRequest, variables: Dict[str, str]) -> Union[RunnerRequest, SourceError]:
+    """
+    替换请求 URL、请求头和请求体中的 {{变量}}
+
+    Returns:
+        替换后的 RunnerRequest，缺少变量时为 SourceError
+    """
+    try:
+        rendered = render_request(request.method, request.url, request.headers, request.body, variables)
+    except TemplateError as e:
+        return SourceError(request.source, str(e))
+    return RunnerRequest(
+        request.method, rendered['url'], rendered['headers'], rendered['body'],
+        request.body_file, request.timeout, request.source
+    )
+
+
+def parse_variables(items: List[str]) -> Dict[str, str]:
+    """
+    解析命令行中的 name=value
+
+    Raises:
+        ValueError: 格式错误
+    """
+    variables = {}
+    for item in items:
+        name, sep, value = item.partition('=')
+        if not sep or not name.strip():
+            raise ValueError(f'变量格式应为 name=value: {item}')
+        variables[name.strip()] = value
+    return variables
+
+
+def run_request(request: RunnerRequest, session=None, compression: Optional[str] = None,
+                dry_run: bool = False) -> Dict:
+    """
+    执行一个请求
+
+    Args:
+        request: 要执行的请求
+        session: new_session() 创建的会话（保持连接），dry_run 时可以为空
+        compression: 请求体压缩方式
+        dry_run: 只准备请求体，不发送
+
+    Returns:
+        {'source', 'method', 'url', 'status_code', 'response_time', 'ttfb', 'size', 'request_size', 'error'}
+
+    Raises:
+        ValueError: 不是 dry_run 但没有会话
+    """
+    if session is None and not dry_run:
+        raise ValueError('发送请求需要会话，请传入 new_session() 的结果或使用 dry_run')
+
+    result = {
+        'source': request.source,
+        'method': request.method,
+        'url': request.url,
+        'status_code': None,
+        'response_time': None,
+        'ttfb': None,
+        'size': None,
+        'request_size': None,
+        'error': None
+    }
+    try:
+        prepared = prepare_body(request.method, request.headers, request.body, request.body_file)
+        prepared, _ = compress_body(prepared, compression)
+    except RequestBodyError as e:
+        result['error'] = str(e)
+        return result
+    result['request_size'] = prepared.size
+    if dry_run:
+        return result
+
+    try:
+        response, response_time, ttfb = send_prepared(session, request.method, request.url, prepared, request.timeout)
+    except Exception as e:
+        result['error'] = describe_request_error(e)
+        return result
+    result.update(
+        status_code=response.status_code,
+        response_time=response_time,
+        ttfb=ttfb,
+        size=len(response.content),
+        url=response.url
+    )
+    response.close()
+    return result
+
+
+def format_size(size: Optional[int]) -> str:
+    if size is None:
+        return '-'
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def format_result(result: Dict, dry_run: bool = False) -> str:
+    """一行结果说明"""
+    prefix = f"{result['source']}  {result['method']} {result['url']}"
+    if result['error']:
+        return f"✗ {prefix}  错误: {result['error']}"
+    if dry_run:
+        return f"· {prefix}  请求体 {format_size(result['request_size'])}"
+    mark = '✓' if result['status_code'] < 400 else '✗'
+    return (f"{mark} {prefix}  {result['status_code']}  {result['response_time']:.1f} ms"
+            f" (首字节 {result['ttfb']:.1f} ms)  {format_size(result['size'])}")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="执行保存的请求、历史记录、原始HTTP请求文件或 curl 脚本（不启动界面）",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  python cli.py login.json                  # 保存的请求
+  python cli.py requests.http curl.sh       # 原始HTTP请求文件、curl 脚本中的全部请求
+  python cli.py --history 0 --history 1     # 最近两条历史记录
+  python cli.py --json --fail api.http      # 每行输出一个 JSON，有 4xx/5xx 时返回非零退出码
+  python cli.py --env staging --var id=42 api.http   # 替换请求中的 {{变量}}
+  python cli.py --data users.csv --concurrency 16 --output results.jsonl user.json
+                                            # 按数据文件的每一行发送一次，列名作为变量
+        """
+    )
+    parser.add_argument("files", nargs="*", help="请求文件（.json / 原始HTTP请求 / curl 脚本）")
+    parser.add_argument("--history", type=int, action="append", default=[], metavar="N",
+                        help="执行第 N 条历史记录（0 为最近一次），可重复")
+    parser.add_argument("--timeout", type=float, help="覆盖请求的超时时间（秒）")
+    parser.add_argument("--compress", choices=COMPRESSION_METHODS, help="压缩请求体")
+    parser.add_argument("--json", action="store_true", help="每个请求输出一行 JSON")
+    parser.add_argument("--fail", action="store_true", help="响应状态码 >= 400 也视为失败")
+    parser.add_argument("--dry-run", action="store_true", help="只解析和准备请求，不发送")
+    parser.add_argument("--env", metavar="NAME", help="使用环境中的变量替换 {{变量}}（在界面的“环境...”中管理）")
+    parser.add_argument("--var", action="append", default=[], metavar="NAME=VALUE",
+                        help="定义或覆盖变量，可重复")
+    parser.add_argument("--data", metavar="FILE",
+                        help="数据文件（.csv / .jsonl），每个请求按每一行发送一次，列名作为变量")
+    parser.add_argument("--concurrency", type=int, default=8, metavar="N",
+                        help="数据驱动执行时同时发送的请求数 (默认: 8)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="数据驱动执行的结果文件（.csv 或 JSONL），指定后不逐行打印结果")
+    parser.add_argument("--trace", metavar="FILE", help="记录各阶段耗时并导出为 Chrome trace-event JSON")
+    return parser
+
+
+def iter_sources(args) -> Iterator[Union[RunnerRequest, SourceError]]:
+    if args.history:
+        yield from load_history_requests(args.history, args.timeout)
+    for path in args.files:
+        try:
+            yield from load_requests(path, args.timeout)
+        except (OSError, ValueError) as e:
+            yield SourceError(os.path.basename(path), f'无法读取: {e}')
+
+
+def load_variables(env_name: Optional[str], items: List[str],
+                   environments_file: Optional[str] = None) -> Dict[str, str]:
+    """
+    合并环境变量和命令行变量（命令行优先）
+
+    Raises:
+        ValueError: 环境不存在或命令行变量格式错误
+    """
+    variables = {}
+    if env_name:
+        from environments import EnvironmentStore
+        store = EnvironmentStore(environments_file)
+        if env_name not in store.environments:
+            raise ValueError(f'环境不存在: {env_name}')
+        variables.update(store.get(env_name))
+    variables.update(parse_variables(items))
+    return variables
+
+
+def is_failure(result: Dict, fail_on_status: bool) -> bool:
+    return bool(result['error']) or (fail_on_status and (result.get('status_code') or 0) >= 400)
+
+
+def print_result(result: Dict, args):
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+    else:
+        print(format_result(result, args.dry_run), flush=True)
+
+
+def run_data_sweep(args, variables: Dict[str, str]) -> int:
+    """
+    数据驱动执行：每个请求按数据文件的每一行发送一次
+
+    Returns:
+        退出码
+    """
+    from data_runner import ResultWriter, iter_rows, run_rows
+
+    if args.concurrency < 1:
+        print("错误: --concurrency 至少为 1", file=sys.stderr)
+        return 2
+
+    writer = None
+    total = failed = 0
+    start = time.perf_counter()
+
+    def on_result(result: Dict):
+        nonlocal total, failed
+        total += 1
+        if is_failure(result, args.fail):
+            failed += 1
+        if writer is not None:
+            writer.write(result)
+        else:
+            print_result(result, args)
+
+    try:
+        if args.output:
+            writer = ResultWriter(args.output)
+        for item in iter_sources(args):
+            if isinstance(item, SourceError):
+                on_result({'source': item.source, 'method': '-', 'url': '-', 'error': item.error})
+                continue
+            with tracing.span('run_rows', 'cli', source=item.source, data=args.data):
+                run_rows(item, iter_rows(args.data), on_result, variables, args.concurrency,
+                         args.compress, args.dry_run)
+    except OSError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if writer is not None:
+            writer.close()
+        if args.trace:
+            tracing.export_chrome_trace(args.trace)
+
+    if not args.json or writer is not None:
+        elapsed = (time.perf_counter() - start) * 1000
+        rate = total / elapsed * 1000 if elapsed > 0 else 0
+        print(f"共 {total} 行: {total - failed} 成功, {failed} 失败, 用时 {elapsed:.1f} ms ({rate:.1f} 行/秒)",
+              file=sys.stderr)
+        if writer is not None:
+            print(f"结果已写入: {args.output}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+
+    Returns:
+        退出码：全部成功为 0，有请求失败为 1，参数错误为 2
+    """
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if not args.files and not args.history:
+        parser.print_usage(sys.stderr)
+        print("错误: 需要至少一个请求文件或 --history", file=sys.stderr)
+        return 2
+
+    try:
+        variables = load_variables(args.env, args.var)
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+
+    if args.trace:
+        tracing.enable()
+
+    if args.data:
+        return run_data_sweep(args, variables)
+
+    session = None
+    total = failed = 0
+    start = time.perf_counter()
+    try:
+        for item in iter_sources(args):
+            total += 1
+            if isinstance(item, RunnerRequest):
+                item = apply_variables(item, variables)
+            if isinstance(item, SourceError):
+                result = {'source': item.source, 'method': '-', 'url': '-', 'error': item.error}
+            else:
+                if session is None and not args.dry_run:
+                    session = new_session()
+                with tracing.span('run_request', 'cli', source=item.source) as request_span:
+                    result = run_request(item, session, args.compress, args.dry_run)
+                    request_span.set(status_code=result['status_code'], error=result['error'])
+            if is_failure(result, args.fail):
+                failed += 1
+            print_result(result, args)
+    finally:
+        if session is not None:
+            session.close()
+        if args.trace:
+            tracing.export_chrome_trace(args.trace)
+
+    if not args.json:
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"共 {total} 个请求: {total - failed} 成功, {failed} 失败, 用时 {elapsed:.1f} ms", file=sys.stderr)
+    return 1 if failed else 0
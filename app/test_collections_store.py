@@ -0,0 +1,134 @@
+"""
+测试请求集合存储
+"""
+import sys
+import io
+import os
+import tempfile
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from collections_store import CollectionStore
+
+
+def test_folders_and_lazy_children():
+    """测试文件夹层级和按层读取"""
+    print("=" * 80)
+    print("测试集合文件夹")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = CollectionStore(os.path.join(temp_dir, 'workspace.db'))
+        collection_id = store.create_collection('用户服务')
+        folder_id = store.get_folder_path(collection_id, 'v1/users')
+
+        store.add_request(collection_id, {
+            'method': 'POST',
+            'url': 'https://api.example.com/v1/users',
+            'headers': {'Content-Type': 'application/json'},
+            'body': '{"name": "张三"}'
+        }, folder_id, '创建用户')
+
+        root = store.list_children(collection_id)
+        print(f"根目录: {root}")
+        assert root['requests'] == []
+        assert root['folders'][0]['name'] == 'v1'
+        assert root['folders'][0]['has_children']
+
+        assert store.get_folder_path(collection_id, 'v1/users') == folder_id
+        children = store.list_children(collection_id, folder_id)
+        assert children['requests'][0]['name'] == '创建用户'
+        assert 'body' not in children['requests'][0]
+
+        request = store.get_request(children['requests'][0]['id'])
+        assert request['headers'] == {'Content-Type': 'application/json'}
+        assert request['body'] == '{"name": "张三"}'
+
+        assert request['body_file'] is None
+
+        # 文件请求体的路径随请求保存，重新打开工作区后仍然存在
+        file_request_id = store.add_request(collection_id, {
+            'method': 'PUT',
+            'url': 'https://api.example.com/v1/files',
+            'headers': {},
+            'body': '',
+            'body_file': '/data/upload.bin'
+        }, folder_id)
+        store.close()
+        store = CollectionStore(os.path.join(temp_dir, 'workspace.db'))
+        assert store.get_request(file_request_id)['body_file'] == '/data/upload.bin'
+        store.update_request(file_request_id, {'method': 'PUT', 'url': 'https://api.example.com/v1/files',
+                                               'body': 'text'})
+        assert store.get_request(file_request_id)['body_file'] is None
+
+        store.delete_folder(root['folders'][0]['id'])
+        assert store.count_requests(collection_id) == 0
+        store.close()
+
+    print("\n✓ 集合文件夹测试通过")
+    return True
+
+
+def test_bulk_insert_and_search():
+    """测试批量写入和搜索"""
+    print("\n" + "=" * 80)
+    print("测试集合搜索")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = CollectionStore(os.path.join(temp_dir, 'workspace.db'))
+        collection_id = store.create_collection('批量')
+        requests = (
+            {'method': 'GET', 'url': f'https://api.example.com/orders/{i}'}
+            for i in range(2500)
+        )
+        assert store.add_requests(collection_id, requests, batch_size=1000) == 2500
+
+        results = store.search('orders/1234')
+        print(f"搜索结果: {results}")
+        assert len(results) == 1
+        assert results[0]['url'].endswith('/orders/1234')
+
+        # 短关键字走 LIKE 查询
+        assert len(store.search('GE', limit=10)) == 10
+
+        request_id = results[0]['id']
+        store.update_request(request_id, {'method': 'DELETE', 'url': 'https://api.example.com/items/1'})
+        assert store.search('items/1')[0]['id'] == request_id
+        store.close()
+
+    print("\n✓ 集合搜索测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试请求集合存储\n")
+
+    tests = [
+        test_folders_and_lazy_children,
+        test_bulk_insert_and_search
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
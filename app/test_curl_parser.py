@@ -3,12 +3,14 @@
 """
 import sys
 import io
+import os
+import tempfile
 
 # 设置标准输出编码为UTF-8
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-from http_parser import HTTPRequestParser, parse_curl_command
+from http_parser import HTTPRequestParser, parse_curl_command, iter_curl_commands
 
 
 def test_parse_curl_get_request():
@@ -216,6 +218,155 @@ def test_format_query_string():
     return True
 
 
+def test_parse_curl_common_options():
+    """测试常用cURL选项、组合短选项和续行"""
+    curl_command = (
+        "curl -sSL -XPUT 'https://api.example.com/items/1' \\\n"
+        "  -u admin:secret \\\n"
+        "  -b 'session=abc' -b lang=zh \\\n"
+        "  --compressed \\\n"
+        "  -H 'Content-Type: application/json' \\\n"
+        "  --data-raw $'{\"name\": \"a\\\\nb\"}'"
+    )
+
+    print("\n" + "=" * 80)
+    print("测试常用 cURL 选项")
+    print("=" * 80)
+
+    result = HTTPRequestParser.parse_curl_command(curl_command)
+    print(f"方法: {result['method']}")
+    print(f"请求头: {result['headers']}")
+    print(f"请求体: {result['body']!r}")
+
+    assert result['success']
+    assert result['method'] == 'PUT'
+    assert result['url'] == 'https://api.example.com/items/1'
+    assert result['headers']['Authorization'] == 'Basic YWRtaW46c2VjcmV0'
+    assert result['headers']['Cookie'] == 'session=abc; lang=zh'
+    assert 'gzip' in result['headers']['Accept-Encoding']
+    assert result['body'] == '{"name": "a\\nb"}'
+
+    result = parse_curl_command("curl -G -d q=http --data-urlencode 'tag=a b' https://api.example.com/search")
+    print(f"-G URL: {result['url']}")
+    assert result['method'] == 'GET'
+    assert result['url'] == 'https://api.example.com/search?q=http&tag=a+b'
+    assert result['body'] == ''
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with open(os.path.join(temp_dir, 'payload.json'), 'w', encoding='utf-8') as f:
+            f.write('{"id": 1}\n')
+        result = parse_curl_command("curl --data-binary @payload.json https://api.example.com/upload", base_dir=temp_dir)
+        assert result['method'] == 'POST'
+        assert result['body'] == '{"id": 1}\n'
+
+        result = parse_curl_command("curl --data-binary @missing.json https://api.example.com/upload", base_dir=temp_dir)
+        assert not result['success']
+
+    print("\n✓ 常用 cURL 选项测试通过")
+    return True
+
+
+def test_iter_curl_commands():
+    """测试从脚本中批量提取cURL命令"""
+    script = (
+        "#!/bin/bash\n"
+        "# curl https://commented.example.com\n"
+        "set -e\n"
+        "curl 'https://api.example.com/a' -H 'Accept: */*' --compressed ;\n"
+        "curl 'https://api.example.com/b' \\\n"
+        "  --data-raw '{\"k\": 1}' | jq . > out.json\n"
+        "for id in 1 2; do curl -s https://api.example.com/c/$id; done\n"
+        "echo done && curl -I https://api.example.com/d\n"
+    )
+
+    print("\n" + "=" * 80)
+    print("测试批量提取 cURL 命令")
+    print("=" * 80)
+
+    results = list(iter_curl_commands(io.StringIO(script)))
+    for result in results:
+        print(f"{result['method']} {result['url']}")
+
+    assert [r['method'] for r in results] == ['GET', 'POST', 'GET', 'HEAD']
+    assert [r['url'] for r in results] == [
+        'https://api.example.com/a',
+        'https://api.example.com/b',
+        'https://api.example.com/c/$id',
+        'https://api.example.com/d'
+    ]
+    assert results[1]['body'] == '{"k": 1}'
+
+    print("\n✓ 批量提取 cURL 命令测试通过")
+    return True
+
+
+def test_curl_option_values_and_errors():
+    """测试带参数的选项、不支持的选项和未闭合的引号"""
+    print("\n" + "=" * 80)
+    print("测试 cURL 选项参数和错误")
+    print("=" * 80)
+
+    result = parse_curl_command("curl -D - --max-redirs 5 -K cfg -w '%{http_code}' --connect-timeout 3 "
+                                "-e https://ref.example.com --oauth2-bearer t0k -sSLk https://api.example.com/a")
+    print(f"URL: {result['url']}, 请求头: {result['headers']}")
+    assert result['success']
+    assert result['url'] == 'https://api.example.com/a'
+    assert result['headers']['Authorization'] == 'Bearer t0k'
+    assert result['headers']['Referer'] == 'https://ref.example.com'
+
+    result = parse_curl_command("curl --json '{\"a\": 1}' https://api.example.com/items")
+    assert result['method'] == 'POST' and result['body'] == '{"a": 1}'
+    assert result['headers']['Content-Type'] == 'application/json'
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with open(os.path.join(temp_dir, 'f.bin'), 'w', encoding='utf-8') as f:
+            f.write('data')
+        result = parse_curl_command("curl -T f.bin https://api.example.com/upload/", base_dir=temp_dir)
+        assert result['method'] == 'PUT'
+        assert result['url'] == 'https://api.example.com/upload/f.bin'
+        assert result['body'] == 'data'
+
+    for command in ["curl --frobnicate https://api.example.com", "curl -sQ x https://api.example.com",
+                    "curl -T - https://api.example.com",
+                    "curl 'unterminated", 'curl https://api.example.com -d "a b']:
+        result = parse_curl_command(command)
+        print(f"{command!r}: {result['error']}")
+        assert not result['success']
+
+    results = list(iter_curl_commands(io.StringIO("curl https://api.example.com/a\ncurl 'b\n")))
+    assert results[0]['success'] and not results[1]['success']
+
+    print("\n✓ cURL 选项参数和错误测试通过")
+    return True
+
+
+def test_parse_curl_cmd():
+    """测试 Windows cmd 格式（Chrome“复制为 cURL (cmd)”）"""
+    print("\n" + "=" * 80)
+    print("测试 cmd 格式 cURL 命令")
+    print("=" * 80)
+
+    result = parse_curl_command('curl ^"https://x.com/a^" -H ^"A: b^" --data-raw ^"^{^\\^"a^\\^":1^}^"')
+    print(f"URL: {result['url']}, 请求体: {result['body']!r}")
+    assert result['url'] == 'https://x.com/a'
+    assert result['headers']['A'] == 'b'
+    assert result['body'] == '{"a":1}'
+
+    # ^ 续行，^ 加两个换行为请求体中的换行，^^ 为字面量 ^
+    command = ('curl ^"https://x.com/q?a=1^&b=2^" ^\r\n'
+               '  -H ^"Cookie: k=v^" ^\r\n'
+               '  --data-raw ^"line1^\n\n100%^^^"\r\n'
+               'curl ^"https://x.com/next^"')
+    results = list(iter_curl_commands(io.StringIO(command)))
+    print(f"请求体: {results[0]['body']!r}")
+    assert [r['url'] for r in results] == ['https://x.com/q?a=1&b=2', 'https://x.com/next']
+    assert results[0]['headers']['Cookie'] == 'k=v'
+    assert results[0]['body'] == 'line1\n100%^'
+
+    print("\n✓ cmd 格式 cURL 命令测试通过")
+    return True
+
+
 if __name__ == "__main__":
     print("\n开始测试 cURL 命令解析器\n")
 
@@ -226,7 +377,11 @@ if __name__ == "__main__":
         test_parse_curl_form_data,
         test_invalid_curl,
         test_format_form_data,
-        test_format_query_string
+        test_format_query_string,
+        test_parse_curl_common_options,
+        test_iter_curl_commands,
+        test_curl_option_values_and_errors,
+        test_parse_curl_cmd
     ]
 
     passed = 0
@@ -0,0 +1,184 @@
+"""
+测试数据驱动执行
+"""
+import sys
+import io
+import os
+import json
+import time
+import tempfile
+import threading
+from datetime import timedelta
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from data_runner import QUEUE_PER_WORKER, ResultWriter, iter_rows, run_rows
+from request_runner import RunnerRequest, SourceError
+
+
+class RecordingResponse:
+    def __init__(self, url):
+        self.status_code = 404 if url.endswith('/3') else 200
+        self.content = b'{"ok": true}'
+        self.url = url
+        self.elapsed = timedelta(milliseconds=1)
+
+    def close(self):
+        pass
+
+
+class RecordingSession:
+    """记录收到的请求和同时在途的请求数"""
+
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+    requests = []
+
+    def request(self, method, url, headers, timeout, **kwargs):
+        with RecordingSession.lock:
+            RecordingSession.active += 1
+            RecordingSession.max_active = max(RecordingSession.max_active, RecordingSession.active)
+            RecordingSession.requests.append((method, url, headers, kwargs.get('data')))
+        time.sleep(0.002)
+        with RecordingSession.lock:
+            RecordingSession.active -= 1
+        return RecordingResponse(url)
+
+    def close(self):
+        pass
+
+
+def test_iter_rows_and_writer():
+    """测试逐行读取 CSV / JSONL 和结果写出"""
+    print("=" * 80)
+    print("测试数据文件读取")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, 'users.csv')
+        with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+            f.write('id,name\n1,alice\n2,"bob, jr"\n3\n')
+        rows = list(iter_rows(csv_path))
+        assert rows == [{'id': '1', 'name': 'alice'}, {'id': '2', 'name': 'bob, jr'}, {'id': '3', 'name': ''}]
+
+        jsonl_path = os.path.join(temp_dir, 'users.jsonl')
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            f.write('{"id": 1, "tags": ["a"]}\n\nnot json\n[1]\n{"id": "x"}\n')
+        rows = list(iter_rows(jsonl_path))
+        assert rows[0] == {'id': '1', 'tags': '["a"]'}
+        assert isinstance(rows[1], SourceError) and rows[1].source == 'users.jsonl:3'
+        assert isinstance(rows[2], SourceError)
+        assert rows[3] == {'id': 'x'}
+
+        for name in ('results.csv', 'results.jsonl'):
+            path = os.path.join(temp_dir, name)
+            with ResultWriter(path) as writer:
+                writer.write({'row': 0, 'source': 'a', 'method': 'GET', 'url': 'https://a', 'status_code': 200,
+                              'response_time': 1.0, 'ttfb': 0.5, 'size': 2, 'request_size': 0, 'error': None})
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            assert 'https://a' in content
+            if name.endswith('.jsonl'):
+                assert json.loads(content)['status_code'] == 200
+            else:
+                assert content.splitlines()[0].startswith('row,source,method,url')
+
+    print("\n✓ 数据文件读取测试通过")
+    return True
+
+
+def test_run_rows_bounded():
+    """测试逐行渲染发送、并发上限和读取进度不超前"""
+    print("\n" + "=" * 80)
+    print("测试数据驱动执行")
+    print("=" * 80)
+
+    RecordingSession.requests = []
+    RecordingSession.max_active = 0
+    concurrency = 4
+    count = 200
+    state = {'read': 0, 'delivered': 0, 'max_ahead': 0}
+
+    def rows():
+        for i in range(count):
+            state['read'] += 1
+            state['max_ahead'] = max(state['max_ahead'], state['read'] - state['delivered'])
+            yield {'id': str(i)} if i != 7 else {'other': 'x'}
+
+    results = []
+
+    def on_result(result):
+        state['delivered'] += 1
+        results.append(result)
+
+    request = RunnerRequest(
+        'POST', '{{base_url}}/users/{{id}}', {'Content-Type': 'text/plain', 'X-Id': '{{id}}'},
+        'user={{id}}', source='user.json'
+    )
+    start = time.perf_counter()
+    processed = run_rows(request, rows(), on_result, {'base_url': 'https://api.example.com'},
+                         concurrency, session_factory=RecordingSession)
+    elapsed = time.perf_counter() - start
+    print(f"{count} 行, 并发 {concurrency}: {elapsed * 1000:.1f} ms, 最多同时 {RecordingSession.max_active} 个请求, "
+          f"读取最多超前 {state['max_ahead']} 行")
+
+    assert processed == count and len(results) == count
+    assert RecordingSession.max_active <= concurrency
+    assert state['max_ahead'] <= concurrency * QUEUE_PER_WORKER + 1
+    assert sorted(r['row'] for r in results) == list(range(count))
+
+    by_row = {r['row']: r for r in results}
+    assert by_row[5]['url'] == 'https://api.example.com/users/5' and by_row[5]['status_code'] == 200
+    assert by_row[3]['status_code'] == 404
+    assert 'id' in by_row[7]['error'] and by_row[7]['status_code'] is None
+    sent = {url: (headers, data) for _, url, headers, data in RecordingSession.requests}
+    assert sent['https://api.example.com/users/9'] == ({'Content-Type': 'text/plain', 'X-Id': '9'}, b'user=9')
+
+    # 渲染后没有协议的 URL 与地址栏一样补全为 https
+    hosts = [{'host': 'api.example.com', 'id': '1'}, {'host': 'http://local', 'id': '2'}]
+    run_rows(RunnerRequest('GET', '{{host}}/users/{{id}}', {}, source='hosts.csv'), hosts, on_result,
+             session_factory=RecordingSession)
+    urls = [url for _, url, _, _ in RecordingSession.requests[-2:]]
+    assert sorted(urls) == ['http://local/users/2', 'https://api.example.com/users/1']
+
+    # stop 后不再读取新的行
+    stop = threading.Event()
+    stop.set()
+    assert run_rows(request, rows(), on_result, stop=stop, session_factory=RecordingSession) == 0
+
+    print("\n✓ 数据驱动执行测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试数据驱动执行\n")
+
+    tests = [
+        test_iter_rows_and_writer,
+        test_run_rows_bounded
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
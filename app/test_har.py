@@ -0,0 +1,141 @@
+"""
+测试HAR导入导出
+"""
+import sys
+import io
+import json
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from har import import_har, export_har, iter_har_entries
+
+
+SAMPLE_HAR = {
+    "log": {
+        "version": "1.2",
+        "creator": {"name": "WebInspector", "version": "537.36"},
+        "pages": [{"id": "page_1", "title": "带 } 和 \" 的标题"}],
+        "entries": [
+            {
+                "startedDateTime": "2024-12-18T08:00:00.000Z",
+                "request": {
+                    "method": "POST",
+                    "url": "https://api.example.com/users",
+                    "headers": [
+                        {"name": ":authority", "value": "api.example.com"},
+                        {"name": "Content-Type", "value": "application/json"}
+                    ],
+                    "postData": {"mimeType": "application/json", "text": "{\"name\": \"[John]\\\\\"}"}
+                }
+            },
+            {
+                "startedDateTime": "2024-12-18T08:00:01.000Z",
+                "request": {"method": "GET", "url": "https://api.example.com/users?page=2", "headers": []}
+            }
+        ]
+    }
+}
+
+
+def test_import_har_small_chunks():
+    """测试按很小的块读取HAR文件"""
+    print("=" * 80)
+    print("测试HAR流式导入")
+    print("=" * 80)
+
+    text = json.dumps(SAMPLE_HAR, indent=2, ensure_ascii=False)
+    expected_body = SAMPLE_HAR['log']['entries'][0]['request']['postData']['text']
+
+    for chunk_size in (1, 3, 16, 65536):
+        items = list(import_har(io.StringIO(text), chunk_size=chunk_size))
+        assert len(items) == 2
+        assert items[0]['method'] == 'POST'
+        assert items[0]['body'] == expected_body
+        assert items[0]['headers'] == {'Content-Type': 'application/json'}
+        assert items[1]['url'] == 'https://api.example.com/users?page=2'
+
+    print(f"导入结果: {items[0]}")
+    print("\n✓ HAR流式导入测试通过")
+    return True
+
+
+def test_export_har_roundtrip():
+    """测试导出后再导入"""
+    print("\n" + "=" * 80)
+    print("测试HAR导出")
+    print("=" * 80)
+
+    history = [
+        {
+            'method': 'PUT',
+            'url': 'https://api.example.com/items/1',
+            'headers': {'Content-Type': 'application/json', 'Authorization': 'Bearer token123'},
+            'body': '{"name": "张三"}',
+            'timeout': 30,
+            'timestamp': '2024-12-18 16:00:00'
+        }
+    ]
+
+    output = io.StringIO()
+    count = export_har(iter(history), output)
+    assert count == 1
+
+    document = json.loads(output.getvalue())
+    assert document['log']['version'] == '1.2'
+    assert document['log']['entries'][0]['request']['postData']['mimeType'] == 'application/json'
+
+    items = list(import_har(io.StringIO(output.getvalue())))
+    assert items[0]['method'] == 'PUT'
+    assert items[0]['headers'] == history[0]['headers']
+    assert items[0]['body'] == history[0]['body']
+    assert items[0]['timestamp'] == history[0]['timestamp']
+
+    print("\n✓ HAR导出测试通过")
+    return True
+
+
+def test_har_without_entries():
+    """测试没有entries的HAR文件"""
+    print("\n" + "=" * 80)
+    print("测试空HAR文件")
+    print("=" * 80)
+
+    entries = list(iter_har_entries(io.StringIO('{"log": {"version": "1.2", "entries": []}}')))
+    assert entries == []
+
+    print("\n✓ 空HAR文件测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试 HAR 导入导出\n")
+
+    tests = [
+        test_import_har_small_chunks,
+        test_export_har_roundtrip,
+        test_har_without_entries
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
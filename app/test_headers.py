@@ -0,0 +1,123 @@
+"""
+测试多值请求头容器
+"""
+import sys
+import io
+import json
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from headers import Headers, header_data
+from http_parser import HTTPRequestParser
+from har import har_entry_to_history, history_to_har_entry
+
+
+def test_multi_value_headers():
+    """测试重复字段和不区分大小写的查找"""
+    print("=" * 80)
+    print("测试多值请求头")
+    print("=" * 80)
+
+    headers = Headers([
+        ('Set-Cookie', 'a=1'),
+        ('Content-Type', 'text/html'),
+        ('set-cookie', 'b=2'),
+        ('Via', '1.1 proxy-a'),
+        ('VIA', '1.1 proxy-b'),
+    ])
+    print(f"请求头: {headers!r}")
+
+    assert len(headers) == 5
+    assert headers['content-type'] == 'text/html'
+    assert 'CONTENT-TYPE' in headers
+    assert headers.get_all('SET-COOKIE') == ['a=1', 'b=2']
+    assert headers.keys() == ['Set-Cookie', 'Content-Type', 'Via']
+    assert headers.items()[2] == ('set-cookie', 'b=2')
+
+    headers['Via'] = '1.1 proxy-c'
+    assert headers.get_all('via') == ['1.1 proxy-c']
+    del headers['content-type']
+    assert headers.get('Content-Type') is None
+    assert headers.get_all('set-cookie') == ['a=1', 'b=2']
+
+    # 发送时合并为合法的单个值，不含换行
+    merged = headers.to_dict()
+    print(f"发送时合并: {merged}")
+    assert merged == {'Set-Cookie': 'a=1, b=2', 'Via': '1.1 proxy-c'}
+    assert not any('\n' in value for value in merged.values())
+
+    # 保存时保留重复字段，读回后不变
+    saved = json.loads(json.dumps(header_data(headers)))
+    print(f"保存格式: {saved}")
+    assert saved == [['Set-Cookie', 'a=1'], ['set-cookie', 'b=2'], ['Via', '1.1 proxy-c']]
+    assert Headers(saved) == headers
+    assert header_data({'Accept': '*/*'}) == {'Accept': '*/*'}
+
+    print("\n✓ 多值请求头测试通过")
+    return True
+
+
+def test_parser_keeps_repeated_headers():
+    """测试解析器保留重复的请求头"""
+    print("\n" + "=" * 80)
+    print("测试解析器保留重复请求头")
+    print("=" * 80)
+
+    result = HTTPRequestParser.parse(
+        "GET /api HTTP/1.1\r\n"
+        "HOST: api.example.com\r\n"
+        "Accept: text/html\r\n"
+        "Accept: application/json\r\n"
+        "\r\n"
+    )
+    print(f"请求头: {result['headers'].items()}")
+
+    assert result['url'] == 'http://api.example.com/api'
+    assert result['headers'].get_all('accept') == ['text/html', 'application/json']
+    assert result['headers'].to_dict()['Accept'] == 'text/html, application/json'
+
+    # HAR 导入导出保留重复字段
+    item = har_entry_to_history({'request': {'method': 'GET', 'url': 'https://a/', 'headers': [
+        {'name': ':authority', 'value': 'a'},
+        {'name': 'Cookie', 'value': 'a=1'},
+        {'name': 'Cookie', 'value': 'b=2'},
+    ]}})
+    assert item['headers'] == [['Cookie', 'a=1'], ['Cookie', 'b=2']]
+    exported = history_to_har_entry(item)['request']['headers']
+    assert exported == [{'name': 'Cookie', 'value': 'a=1'}, {'name': 'Cookie', 'value': 'b=2'}]
+
+    print("\n✓ 解析器保留重复请求头测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试多值请求头容器\n")
+
+    tests = [
+        test_multi_value_headers,
+        test_parser_keeps_repeated_headers
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
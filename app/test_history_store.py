@@ -0,0 +1,140 @@
+"""
+测试历史记录后台持久化
+"""
+import sys
+import io
+import os
+import json
+import tempfile
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from history_store import HistoryWriter, iter_history_pages, load_history, write_history_atomic
+
+
+def test_writer_debounces_mutations():
+    """测试多次修改被合并为一次写入"""
+    print("=" * 80)
+    print("测试历史记录合并写入")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'history.json')
+        writer = HistoryWriter(path, delay=0.2)
+
+        history = []
+        for i in range(20):
+            history.insert(0, {'method': 'GET', 'url': f'https://example.com/{i}'})
+            writer.schedule(history)
+
+        assert writer.flush(timeout=5)
+        print(f"写入次数: {writer.write_count}")
+
+        loaded = load_history(path)
+        assert len(loaded) == 20
+        assert loaded[0]['url'] == 'https://example.com/19'
+        assert writer.write_count == 1
+
+        writer.close()
+
+    print("\n✓ 历史记录合并写入测试通过")
+    return True
+
+
+def test_close_flushes_pending():
+    """测试关闭时写入未保存的数据"""
+    print("\n" + "=" * 80)
+    print("测试关闭时写入")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'history.json')
+        writer = HistoryWriter(path, delay=60)
+        writer.schedule([{'method': 'POST', 'url': 'https://example.com/api'}])
+        writer.close()
+
+        loaded = load_history(path)
+        assert loaded == [{'method': 'POST', 'url': 'https://example.com/api'}]
+
+    print("\n✓ 关闭时写入测试通过")
+    return True
+
+
+def test_atomic_write_keeps_old_file_on_error():
+    """测试写入失败时保留原文件"""
+    print("\n" + "=" * 80)
+    print("测试原子写入")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'history.json')
+        write_history_atomic(path, [{'url': 'old'}])
+
+        try:
+            write_history_atomic(path, [{'url': object()}])
+        except TypeError:
+            pass
+
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == [{'url': 'old'}]
+        assert os.listdir(temp_dir) == ['history.json']
+
+    print("\n✓ 原子写入测试通过")
+    return True
+
+
+def test_iter_history_pages():
+    """测试分页读取历史记录"""
+    print("\n" + "=" * 80)
+    print("测试分页读取")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'history.json')
+        history = [{'method': 'GET', 'url': f'https://example.com/{i}'} for i in range(45)]
+        write_history_atomic(path, history)
+
+        pages = list(iter_history_pages(path, page_size=20))
+        print(f"每页数量: {[len(page) for page in pages]}")
+        assert [len(page) for page in pages] == [20, 20, 5]
+        assert [item for page in pages for item in page] == history
+
+        assert list(iter_history_pages(os.path.join(temp_dir, 'missing.json'))) == []
+
+    print("\n✓ 分页读取测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试历史记录持久化\n")
+
+    tests = [
+        test_writer_debounces_mutations,
+        test_close_flushes_pending,
+        test_atomic_write_keeps_old_file_on_error,
+        test_iter_history_pages
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
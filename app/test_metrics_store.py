@@ -0,0 +1,101 @@
+"""
+测试接口耗时时序存储
+"""
+import sys
+import io
+import os
+import tempfile
+import time
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from metrics_store import MetricsStore, endpoint_key, daily_percentiles, downsample
+
+
+def test_endpoint_key():
+    """测试接口标识归并"""
+    print("=" * 80)
+    print("测试接口标识")
+    print("=" * 80)
+
+    key = endpoint_key('get', 'https://api.example.com/users/123/orders?page=2')
+    print(f"接口标识: {key}")
+    assert key == 'GET https://api.example.com/users/{id}/orders'
+    assert endpoint_key('GET', 'https://api.example.com/users/456/orders') == key
+    assert endpoint_key('DELETE', 'https://api.example.com/items/550e8400-e29b-41d4-a716-446655440000') == \
+        'DELETE https://api.example.com/items/{id}'
+
+    print("\n✓ 接口标识测试通过")
+    return True
+
+
+def test_record_and_query():
+    """测试追加记录和按接口读取"""
+    print("\n" + "=" * 80)
+    print("测试耗时记录")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = MetricsStore(temp_dir)
+        key = 'GET https://api.example.com/users/{id}'
+        base = time.time() - 86400
+        for i in range(100):
+            store.record(key, 200 if i % 10 else 500, i, i + 10, 1024, timestamp=base + i)
+            store.record('POST https://api.example.com/login', 200, 5, 8, 64, timestamp=base + i)
+
+        # 模拟写入中断留下的不完整记录
+        with open(store.samples_path, 'ab') as f:
+            f.write(b'\x00\x01')
+
+        reopened = MetricsStore(temp_dir)
+        assert sorted(reopened.endpoints()) == sorted([key, 'POST https://api.example.com/login'])
+
+        samples = reopened.samples(key)
+        assert len(samples) == 100
+        assert samples[0].status == 500
+        assert samples[99].total_ms == 109
+        assert len(reopened.samples(key, since=base + 50)) == 50
+
+        rows = daily_percentiles(samples)
+        print(f"每日分位数: {rows}")
+        assert sum(row['count'] for row in rows) == 100
+
+        points = downsample(samples, max_points=10)
+        assert len(points) == 10
+        assert points[0][1] == 10 and points[-1][3] == 109
+
+    print("\n✓ 耗时记录测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试接口耗时时序存储\n")
+
+    tests = [
+        test_endpoint_key,
+        test_record_and_query
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
@@ -0,0 +1,152 @@
+"""
+测试 multipart/form-data 编码与解析
+"""
+import sys
+import io
+import os
+import tempfile
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from multipart_form import MultipartEncoder, MultipartError, FormField, iter_multipart, get_boundary, parse_form_spec
+from http_parser import HTTPRequestParser, parse_curl_command
+
+
+def test_streaming_encoder_roundtrip():
+    """测试流式编码器的长度计算，并用解析器还原各部分"""
+    print("=" * 80)
+    print("测试 multipart 流式编码")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        file_path = os.path.join(base_dir, 'photo.jpg')
+        payload = os.urandom(200000) + b'\r\n--not-a-boundary\r\n'
+        with open(file_path, 'wb') as f:
+            f.write(payload)
+
+        encoder = MultipartEncoder([
+            FormField('title', '你好 "world"'),
+            FormField('avatar', path=file_path, filename='photo.jpg', content_type='image/jpeg'),
+        ], chunk_size=4096)
+        chunks = list(encoder)
+        body = b''.join(chunks)
+        print(f"Content-Type: {encoder.content_type}")
+        print(f"Content-Length: {len(encoder)}, 分块数: {len(chunks)}")
+
+        assert len(encoder) == len(body)
+        assert max(len(chunk) for chunk in chunks) <= 4096
+        assert get_boundary(encoder.content_type) == encoder.boundary
+
+        parts = list(iter_multipart(body, encoder.boundary))
+        assert [part.name for part in parts] == ['title', 'avatar']
+        assert parts[0].text == '你好 "world"'
+        assert parts[1].filename == 'photo.jpg'
+        assert parts[1].content_type == 'image/jpeg'
+        assert bytes(parts[1].content) == payload
+        # 内容是原始数据的切片，没有复制
+        assert isinstance(parts[1].content, memoryview) and parts[1].content.obj is body
+
+        # 计算长度之后文件被截短
+        with open(file_path, 'wb') as f:
+            f.write(b'short')
+        try:
+            b''.join(encoder)
+            assert False, "文件大小变化应当报错"
+        except MultipartError as e:
+            print(f"文件被修改: {e}")
+
+    try:
+        list(iter_multipart(b'--x\r\nContent-Disposition: form-data; name="a"\r\n\r\nv', 'x'))
+        assert False, "缺少结束分隔行应当报错"
+    except MultipartError:
+        pass
+
+    print("\n✓ multipart 流式编码测试通过")
+    return True
+
+
+def test_curl_form_upload():
+    """测试 curl -F 文件上传和 multipart 表单格式化"""
+    print("\n" + "=" * 80)
+    print("测试 cURL -F 文件上传")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        with open(os.path.join(base_dir, 'report.csv'), 'w', encoding='utf-8') as f:
+            f.write('a,b\n1,2\n')
+
+        result = parse_curl_command(
+            "curl https://api.example.com/upload -F 'file=@report.csv;type=text/plain' "
+            "-F 'note=hello' --form-string 'raw=@literal'",
+            base_dir
+        )
+        print(f"请求体:\n{result['body']}")
+
+        file_path = os.path.join(base_dir, 'report.csv')
+        assert result['method'] == 'POST'
+        assert result['headers']['Content-Type'] == 'multipart/form-data'
+        assert result['body'].splitlines() == [f'file=@{file_path};type=text/plain', 'note=hello', 'raw="@literal"']
+
+        form = HTTPRequestParser.format_form_data(result['body'], result['headers']['Content-Type'])
+        assert form == {'file': f'@{file_path}', 'note': 'hello', 'raw': '@literal'}
+
+    field = FormField('q', 'say "hi";type=x')
+    assert parse_form_spec(field.to_spec()).value == field.value
+
+    raw = (
+        "POST /upload HTTP/1.1\r\n"
+        "Host: example.com\r\n"
+        "Content-Type: multipart/form-data; boundary=\"XyZ\"\r\n"
+        "\r\n"
+        "--XyZ\r\n"
+        "Content-Disposition: form-data; name=\"doc\"; filename=\"a.txt\"\r\n"
+        "\r\n"
+        "line1\r\n\r\nline2\r\n"
+        "--XyZ\r\n"
+        "Content-Disposition: form-data; name=\"note\"\r\n"
+        "\r\n"
+        "hi\r\n"
+        "--XyZ--\r\n"
+    )
+    parsed = HTTPRequestParser.parse(raw)
+    form = HTTPRequestParser.format_form_data(parsed['body'], parsed['headers']['Content-Type'])
+    print(f"解析原始 multipart 请求: {form}")
+    assert form == {'doc': '<文件: a.txt, 14 字节>', 'note': 'hi'}
+
+    assert not parse_curl_command("curl -d a=1 -F b=2 https://example.com")['success']
+
+    print("\n✓ cURL -F 文件上传测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试 multipart/form-data 编码与解析\n")
+
+    tests = [
+        test_streaming_encoder_roundtrip,
+        test_curl_form_upload
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
@@ -3,7 +3,7 @@
 """
 import sys
 import io
-from http_parser import HTTPRequestParser
+from http_parser import HTTPRequestParser, HTTPParseError, ParsedRequest, ParseError, IncrementalRequestParser, iter_http_requests
 
 # 设置标准输出编码为UTF-8
 if sys.platform == 'win32':
@@ -163,6 +163,195 @@ def test_invalid_request():
     return False
 
 
+def test_iter_requests_bulk():
+    """测试批量流式解析"""
+    raw_dump = (
+        b"GET /api/users HTTP/1.1\r\n"
+        b"Host: api.example.com\r\n"
+        b"\r\n"
+        b"POST /api/login HTTP/1.1\r\n"
+        b"Host: api.example.com:443\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Content-Length: 18\r\n"
+        b"\r\n"
+        b"{\"user\": \"a\r\n\r\nb\"}\r\n"
+        b"\r\n"
+        b"PUT /api/notes/1 HTTP/1.1\n"
+        b"Host: api.example.com\n"
+        b"\n"
+        + "第一行\n\n第二行\n".encode('utf-8') +
+        b"\n"
+        b"DELETE /api/notes/1 HTTP/1.1\n"
+        b"Host: api.example.com"
+    )
+
+    print("\n" + "=" * 80)
+    print("测试批量流式解析")
+    print("=" * 80)
+
+    for chunk_size in (1, 7, 64 * 1024):
+        results = list(iter_http_requests(io.BytesIO(raw_dump), chunk_size=chunk_size))
+        assert [r['method'] for r in results] == ['GET', 'POST', 'PUT', 'DELETE']
+        assert all(r['success'] for r in results)
+        assert results[0]['body'] == ''
+        assert results[1]['url'] == 'https://api.example.com:443/api/login'
+        assert results[1]['body'] == '{"user": "a\r\n\r\nb"}'
+        assert results[2]['body'] == '第一行\n\n第二行'
+        assert results[3]['url'] == 'http://api.example.com/api/notes/1'
+
+    for result in results:
+        print(f"{result['method']} {result['url']} 请求体: {result['body']!r}")
+
+    print("\n✓ 批量流式解析测试通过")
+    return True
+
+
+def test_parse_crlf_and_folding():
+    """测试CRLF换行和续行请求头"""
+    raw_request = (
+        "POST /api/notes HTTP/1.1\r\n"
+        "Host: api.example.com\r\n"
+        "X-Long-Header: part1\r\n"
+        "  part2\r\n"
+        "\tpart3\r\n"
+        "Content-Type: text/plain\r\n"
+        "\r\n"
+        "第一段\r\n"
+        "\r\n"
+        "第二段\r\n"
+    )
+
+    print("\n" + "=" * 80)
+    print("测试CRLF换行和续行请求头")
+    print("=" * 80)
+
+    result = HTTPRequestParser.parse(raw_request)
+    print(f"请求头: {result['headers']}")
+    print(f"请求体: {result['body']!r}")
+
+    assert result['success']
+    assert result['headers'] == {
+        'Host': 'api.example.com',
+        'X-Long-Header': 'part1 part2 part3',
+        'Content-Type': 'text/plain'
+    }
+    assert result['body'] == '第一段\r\n\r\n第二段'
+
+    print("\n✓ CRLF和续行测试通过")
+    return True
+
+
+def test_parse_bytes_binary_body():
+    """测试字节级解析二进制请求体"""
+    body = bytes(range(256))
+    raw = (
+        b"PUT /upload HTTP/1.1\n"
+        b"Host: files.example.com\n"
+        b"Content-Length: 256\n"
+        b"\n" + body + b"GET /next HTTP/1.1\n\n"
+    )
+
+    print("\n" + "=" * 80)
+    print("测试字节级解析")
+    print("=" * 80)
+
+    request = HTTPRequestParser.parse_bytes(memoryview(raw))
+    print(f"请求头: {request.headers()}")
+    print(f"请求体长度: {len(request.body)}")
+
+    assert request.method == 'PUT'
+    assert request.get_header('content-length') == '256'
+    assert request.content_length == 256
+    assert request.body.tobytes() == body
+    assert request.body.obj is raw
+
+    next_request = HTTPRequestParser.parse_bytes(raw, request.end)
+    assert next_request.target == '/next'
+    assert len(next_request.body) == 0
+
+    try:
+        HTTPRequestParser.parse_bytes(b"\r\n\r\n")
+        assert False, "空数据应当报错"
+    except HTTPParseError as e:
+        print(f"空数据: {e}")
+
+    print("\n✓ 字节级解析测试通过")
+    return True
+
+
+def test_result_objects():
+    """测试解析结果对象的字典式访问"""
+    print("\n" + "=" * 80)
+    print("测试解析结果对象")
+    print("=" * 80)
+
+    result = HTTPRequestParser.parse("POST /api HTTP/1.1\nHost: example.com\n\nhello")
+    print(f"结果: {result!r}")
+
+    assert isinstance(result, ParsedRequest)
+    assert result['method'] == result.method == 'POST'
+    assert result.get('body') == 'hello'
+    assert result.get('timeout', 30) == 30
+    assert result['success'] and not result['error']
+    assert result.to_dict() == {
+        'method': 'POST',
+        'path': '/api',
+        'url': 'http://example.com/api',
+        'protocol': 'HTTP/1.1',
+        'headers': {'Host': 'example.com'},
+        'body': 'hello',
+        'success': True,
+        'error': ''
+    }
+    assert not hasattr(result, '__dict__')
+
+    error = HTTPRequestParser.parse("not a request")
+    assert isinstance(error, ParseError)
+    assert not error['success'] and not error
+    assert error['error'] == '无法解析请求行'
+    assert error['headers'] == {}
+
+    print("\n✓ 解析结果对象测试通过")
+    return True
+
+
+def test_incremental_parser():
+    """测试实时预览的增量解析：只修改请求头时复用请求体"""
+    print("\n" + "=" * 80)
+    print("测试增量解析")
+    print("=" * 80)
+
+    parser = IncrementalRequestParser()
+    body = '{"data": "' + 'x' * 100000 + '"}\n\n{"more": 1}'
+    text = "POST /api HTTP/1.1\r\nHost: example.com\r\n\r\n" + body
+
+    result = parser.parse(text)
+    assert not parser.last_parse_was_partial
+    assert result['body'] == body.strip()
+
+    # 修改请求头，请求体不变
+    edited = text.replace("Host: example.com", "Host: example.com\r\nX-Trace: 1")
+    result = parser.parse(edited)
+    print(f"只修改请求头: partial={parser.last_parse_was_partial}")
+    assert parser.last_parse_was_partial
+    assert result['headers']['X-Trace'] == '1'
+    assert result['body'] == body.strip()
+    assert result == HTTPRequestParser.parse(edited)
+
+    # 删除分隔空行后，请求体中的空行成为新的边界，必须完整解析
+    merged = edited.replace("X-Trace: 1\r\n\r\n", "X-Trace: 1\r\n", 1)
+    result = parser.parse(merged)
+    assert not parser.last_parse_was_partial
+    assert result == HTTPRequestParser.parse(merged)
+
+    # 请求行出错时返回错误，之后仍能恢复
+    assert not parser.parse("bad" + merged)['success']
+    assert parser.parse(merged)['success']
+
+    print("\n✓ 增量解析测试通过")
+    return True
+
+
 if __name__ == "__main__":
     print("\n开始测试 HTTP 请求解析器\n")
 
@@ -170,7 +359,12 @@ if __name__ == "__main__":
         test_parse_get_request,
         test_parse_post_request,
         test_parse_https_request,
-        test_invalid_request
+        test_invalid_request,
+        test_iter_requests_bulk,
+        test_parse_crlf_and_folding,
+        test_parse_bytes_binary_body,
+        test_result_objects,
+        test_incremental_parser
     ]
 
     passed = 0
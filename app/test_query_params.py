@@ -0,0 +1,109 @@
+"""
+测试URL查询参数的增量同步
+"""
+import sys
+import io
+import time
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from query_params import QueryParamsModel
+from http_parser import HTTPRequestParser
+
+
+def test_incremental_url_sync():
+    """测试编辑URL时只重新解析变化的片段"""
+    print("=" * 80)
+    print("测试URL增量同步")
+    print("=" * 80)
+
+    model = QueryParamsModel('https://api.example.com/search?q=test&tag=a&tag=b#top')
+    assert model.pairs() == [('q', 'test'), ('tag', 'a'), ('tag', 'b')]
+
+    # 在第二个参数中输入一个字符：只有这一行变化
+    change = model.set_url('https://api.example.com/search?q=test&tag=ab&tag=b#top')
+    print(f"修改一个字符: {change}")
+    assert change == (1, 1, [('tag', 'ab')])
+
+    # 输入 & 拆出新参数
+    change = model.set_url('https://api.example.com/search?q=test&tag=a&b&tag=b#top')
+    assert change == (1, 1, [('tag', 'a'), ('b', '')])
+    assert model.pairs() == [('q', 'test'), ('tag', 'a'), ('b', ''), ('tag', 'b')]
+
+    # 修改路径和片段不影响参数
+    assert model.set_url('https://api.example.com/v2/search?q=test&tag=a&b&tag=b') is None
+
+    # 编辑表格：只重新编码被编辑的参数，其余参数保持原样
+    url = model.set_param(2, 'name', '张 三&李')
+    print(f"编辑表格后的URL: {url}")
+    assert url == 'https://api.example.com/v2/search?q=test&tag=a&name=%E5%BC%A0%20%E4%B8%89%26%E6%9D%8E&tag=b'
+    assert model.pairs()[2] == ('name', '张 三&李')
+    assert model.remove_param(0) == 'https://api.example.com/v2/search?tag=a&name=%E5%BC%A0%20%E4%B8%89%26%E6%9D%8E&tag=b'
+
+    assert model.set_url('https://api.example.com/v2/search') == (0, 3, [])
+    assert model.pairs() == []
+
+    # 数百个参数时逐字符输入
+    url = 'https://api.example.com/search?' + '&'.join(f'filter{i}=value{i}' for i in range(500))
+    model = QueryParamsModel(url)
+    start = time.perf_counter()
+    for i in range(200):
+        url = url + 'x'
+        change = model.set_url(url)
+        assert change[0] == 499 and change[1] == 1
+    elapsed = time.perf_counter() - start
+    print(f"500 个参数时每次输入耗时: {elapsed / 200 * 1000:.3f} ms")
+    assert model.pairs()[-1] == ('filter499', 'value499' + 'x' * 200)
+    assert model.pairs() == QueryParamsModel(url).pairs()
+
+    print("\n✓ URL增量同步测试通过")
+    return True
+
+
+def test_format_query_string_duplicates():
+    """测试查询字符串格式化保留重复参数"""
+    print("\n" + "=" * 80)
+    print("测试查询字符串重复参数")
+    print("=" * 80)
+
+    result = HTTPRequestParser.format_query_string("tag=a&page=1&tag=b&tag=c&empty=")
+    print(f"格式化结果: {result}")
+
+    assert result == {'tag': ['a', 'b', 'c'], 'page': '1', 'empty': ''}
+    assert list(result) == ['tag', 'page', 'empty']
+
+    print("\n✓ 查询字符串重复参数测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试URL查询参数同步\n")
+
+    tests = [
+        test_incremental_url_sync,
+        test_format_query_string_duplicates
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
@@ -0,0 +1,206 @@
+"""
+测试请求引擎的请求体准备
+"""
+import sys
+import io
+import os
+import tempfile
+import gzip
+import zlib
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from request_engine import (
+    file_body, with_progress, guess_content_type, prepare_body, check_json, compress_body,
+    StreamBody, SizedStreamBody, RequestBodyError
+)
+from headers import Headers
+from multipart_form import MultipartEncoder, FormField
+
+
+def test_file_body_streaming():
+    """测试文件请求体按块读取并报告上传进度"""
+    print("=" * 80)
+    print("测试文件请求体")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        path = os.path.join(base_dir, 'artifact.tar.gz')
+        payload = os.urandom(1024 * 1024 + 123)
+        with open(path, 'wb') as f:
+            f.write(payload)
+
+        reports = []
+        body = file_body(path, chunk_size=64 * 1024)
+        body = with_progress(body, lambda sent, total, elapsed: reports.append((sent, total)))
+        print(f"Content-Length: {len(body)}")
+        assert isinstance(body, SizedStreamBody) and len(body) == len(payload)
+
+        chunks = list(body)
+        assert b''.join(chunks) == payload
+        assert max(len(chunk) for chunk in chunks) == 64 * 1024
+        print(f"进度回调: {len(reports)} 次, 最后一次 {reports[-1]}")
+        assert reports[-1] == (len(payload), len(payload))
+
+        # 分块传输：没有长度，requests 会使用 Transfer-Encoding: chunked
+        chunked = file_body(path, chunked=True)
+        assert not hasattr(chunked, '__len__')
+        assert sum(len(chunk) for chunk in chunked) == len(payload)
+
+        assert guess_content_type(os.path.join(base_dir, 'data.json')) == 'application/json'
+        assert guess_content_type(os.path.join(base_dir, 'data.unknownext')) == 'application/octet-stream'
+
+    try:
+        file_body(os.path.join(tempfile.gettempdir(), 'missing-body-file.bin'))
+        assert False, "文件不存在时应当报错"
+    except OSError as e:
+        print(f"文件不存在: {e}")
+
+    print("\n✓ 文件请求体测试通过")
+    return True
+
+
+def test_with_progress_wraps_streams():
+    """测试为 multipart 编码器添加进度，普通请求体保持不变"""
+    print("\n" + "=" * 80)
+    print("测试上传进度包装")
+    print("=" * 80)
+
+    reports = []
+    encoder = MultipartEncoder([FormField('a', 'x' * 1000)])
+    body = with_progress(encoder, lambda sent, total, elapsed: reports.append((sent, total)))
+    assert len(body) == len(encoder)
+    assert b''.join(body) == encoder.to_bytes()
+    assert reports[-1] == (len(encoder), len(encoder))
+
+    body = with_progress(iter([b'ab', b'cd']), lambda *args: reports.append(args[:2]))
+    assert isinstance(body, StreamBody) and b''.join(body) == b'abcd'
+    assert reports[-1] == (4, None)
+
+    for plain in (b'raw', 'text', {'k': 1}, None):
+        assert with_progress(plain, print) is plain
+
+    print("\n✓ 上传进度包装测试通过")
+    return True
+
+
+def test_prepare_body_byte_exact():
+    """测试请求体按原文编码发送，JSON 不被重新序列化"""
+    print("\n" + "=" * 80)
+    print("测试请求体准备")
+    print("=" * 80)
+
+    text = '{\n  "z": 1.50,\n  "a": [1e3, "中文"],  "n": 12345678901234567890\n}\n'
+    headers = Headers([('Accept', '*/*')])
+    prepared = prepare_body('POST', headers, text)
+    print(f"请求头: {prepared.headers.items()}")
+    assert prepared.data == text.encode('utf-8')
+    assert prepared.headers['Content-Type'] == 'application/json'
+    assert 'Content-Type' not in headers  # 编辑器中的请求头不被修改
+    assert prepared.size == len(text.encode('utf-8'))
+
+    # 按 charset 编码
+    prepared = prepare_body('PUT', Headers({'Content-Type': 'text/plain; charset=gbk'}), '你好')
+    assert prepared.data == '你好'.encode('gbk')
+
+    # 无效 JSON 也原样发送，只在界面上提示
+    prepared = prepare_body('POST', Headers({'Content-Type': 'application/json'}), '{"a": }')
+    assert prepared.data == b'{"a": }'
+    error = check_json('{"a": }')
+    print(f"JSON 检查: {error}")
+    assert error.startswith('第 1 行第 7 列')
+    assert check_json(text) is None
+
+    # multipart 表单在这里生成 boundary
+    prepared = prepare_body('POST', Headers({'Content-Type': 'multipart/form-data'}), 'a=1\nb=2')
+    assert prepared.headers['Content-Type'].startswith('multipart/form-data; boundary=')
+    assert b'name="b"' in prepared.data.to_bytes()
+
+    assert prepare_body('GET', headers, text).data is None
+    assert prepare_body('POST', headers, '  \n').data is None
+
+    try:
+        prepare_body('POST', headers, '', body_file=os.path.join(tempfile.gettempdir(), 'missing-body-file.bin'))
+        assert False, "文件不存在时应当报错"
+    except RequestBodyError as e:
+        print(f"文件不存在: {e}")
+
+    print("\n✓ 请求体准备测试通过")
+    return True
+
+
+def test_compress_body():
+    """测试请求体压缩和统计"""
+    print("\n" + "=" * 80)
+    print("测试请求体压缩")
+    print("=" * 80)
+
+    text = '{"rows": [' + ', '.join('{"id": %d, "status": "ok"}' % i for i in range(5000)) + ']}'
+    prepared = prepare_body('POST', Headers({'Content-Length': '999'}), text)
+
+    compressed, stats = compress_body(prepared, 'gzip')
+    print(f"gzip: {stats.to_dict()}")
+    assert gzip.decompress(compressed.data) == text.encode('utf-8')
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in compressed.headers
+    assert stats.original_size == len(text) and stats.compressed_size == len(compressed.data)
+    assert stats.ratio < 0.2
+
+    compressed, stats = compress_body(prepared, 'deflate')
+    assert zlib.decompress(compressed.data) == text.encode('utf-8')
+
+    # 流式请求体边发送边压缩，改用分块传输
+    with tempfile.TemporaryDirectory() as base_dir:
+        path = os.path.join(base_dir, 'rows.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        prepared = prepare_body('PUT', Headers(), '', body_file=path)
+        compressed, stats = compress_body(prepared, 'gzip')
+        assert not hasattr(compressed.data, '__len__')
+        assert gzip.decompress(b''.join(compressed.data)) == text.encode('utf-8')
+        assert stats.original_size == len(text)
+
+    assert compress_body(prepared, None) == (prepared, None)
+    try:
+        compress_body(prepare_body('POST', Headers(), 'x'), 'br')
+        assert False, "不支持的压缩方式应当报错"
+    except RequestBodyError as e:
+        print(f"不支持的压缩方式: {e}")
+
+    print("\n✓ 请求体压缩测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试请求引擎\n")
+
+    tests = [
+        test_file_body_streaming,
+        test_with_progress_wraps_streams,
+        test_prepare_body_byte_exact,
+        test_compress_body
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
@@ -0,0 +1,138 @@
+"""
+测试命令行请求执行器
+"""
+import sys
+import io
+import os
+import json
+import time
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from request_runner import main, load_history_requests, run_request, RunnerRequest, SourceError
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_runner_does_not_import_qt():
+    """测试命令行入口启动时不导入 PySide6 和 requests"""
+    print("=" * 80)
+    print("测试命令行启动")
+    print("=" * 80)
+
+    code = (
+        "import sys, json, request_runner; "
+        "print(json.dumps([m for m in ('PySide6', 'requests', 'http_parser') if m in sys.modules]))"
+    )
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=APP_DIR)
+    assert proc.returncode == 0, proc.stderr
+    loaded = json.loads(proc.stdout)
+    print(f"启动时导入的模块: {loaded}")
+    assert loaded == []
+
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, os.path.join(APP_DIR, '..', 'cli.py'), '--help'],
+                          capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"cli.py --help 用时: {elapsed:.1f} ms")
+    assert proc.returncode == 0 and '--history' in proc.stdout
+
+    print("\n✓ 命令行启动测试通过")
+    return True
+
+
+def test_load_sources_dry_run():
+    """测试从保存的请求、原始HTTP请求、curl 脚本和历史记录读取请求"""
+    print("\n" + "=" * 80)
+    print("测试读取请求")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        saved = os.path.join(base_dir, 'login.json')
+        with open(saved, 'w', encoding='utf-8') as f:
+            json.dump({'method': 'POST', 'url': 'https://api.example.com/login',
+                       'headers': {'Content-Type': 'application/json'},
+                       'body': '{"user": "张三"}', 'timeout': 5}, f, ensure_ascii=False)
+        raw = os.path.join(base_dir, 'requests.http')
+        with open(raw, 'w', encoding='utf-8') as f:
+            f.write("GET /a HTTP/1.1\r\nHost: example.com\r\n\r\n"
+                    "DELETE /b/1 HTTP/1.1\r\nHost: example.com\r\n\r\n")
+        script = os.path.join(base_dir, 'calls.sh')
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write("#!/bin/sh\ncurl https://example.com/x -H 'X-A: 1' -d 'a=1'\nnot-a-curl-line\n")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main(['--json', '--dry-run', saved, raw, script])
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        for result in results:
+            print(result)
+        assert code == 0
+        assert [(r['source'], r['method']) for r in results] == [
+            ('login.json', 'POST'), ('requests.http#0', 'GET'), ('requests.http#1', 'DELETE'), ('calls.sh#0', 'POST')
+        ]
+        assert results[0]['request_size'] == len('{"user": "张三"}'.encode('utf-8'))
+        assert results[1]['request_size'] == 0
+
+        # 文件不存在时记为失败，其余请求继续执行
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main(['--dry-run', os.path.join(base_dir, 'missing.json'), saved])
+        print(output.getvalue())
+        assert code == 1 and output.getvalue().count('\n') == 2
+
+        history = os.path.join(base_dir, 'history.json')
+        with open(history, 'w', encoding='utf-8') as f:
+            json.dump([{'method': 'GET', 'url': 'https://example.com/latest', 'headers': {}, 'body': ''}], f)
+        items = list(load_history_requests([0, 3], timeout=2, history_file=history))
+        assert isinstance(items[0], RunnerRequest) and items[0].url == 'https://example.com/latest'
+        assert items[0].timeout == 2
+        assert isinstance(items[1], SourceError)
+
+        # 没有会话时只能 dry_run
+        assert run_request(items[0], None, dry_run=True)['request_size'] == 0
+        try:
+            run_request(items[0], None)
+            assert False, '没有会话时应抛出 ValueError'
+        except ValueError:
+            pass
+
+    print("\n✓ 读取请求测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试命令行请求执行器\n")
+
+    tests = [
+        test_runner_does_not_import_qt,
+        test_load_sources_dry_run
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
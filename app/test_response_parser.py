@@ -0,0 +1,145 @@
+"""
+测试原始HTTP响应解析器
+"""
+import sys
+import io
+import gzip
+import json
+import zlib
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from http_parser import HTTPResponseParser, HTTPParseError
+
+
+def make_chunked(data: bytes, size: int) -> bytes:
+    """按固定大小生成分块传输编码的数据"""
+    chunks = [b'%x\r\n%s\r\n' % (len(data[i:i + size]), data[i:i + size]) for i in range(0, len(data), size)]
+    return b''.join(chunks) + b'0\r\nX-Checksum: abc\r\n\r\n'
+
+
+def test_chunked_gzip_streaming():
+    """测试分块传输 + gzip 压缩的流式解析"""
+    print("=" * 80)
+    print("测试分块传输和gzip解压")
+    print("=" * 80)
+
+    body = json.dumps({'message': '你好' * 200, 'items': list(range(100))}, ensure_ascii=False).encode('utf-8')
+    raw = (
+        b"HTTP/1.1 100 Continue\r\n\r\n"
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: application/json; charset=utf-8\r\n"
+        b"Transfer-Encoding: chunked\r\n"
+        b"Content-Encoding: gzip\r\n"
+        b"Set-Cookie: a=1\r\n"
+        b"Set-Cookie: b=2\r\n"
+        b"\r\n" + make_chunked(gzip.compress(body), 64)
+    )
+
+    response = HTTPResponseParser.parse(raw)
+    print(f"状态: {response.status_code} {response.reason}")
+    print(f"响应头: {response.headers.items()}")
+    print(f"解压后大小: {len(response.body)}")
+
+    assert response.status_code == 200
+    assert response.headers.get_all('set-cookie') == ['a=1', 'b=2']
+    assert response.body == body
+    assert response.complete
+    assert response.json()['items'][-1] == 99
+
+    # 每次只输入一个字节
+    parser = HTTPResponseParser()
+    streamed = b''.join(parser.feed(raw[i:i + 1]) for i in range(len(raw))) + parser.finish()
+    assert streamed == body
+
+    result = response.to_result()
+    assert result['status_code'] == 200 and result['response_time'] is None
+    assert result['text'].startswith('{"message": "你好')
+
+    print("\n✓ 分块传输和gzip解压测试通过")
+    return True
+
+
+def test_response_framing():
+    """测试 Content-Length、deflate、无响应体和错误输入"""
+    print("\n" + "=" * 80)
+    print("测试响应分帧")
+    print("=" * 80)
+
+    body = b'plain text body ' * 50
+    for wbits in (zlib.MAX_WBITS, -zlib.MAX_WBITS):
+        compressor = zlib.compressobj(wbits=wbits)
+        data = compressor.compress(body) + compressor.flush()
+        raw = b"HTTP/1.0 200 OK\nContent-Encoding: deflate\n\n" + data
+        assert HTTPResponseParser.parse(raw).body == body
+
+    response = HTTPResponseParser.parse(b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\nabcdef")
+    assert response.body == b'abc' and response.complete
+
+    response = HTTPResponseParser.parse(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nabc")
+    print(f"不完整响应: {response.body!r}, complete={response.complete}")
+    assert response.body == b'abc' and not response.complete
+
+    response = HTTPResponseParser.parse(b"HTTP/1.1 304 Not Modified\r\nETag: x\r\n\r\n")
+    assert response.status_code == 304 and response.body == b''
+
+    response = HTTPResponseParser.parse(b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\n\r\nxx", decompress=False)
+    assert response.body == b'xx' and not response.decoded
+
+    # 缺少 brotli 或未知的编码时保留原始响应体
+    saved = sys.modules.get('brotli')
+    sys.modules['brotli'] = None  # 使 import brotli 抛出 ImportError
+    try:
+        response = HTTPResponseParser.parse(b"HTTP/1.1 200 OK\r\nContent-Encoding: br\r\nContent-Length: 4\r\n\r\n\x8b\x01\x80x")
+    finally:
+        if saved is None:
+            del sys.modules['brotli']
+        else:
+            sys.modules['brotli'] = saved
+    print(f"缺少 brotli: {response.body!r}, decoded={response.decoded}")
+    assert response.status_code == 200 and response.body == b'\x8b\x01\x80x' and not response.decoded
+
+    response = HTTPResponseParser.parse(b"HTTP/1.1 200 OK\r\nContent-Encoding: x-custom\r\n\r\nraw")
+    assert response.body == b'raw' and not response.decoded
+
+    try:
+        HTTPResponseParser.parse(b"not a response\r\n\r\n")
+        assert False, "无效响应应当报错"
+    except HTTPParseError as e:
+        print(f"无效响应: {e}")
+
+    print("\n✓ 响应分帧测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试原始HTTP响应解析器\n")
+
+    tests = [
+        test_chunked_gzip_streaming,
+        test_response_framing
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
@@ -0,0 +1,166 @@
+"""
+测试请求模板和环境变量
+"""
+import sys
+import io
+import os
+import json
+import time
+import tempfile
+from contextlib import redirect_stdout
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from templates import Template, RequestTemplate, TemplateError, render_request
+from environments import EnvironmentStore
+from request_runner import RunnerRequest, SourceError, apply_variables, main, parse_variables
+
+
+def test_compiled_templates():
+    """测试模板编译、渲染、缺少变量和渲染速度"""
+    print("=" * 80)
+    print("测试请求模板")
+    print("=" * 80)
+
+    template = Template('{"a": {x}, "b": "{{ name }}", "c": {{name}}}}')
+    assert template.variables == ('name',)
+    assert template.render({'name': 'bob'}) == '{"a": {x}, "b": "bob", "c": bob}}'
+    assert Template('{{id}}').render({'id': 42}) == '42'
+    assert Template('plain {text}').render({}) == 'plain {text}'
+
+    try:
+        Template('{{a}}-{{b}}').render({'a': '1'})
+        assert False, '缺少变量时应抛出 TemplateError'
+    except TemplateError as e:
+        assert 'b' in str(e)
+
+    request = RequestTemplate(
+        'POST', '{{base_url}}/users/{{id}}?q={{query}}',
+        {'Authorization': 'Bearer {{token}}', 'Accept': 'application/json', 'X-{{header}}': '{{id}}'},
+        '{"id": {{id}}, "name": "{{name}}"}'
+    )
+    assert request.variables == ('base_url', 'id', 'query', 'token', 'header', 'name')
+    variables = {'base_url': 'https://api.example.com', 'id': '7', 'query': 'x',
+                 'token': 't0k', 'header': 'Trace', 'name': 'alice'}
+    rendered = request.render(variables)
+    assert rendered['url'] == 'https://api.example.com/users/7?q=x'
+    assert rendered['headers'].items() == [
+        ('Authorization', 'Bearer t0k'), ('Accept', 'application/json'), ('X-Trace', '7')
+    ]
+    assert rendered['body'] == '{"id": 7, "name": "alice"}'
+    assert request.missing({'id': '1'}) == ['base_url', 'query', 'token', 'header', 'name']
+
+    # 没有变量时不编译，原样返回
+    plain = render_request('GET', 'https://a/{x}', {'A': 'b'}, '', None)
+    assert plain['url'] == 'https://a/{x}'
+
+    # \{{ 为字面量 {{
+    assert Template(r'{"tpl": "\{{user}}", "id": {{id}}}').render({'id': 1}) == '{"tpl": "{{user}}", "id": 1}'
+    assert Template(r'\{{only}} escape').render({}) == '{{only}} escape'
+    escaped = render_request('POST', 'https://a', {}, r'\{{name}} {{id}}', {'id': '3'})
+    assert escaped['body'] == '{{name}} 3'
+
+    count = 100000
+    rows = [dict(variables, id=str(i)) for i in range(1000)]
+    start = time.perf_counter()
+    for i in range(count):
+        request.render(rows[i % 1000])
+    per_render = (time.perf_counter() - start) / count * 1e6
+    print(f"每次渲染请求耗时: {per_render:.2f} µs")
+    assert per_render < 100
+
+    print("\n✓ 请求模板测试通过")
+    return True
+
+
+def test_environments():
+    """测试环境存储和命令行变量替换"""
+    print("\n" + "=" * 80)
+    print("测试环境变量")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'environments.json')
+        store = EnvironmentStore(path)
+        assert store.names() == [] and store.active_variables() == {}
+
+        store.set('staging', {'base_url': 'https://staging.example.com', 'token': 's'})
+        store.set('prod', {'base_url': 'https://example.com', 'token': 'p'})
+        store.set_active('staging')
+        store.save()
+
+        store = EnvironmentStore(path)
+        assert store.names() == ['prod', 'staging']
+        assert store.active_variables()['token'] == 's'
+        store.rename('staging', 'stage')
+        assert store.active == 'stage'
+        store.remove('stage')
+        assert store.active is None
+        try:
+            store.set_active('missing')
+            assert False, '选择不存在的环境应抛出 KeyError'
+        except KeyError:
+            pass
+
+    variables = dict(store.get('prod'), **parse_variables(['id=5', 'token=override']))
+    request = RunnerRequest('GET', '{{base_url}}/items/{{id}}', {'Authorization': '{{token}}'}, source='a#0')
+    rendered = apply_variables(request, variables)
+    assert rendered.url == 'https://example.com/items/5'
+    assert rendered.headers.get('Authorization') == 'override'
+
+    missing = apply_variables(RunnerRequest('GET', '{{nope}}', {}, source='b#0'), variables)
+    assert isinstance(missing, SourceError) and 'nope' in missing.error
+
+    # 未选择环境时 {{x}} 原样发送（如 Mustache 模板请求体）
+    mustache = '{"template": "Hello {{x}}"}'
+    plain = apply_variables(RunnerRequest('POST', 'https://a/{{x}}', {'X-T': '{{x}}'}, mustache, source='c#0'), {})
+    assert plain.body == mustache and plain.url == 'https://a/{{x}}' and plain.headers.get('X-T') == '{{x}}'
+    assert render_request('POST', 'https://a', {}, mustache, None)['body'] == mustache
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'mustache.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'method': 'POST', 'url': 'https://example.com/render', 'body': mustache,
+                       'headers': {'Content-Type': 'application/json'}}, f)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main(['--dry-run', '--json', path])
+        result = json.loads(output.getvalue())
+        print(f"无环境时发送 {{{{x}}}} 请求体: 退出码 {code}, {result}")
+        assert code == 0 and result['error'] is None and result['request_size'] == len(mustache)
+
+    print("\n✓ 环境变量测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试请求模板和环境变量\n")
+
+    tests = [
+        test_compiled_templates,
+        test_environments
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
@@ -0,0 +1,145 @@
+"""
+测试性能追踪
+"""
+import sys
+import io
+import os
+import json
+import time
+import tempfile
+import threading
+
+# 设置标准输出编码为UTF-8
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+import tracing
+from tracing import span, traced, instant, record_span, async_begin, async_end
+from http_parser import HTTPRequestParser
+
+
+@traced('work', 'test')
+def work(value):
+    return value * 2
+
+
+def test_disabled_tracing_is_cheap():
+    """测试未启用时不记录事件，开销接近空操作"""
+    print("=" * 80)
+    print("测试未启用的追踪")
+    print("=" * 80)
+
+    tracing.disable()
+    tracing.clear()
+
+    with span('ignored', 'test', size=1) as s:
+        s.set(status=200)
+    instant('ignored')
+    assert work(2) == 4
+    HTTPRequestParser.parse("GET / HTTP/1.1\r\nHost: a\r\n\r\n")
+    assert tracing.get_events() == []
+
+    count = 200000
+    start = time.perf_counter()
+    for _ in range(count):
+        with span('noop'):
+            pass
+    per_call = (time.perf_counter() - start) / count * 1e9
+    print(f"未启用时每个区间耗时: {per_call:.0f} ns")
+    assert per_call < 5000
+
+    print("\n✓ 未启用的追踪测试通过")
+    return True
+
+
+def test_export_chrome_trace():
+    """测试嵌套区间、多线程、异步区间和 Chrome trace 导出"""
+    print("\n" + "=" * 80)
+    print("测试追踪导出")
+    print("=" * 80)
+
+    tracing.clear()
+    tracing.enable()
+    try:
+        before = time.perf_counter()
+        with span('outer', 'test', size=3) as outer:
+            work(1)
+            outer.set(status_code=200)
+        record_span('startup phase', before, time.perf_counter(), 'startup')
+
+        try:
+            with span('failing', 'test'):
+                raise ValueError('boom')
+        except ValueError:
+            pass
+
+        async_begin('request', 1, 'gui')
+        worker = threading.Thread(target=work, args=(5,), name='RequestThread')
+        worker.start()
+        worker.join()
+        async_end('request', 1, 'gui', status_code=201)
+        instant('first_paint', 'gui')
+        HTTPRequestParser.parse("GET / HTTP/1.1\r\nHost: a\r\n\r\n")
+    finally:
+        tracing.disable()
+
+    events = tracing.get_events()
+    by_name = {}
+    for event in events:
+        by_name.setdefault(event['name'], []).append(event)
+    print(f"记录的事件: {[(e['ph'], e['name']) for e in events]}")
+
+    outer, = by_name['outer']
+    inner = by_name['work'][0]
+    assert outer['args'] == {'size': 3, 'status_code': 200}
+    assert outer['ts'] <= inner['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+    assert by_name['failing'][0]['args'] == {'error': 'ValueError'}
+    assert by_name['work'][1]['tid'] != by_name['work'][0]['tid']
+    assert [e['ph'] for e in by_name['request']] == ['b', 'e']
+    assert by_name['startup phase'][0]['dur'] >= outer['dur']
+    assert 'HTTPRequestParser.parse' in by_name
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        path = os.path.join(base_dir, 'trace.json')
+        assert tracing.export_chrome_trace(path) == len(events)
+        with open(path, encoding='utf-8') as f:
+            trace = json.load(f)
+    thread_names = {e['args']['name'] for e in trace['traceEvents'] if e['name'] == 'thread_name'}
+    print(f"线程: {thread_names}")
+    assert 'RequestThread' in thread_names
+    assert all({'ph', 'ts', 'pid', 'tid'} <= set(e) for e in trace['traceEvents'] if e['ph'] != 'M')
+
+    tracing.clear()
+    print("\n✓ 追踪导出测试通过")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n开始测试性能追踪\n")
+
+    tests = [
+        test_disabled_tracing_is_cheap,
+        test_export_chrome_trace
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"\n✗ 测试失败: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"测试完成: {passed} 通过, {failed} 失败")
+    print("=" * 80)
+
+    if failed == 0:
+        print("\n所有测试都通过了！")
+    else:
+        print(f"\n有 {failed} 个测试失败")
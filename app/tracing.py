@@ -0,0 +1,242 @@
+"""
+轻量级性能追踪（不依赖 Qt）
+记录命名区间（span）和时间点，时间戳取自单调时钟；可导出为 Chrome trace-event JSON，
+在 Perfetto (ui.perfetto.dev) 或 chrome://tracing 中查看
+
+未启用时 span() 只做一次全局判断并返回共享的空对象，可以留在热路径中。
+设置环境变量 HTTP_TOOL_TRACE=<文件路径> 时在导入时启用，并在进程退出时导出到该文件。
+
+    from tracing import span, traced
+
+    with span('parse', size=len(text)):
+        ...
+
+    @traced('send_prepared', 'engine')
+    def send_prepared(...):
+        ...
+"""
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from functools import wraps
+from typing import Dict, List, Optional
+
+
+TRACE_ENV = 'HTTP_TOOL_TRACE'
+
+# 最多保留的事件数，超出后丢弃最早的事件，长时间运行时内存有上限
+MAX_EVENTS = 500_000
+
+_enabled = False
+_events: deque = deque(maxlen=MAX_EVENTS)
+_thread_names: Dict[int, str] = {}
+_pid = os.getpid()
+
+
+def _now_us(perf_time: Optional[float] = None) -> float:
+    """单调时钟的微秒数；perf_time 为 time.perf_counter() 的值"""
+    if perf_time is None:
+        return time.perf_counter_ns() / 1000
+    return perf_time * 1_000_000
+
+
+def _thread_id() -> int:
+    thread = threading.current_thread()
+    tid = thread.ident or 0
+    if tid not in _thread_names:
+        _thread_names[tid] = thread.name
+    return tid
+
+
+class _NullSpan:
+    """未启用追踪时使用的空区间"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """一个命名区间，退出时记录为 Chrome 的完整事件（ph=X）"""
+
+    __slots__ = ('name', 'category', 'args', 'start')
+
+    def __init__(self, name: str, category: str, args: Dict):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        _record('X', self.name, self.category, self.start, self.args, dur=end - self.start)
+        return False
+
+    def set(self, **args):
+        """在区间结束前补充参数（如响应状态码）"""
+        self.args.update(args)
+
+
+def _record(phase: str, name: str, category: str, ts: float, args: Optional[Dict] = None, **extra):
+    event = {'ph': phase, 'name': name, 'cat': category, 'ts': ts, 'pid': _pid, 'tid': _thread_id()}
+    if args:
+        event['args'] = args
+    event.update(extra)
+    # deque.append 是原子操作，多线程记录不需要加锁
+    _events.append(event)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    """开始记录"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """停止记录，已记录的事件保留"""
+    global _enabled
+    _enabled = False
+
+
+def clear():
+    """清空已记录的事件"""
+    _events.clear()
+
+
+def span(name: str, category: str = 'app', **args):
+    """
+    创建命名区间，用于 with 语句
+
+    Args:
+        name: 区间名称
+        category: 分类（app/gui/engine/parser 等），可在查看器中筛选
+        **args: 附加参数，显示在事件详情中
+
+    Returns:
+        Span，未启用时为共享的空对象
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = 'app'):
+    """把整个函数记录为一个区间的装饰器"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_span(name: str, start: float, end: float, category: str = 'app', **args):
+    """
+    记录已经结束的区间，用于追踪启用前开始的阶段（如导入模块）
+
+    Args:
+        start: 开始时的 time.perf_counter()
+        end: 结束时的 time.perf_counter()
+    """
+    if _enabled:
+        ts = _now_us(start)
+        _record('X', name, category, ts, args, dur=_now_us(end) - ts)
+
+
+def instant(name: str, category: str = 'app', **args):
+    """记录一个时间点（如首次绘制）"""
+    if _enabled:
+        _record('i', name, category, _now_us(), args, s='t')
+
+
+def async_begin(name: str, async_id: int, category: str = 'app', **args):
+    """
+    开始一个跨线程的异步区间（如从点击发送到显示响应）；
+    与 async_end 使用相同的 name、category 和 async_id
+    """
+    if _enabled:
+        _record('b', name, category, _now_us(), args, id=async_id)
+
+
+def async_end(name: str, async_id: int, category: str = 'app', **args):
+    """结束异步区间"""
+    if _enabled:
+        _record('e', name, category, _now_us(), args, id=async_id)
+
+
+def get_events() -> List[Dict]:
+    """已记录事件的副本"""
+    return list(_events)
+
+
+def export_chrome_trace(path: str) -> int:
+    """
+    导出为 Chrome trace-event JSON
+
+    Args:
+        path: 输出文件路径
+
+    Returns:
+        导出的事件数
+    """
+    events = get_events()
+    metadata = [
+        {'ph': 'M', 'name': 'thread_name', 'pid': _pid, 'tid': tid, 'args': {'name': thread_name}}
+        for tid, thread_name in list(_thread_names.items())
+    ]
+    metadata.append({'ph': 'M', 'name': 'process_name', 'pid': _pid, 'tid': 0, 'args': {'name': 'HTTP请求工具'}})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    return len(events)
+
+
+def _export_on_exit(path: str):
+    try:
+        export_chrome_trace(path)
+    except OSError:
+        pass
+
+
+def enable_from_env() -> Optional[str]:
+    """
+    设置了 HTTP_TOOL_TRACE 时启用追踪，并在进程退出时导出
+
+    Returns:
+        导出路径，未设置时为 None
+    """
+    path = os.environ.get(TRACE_ENV)
+    if path and not _enabled:
+        enable()
+        atexit.register(_export_on_exit, path)
+    return path or None
+
+
+enable_from_env()
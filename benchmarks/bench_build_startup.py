@@ -0,0 +1,181 @@
+"""
+编译产物启动测试
+对 scripts/build.py 中各编译配置的产物，在无显示器（offscreen）模式下各启动 N 次，
+报告冷启动和热启动耗时、产物体积以及窗口显示后的常驻内存
+
+启动耗时从创建进程开始计时，到程序写出首次绘制的报告为止，因此包含单文件模式的解压时间；
+第一次启动为冷启动（可选清空系统文件缓存和单文件解压缓存），其余取中位数作为热启动
+
+用法:
+    python scripts/build.py build --profile all          # 先编译全部配置
+    python benchmarks/bench_build_startup.py              # 测试已编译的全部配置
+    python benchmarks/bench_build_startup.py --profile onefile --profile onefile-cached --runs 10
+    sudo python benchmarks/bench_build_startup.py --drop-caches   # Linux：冷启动前清空文件缓存
+"""
+import sys
+import os
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import build
+
+
+DEFAULT_RUNS = 5
+
+# 单次启动的超时时间（秒）
+LAUNCH_TIMEOUT = 120
+
+# 等待启动报告时的轮询间隔（秒）
+POLL_INTERVAL = 0.002
+
+
+def artifact_size(profile: str) -> int:
+    """单文件产物为文件大小，独立目录产物为整个目录的大小"""
+    path = build.get_artifact_path(profile)
+    if build.BUILD_PROFILES[profile].get('onefile', build.USE_ONEFILE):
+        return path.stat().st_size
+    return sum(f.stat().st_size for f in path.parent.rglob('*') if f.is_file())
+
+
+def user_cache_dir() -> Path:
+    """Nuitka {CACHE_DIR} 对应的用户缓存目录"""
+    if sys.platform == 'win32':
+        return Path(os.environ.get('LOCALAPPDATA', Path.home() / 'AppData' / 'Local'))
+    if sys.platform == 'darwin':
+        return Path.home() / 'Library' / 'Caches'
+    return Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache'))
+
+
+def clear_onefile_cache():
+    """删除单文件模式的解压缓存，下次启动重新解压"""
+    shutil.rmtree(user_cache_dir() / 'PyHttpRequests', ignore_errors=True)
+
+
+def drop_file_caches() -> bool:
+    """清空 Linux 文件缓存（需要 root），其他平台不支持"""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        os.sync()
+        with open('/proc/sys/vm/drop_caches', 'w') as f:
+            f.write('3\n')
+        return True
+    except OSError:
+        return False
+
+
+def launch(executable: Path) -> Dict:
+    """
+    启动一次，等待程序写出首次绘制的报告
+
+    Returns:
+        程序的报告（import_ms、window_shown_ms、first_paint_ms、rss_kb），
+        加上从创建进程到报告写出的 wall_ms
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report_path = os.path.join(temp_dir, 'startup.json')
+        env = dict(os.environ)
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+        env['HTTP_TOOL_STARTUP_PROBE'] = report_path
+
+        # 错误输出写入临时文件，避免管道写满阻塞子进程
+        with tempfile.TemporaryFile() as stderr_file:
+            start = time.perf_counter()
+            proc = subprocess.Popen([str(executable)], env=env, cwd=str(executable.parent),
+                                    stdout=subprocess.DEVNULL, stderr=stderr_file)
+            wall_ms = None
+            while proc.poll() is None:
+                if wall_ms is None and os.path.exists(report_path):
+                    wall_ms = (time.perf_counter() - start) * 1000
+                if time.perf_counter() - start > LAUNCH_TIMEOUT:
+                    proc.kill()
+                    raise RuntimeError(f"{executable} 启动超时")
+                time.sleep(POLL_INTERVAL)
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', 'replace')
+        if not os.path.exists(report_path):
+            raise RuntimeError(f"{executable} 没有写出启动报告 (退出码 {proc.returncode}):\n{stderr[-2000:]}")
+        if wall_ms is None:
+            # 程序在一次轮询间隔内写出报告并退出
+            wall_ms = (time.perf_counter() - start) * 1000
+        with open(report_path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+    result['wall_ms'] = round(wall_ms, 1)
+    return result
+
+
+def measure(profile: str, runs: int, drop_caches: bool) -> Dict:
+    """测量一个配置：第一次为冷启动，其余取中位数"""
+    executable = build.get_artifact_path(profile)
+    if drop_caches and not drop_file_caches():
+        print("  ⚠ 无法清空文件缓存（需要 Linux 和 root 权限），冷启动只清空单文件解压缓存")
+    clear_onefile_cache()
+    results = [launch(executable) for _ in range(runs)]
+    warm = results[1:] or results
+    rss = [r['rss_kb'] for r in warm if r.get('rss_kb') is not None]
+    return {
+        'size_bytes': artifact_size(profile),
+        'cold': results[0],
+        'warm_wall_ms': round(statistics.median(r['wall_ms'] for r in warm), 1),
+        'warm_first_paint_ms': round(statistics.median(r['first_paint_ms'] for r in warm), 1),
+        'rss_kb': round(statistics.median(rss)) if rss else None
+    }
+
+
+def report(results: Dict[str, Dict]):
+    print("=" * 88)
+    print(f"{'配置':<16}{'体积':>10}{'冷启动':>12}{'热启动':>12}{'进程内首次绘制':>16}{'内存':>12}")
+    print("-" * 88)
+    for profile, result in results.items():
+        rss = f"{result['rss_kb'] / 1024:.1f} MB" if result['rss_kb'] else '-'
+        print(f"{profile:<18}{result['size_bytes'] / 1024 / 1024:>10.1f} MB"
+              f"{result['cold']['wall_ms']:>12.0f} ms{result['warm_wall_ms']:>12.0f} ms"
+              f"{result['warm_first_paint_ms']:>18.0f} ms{rss:>14}")
+    print("=" * 88)
+    print("冷/热启动: 从创建进程到首次绘制（含单文件解压）；进程内首次绘制: 从 Python 开始执行 main.py 算起")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="编译产物启动测试")
+    parser.add_argument("--profile", action="append", choices=list(build.BUILD_PROFILES),
+                        help="要测试的编译配置，可重复；默认测试所有已编译的配置")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"每个配置的启动次数 (默认: {DEFAULT_RUNS})")
+    parser.add_argument("--drop-caches", action="store_true", help="冷启动前清空系统文件缓存（Linux，需要 root）")
+    parser.add_argument("--output", help="把结果保存为 JSON 文件")
+    args = parser.parse_args()
+
+    profiles: List[str] = args.profile or [
+        profile for profile in build.BUILD_PROFILES if build.get_artifact_path(profile).exists()
+    ]
+    missing = [profile for profile in profiles if not build.get_artifact_path(profile).exists()]
+    if missing or not profiles:
+        print(f"没有找到编译产物: {', '.join(missing) or '全部配置'}")
+        print("请先运行: python scripts/build.py build --profile all")
+        sys.exit(1)
+
+    results: Dict[str, Dict] = {}
+    for profile in profiles:
+        print(f"测试 {profile}: {build.get_artifact_path(profile)}")
+        results[profile] = measure(profile, args.runs, args.drop_caches)
+    report(results)
+
+    if args.output:
+        output = {
+            'platform': platform.platform(),
+            'runs': args.runs,
+            'profiles': results
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"结果已保存: {args.output}")
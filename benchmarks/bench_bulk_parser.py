@@ -0,0 +1,74 @@
+"""
+批量原始请求解析性能测试
+生成包含大量原始HTTP请求的数据，测量 iter_http_requests 的吞吐量和内存占用
+"""
+import sys
+import os
+import io
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from http_parser import iter_http_requests
+
+
+# 单核吞吐量目标（请求/秒）
+TARGET_RPS = 10000
+
+REQUEST_TEMPLATE = (
+    b"POST /api/v1/items?id=%d HTTP/1.1\r\n"
+    b"Host: api.example.com\r\n"
+    b"User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64)\r\n"
+    b"Accept: application/json, text/plain, */*\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Cookie: session=2d7f3b9f-f256-4f1a-b338-ed4f2bc117c5\r\n"
+    b"Content-Length: 17\r\n"
+    b"\r\n"
+    b"{\"name\": \"value\"}\r\n"
+    b"\r\n"
+    b"GET /health HTTP/1.1\r\n"
+    b"Host: api.example.com\r\n"
+    b"Accept: */*\r\n"
+    b"\r\n"
+)
+
+
+def generate_dump(pairs: int) -> bytes:
+    """生成包含 pairs*2 个请求的数据"""
+    return b"".join(REQUEST_TEMPLATE % i for i in range(pairs))
+
+
+def run(pairs: int):
+    data = generate_dump(pairs)
+
+    start = time.perf_counter()
+    count = sum(1 for result in iter_http_requests(io.BytesIO(data)) if result['success'])
+    elapsed = time.perf_counter() - start
+
+    # 单独测量峰值内存（tracemalloc 会拖慢执行）
+    tracemalloc.start()
+    for _ in iter_http_requests(io.BytesIO(data)):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rps = count / elapsed
+    print("=" * 60)
+    print(f"请求数: {count}")
+    print(f"数据大小: {len(data) / 1024 / 1024:.1f} MB")
+    print(f"耗时: {elapsed:.3f} s")
+    print(f"吞吐量: {rps:,.0f} 请求/秒 (目标 {TARGET_RPS:,})")
+    print(f"解析器峰值内存: {peak / 1024:.0f} KB")
+    print("=" * 60)
+    return rps
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="批量原始请求解析性能测试")
+    parser.add_argument("--pairs", type=int, default=50000, help="生成的请求对数量 (默认: 50000)")
+    args = parser.parse_args()
+
+    rps = run(args.pairs)
+    sys.exit(0 if rps >= TARGET_RPS else 1)
@@ -0,0 +1,79 @@
+"""
+解析结果对象性能测试
+比较旧版结果字典与 ParsedRequest 在导入大量请求时的内存占用和构造耗时
+"""
+import sys
+import os
+import io
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from http_parser import ParsedRequest, iter_http_requests
+from bench_bulk_parser import generate_dump
+
+
+def as_dict(result) -> dict:
+    """旧版解析器返回的结果字典"""
+    return {
+        'method': result.method,
+        'path': result.path,
+        'url': result.url,
+        'protocol': result.protocol,
+        'headers': result.headers,
+        'body': result.body,
+        'success': True,
+        'error': ''
+    }
+
+
+def as_object(result) -> ParsedRequest:
+    return ParsedRequest(result.method, result.path, result.url, result.protocol, result.headers, result.body)
+
+
+def measure_memory(results, build) -> int:
+    """保留全部结果容器时额外占用的内存（字段值共享，只统计容器本身）"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [build(result) for result in results]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def measure_time(results, build) -> float:
+    start = time.perf_counter()
+    for result in results:
+        build(result)
+    return time.perf_counter() - start
+
+
+def run(count: int):
+    data = generate_dump(count // 2)
+    results = list(iter_http_requests(io.BytesIO(data)))
+
+    dict_memory = measure_memory(results, as_dict)
+    object_memory = measure_memory(results, as_object)
+    dict_time = measure_time(results, as_dict)
+    object_time = measure_time(results, as_object)
+
+    print("=" * 60)
+    print(f"请求数: {len(results)}")
+    print(f"结果字典:      {dict_memory / len(results):6.0f} 字节/请求, 构造 {dict_time * 1000:7.1f} ms")
+    print(f"ParsedRequest: {object_memory / len(results):6.0f} 字节/请求, 构造 {object_time * 1000:7.1f} ms")
+    print(f"节省内存: {(dict_memory - object_memory) / 1024 / 1024:.1f} MB "
+          f"({(1 - object_memory / dict_memory) * 100:.0f}%)")
+    print("=" * 60)
+    return dict_memory, object_memory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="解析结果对象性能测试")
+    parser.add_argument("--count", type=int, default=100000, help="导入的请求数量 (默认: 100000)")
+    args = parser.parse_args()
+
+    dict_memory, object_memory = run(args.count)
+    sys.exit(0 if object_memory < dict_memory else 1)
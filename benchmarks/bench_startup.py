@@ -0,0 +1,272 @@
+"""
+启动耗时测试
+在新进程中测量导入 main_gui 的耗时（-X importtime，按 main_gui 直接导入的模块汇总）
+和从进程启动到主窗口显示、首次绘制的耗时，并检查应当延迟导入的模块（requests、http_parser、各对话框）
+没有在启动时被导入
+
+预算（baselines/startup_budget.json）记录测量时的机器速度（与 bench_parser_suite 相同的纯 Python 循环校准），
+比较时按当前机器的速度换算。main_gui 在顶层导入的本项目模块的导入耗时总是检查；
+未安装 PySide6 时只导入这些模块，窗口显示和首次绘制的预算在装有 PySide6 的机器上用 --save-budget 加入
+
+用法:
+    python benchmarks/bench_startup.py                  # 与预算比较（如有），超出时返回非零退出码
+    python benchmarks/bench_startup.py --runs 10 --top 20
+    python benchmarks/bench_startup.py --save-budget    # 以本次结果加余量保存为预算
+"""
+import sys
+import os
+import ast
+import json
+import argparse
+import importlib.util
+import platform
+import statistics
+import subprocess
+from typing import Dict, List, Optional
+
+from bench_parser_suite import calibrate
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+APP_DIR = os.path.join(ROOT_DIR, 'app')
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'startup_budget.json')
+
+# 启动时不应导入的模块，首次使用时才加载
+LAZY_MODULES = ['requests', 'http_parser', 'har', 'raw_request_dialog', 'latency_dialog']
+
+# 保存预算时在测量值上增加的余量
+BUDGET_HEADROOM = 0.5
+
+DEFAULT_RUNS = 5
+
+
+def child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = APP_DIR + os.pathsep + env.get('PYTHONPATH', '')
+    # 无显示器环境下也能创建窗口
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    解析 -X importtime 的输出
+
+    Returns:
+        [{'name', 'depth', 'self_us', 'cumulative_us'}]，按导入完成的顺序
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # 表头
+        name = fields[2].rstrip()
+        stripped = name.lstrip(' ')
+        entries.append({
+            'name': stripped,
+            'depth': (len(name) - len(stripped) - 1) // 2,
+            'self_us': int(fields[0]),
+            'cumulative_us': int(fields[1])
+        })
+    return entries
+
+
+def startup_app_modules() -> List[str]:
+    """main_gui 在模块顶层导入的本项目模块，按导入顺序"""
+    with open(os.path.join(APP_DIR, 'main_gui.py'), 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            candidates = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            candidates = [node.module]
+        else:
+            continue
+        for name in candidates:
+            name = name.split('.')[0]
+            if name not in names and os.path.exists(os.path.join(APP_DIR, name + '.py')):
+                names.append(name)
+    return names
+
+
+def measure_imports(runs: int, with_qt: bool = True) -> Dict:
+    """
+    多次在新进程中导入 main_gui（未安装 PySide6 时只导入它在顶层导入的本项目模块），取中位数
+
+    Returns:
+        {'total_ms'（未导入 main_gui 时为 None）, 'app_ms'（本项目模块的导入耗时之和）,
+         'modules': {直接导入的模块: 累计毫秒}, 'lazy_loaded': [启动时被导入的延迟模块]}
+    """
+    app_modules = startup_app_modules()
+    target = 'main_gui' if with_qt else ', '.join(app_modules)
+    code = (
+        f"import sys, json, {target}; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    totals = []
+    modules: Dict[str, List[float]] = {}
+    lazy_loaded = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True, text=True, env=child_env(), cwd=APP_DIR
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"导入 {target} 失败:\n{proc.stderr[-2000:]}")
+        lazy_loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+        entries = parse_importtime(proc.stderr)
+        if not with_qt:
+            for entry in entries:
+                if entry['depth'] == 0 and entry['name'] in app_modules:
+                    modules.setdefault(entry['name'], []).append(entry['cumulative_us'] / 1000)
+            continue
+        # main_gui 是最后完成的顶层导入，它之前、比它深一层的条目是它直接导入的模块
+        index = max(i for i, entry in enumerate(entries) if entry['name'] == 'main_gui')
+        totals.append(entries[index]['cumulative_us'] / 1000)
+        for entry in reversed(entries[:index]):
+            if entry['depth'] == 0:
+                break
+            if entry['depth'] == 1:
+                modules.setdefault(entry['name'], []).append(entry['cumulative_us'] / 1000)
+    medians = {name: round(statistics.median(values), 1) for name, values in modules.items()}
+    return {
+        'total_ms': round(statistics.median(totals), 1) if totals else None,
+        'app_ms': round(sum(medians.get(name, 0) for name in app_modules), 1),
+        'modules': medians,
+        'lazy_loaded': lazy_loaded
+    }
+
+
+def measure_window(runs: int) -> Optional[Dict]:
+    """
+    多次启动 main.py（offscreen），读取首次绘制后输出的耗时，取中位数；
+    第一次运行包含冷缓存的影响，单独记录
+
+    Returns:
+        {'cold': {...}, 'warm': {...}}
+    """
+    results = []
+    for _ in range(runs):
+        env = child_env()
+        env['HTTP_TOOL_STARTUP_PROBE'] = '1'
+        proc = subprocess.run(
+            [sys.executable, os.path.join(ROOT_DIR, 'main.py')],
+            capture_output=True, text=True, env=env, cwd=ROOT_DIR, timeout=60
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"启动 main.py 失败:\n{proc.stderr[-2000:]}")
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    warm = results[1:] or results
+    return {
+        'cold': results[0],
+        'warm': {key: round(statistics.median(r[key] for r in warm), 1) for key in results[0]}
+    }
+
+
+def load_budget(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_budget(path: str, speed: float, imports: Dict, window: Optional[Dict]):
+    """以本次结果加余量保存预算；未测量窗口时保留预算文件中已有的窗口预算（按机器速度换算）"""
+    old = load_budget(path) or {}
+    data = {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'machine_speed': speed,
+        'app_import_ms': round(imports['app_ms'] * (1 + BUDGET_HEADROOM), 1)
+    }
+    if window is not None:
+        data['import_ms'] = round(imports['total_ms'] * (1 + BUDGET_HEADROOM))
+        data['window_shown_ms'] = round(window['warm']['window_shown_ms'] * (1 + BUDGET_HEADROOM))
+        data['first_paint_ms'] = round(window['warm']['first_paint_ms'] * (1 + BUDGET_HEADROOM))
+    elif 'machine_speed' in old:
+        scale = old['machine_speed'] / speed
+        for key in ('import_ms', 'window_shown_ms', 'first_paint_ms'):
+            if key in old:
+                data[key] = round(old[key] * scale)
+    data['lazy_modules'] = LAZY_MODULES
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def check_budget(imports: Dict, window: Optional[Dict], budget: Optional[Dict], speed: float) -> List[str]:
+    """返回超出预算的项目说明；预算按机器速度换算，没有预算时只检查延迟导入"""
+    problems = []
+    if budget is not None:
+        # 机器越慢（speed 越小）允许的耗时越长
+        scale = budget['machine_speed'] / speed
+        measured = {'app_import_ms': imports['app_ms'], 'import_ms': imports['total_ms']}
+        if window is not None:
+            measured.update((key, window['warm'][key]) for key in ('window_shown_ms', 'first_paint_ms'))
+        for key, value in measured.items():
+            if value is None or key not in budget:
+                continue
+            allowed = round(budget[key] * scale, 1)
+            if value > allowed:
+                problems.append(f"{key} {value} ms，预算 {allowed} ms（已按机器速度换算）")
+    for name in imports['lazy_loaded']:
+        if name in (budget or {}).get('lazy_modules', LAZY_MODULES):
+            problems.append(f"{name} 应当延迟导入，但在启动时被导入")
+    return problems
+
+
+def report(imports: Dict, window: Optional[Dict], top: int):
+    print("=" * 60)
+    if imports['total_ms'] is not None:
+        print(f"导入 main_gui: {imports['total_ms']} ms（中位数）")
+    print(f"本项目模块: {imports['app_ms']} ms（中位数之和）")
+    print("-" * 60)
+    print(f"{'直接导入的模块':<40}{'累计耗时':>12}")
+    ranked = sorted(imports['modules'].items(), key=lambda item: item[1], reverse=True)
+    for name, ms in ranked[:top]:
+        print(f"{name:<46}{ms:>10.1f} ms")
+    print("-" * 60)
+    if window is None:
+        print("未安装 PySide6，没有测量窗口显示和首次绘制")
+        print("=" * 60)
+        return
+    print(f"冷启动: 导入 {window['cold']['import_ms']} ms, 窗口显示 {window['cold']['window_shown_ms']} ms, "
+          f"首次绘制 {window['cold']['first_paint_ms']} ms")
+    print(f"热启动: 导入 {window['warm']['import_ms']} ms, 窗口显示 {window['warm']['window_shown_ms']} ms, "
+          f"首次绘制 {window['warm']['first_paint_ms']} ms")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="启动耗时测试")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"启动次数 (默认: {DEFAULT_RUNS})")
+    parser.add_argument("--top", type=int, default=15, help="列出耗时最多的前 N 个模块")
+    parser.add_argument("--budget", default=BUDGET_PATH, help=f"预算文件 (默认: {BUDGET_PATH})")
+    parser.add_argument("--save-budget", action="store_true", help="以本次结果加余量保存为预算")
+    args = parser.parse_args()
+
+    with_qt = importlib.util.find_spec('PySide6') is not None
+    speed = calibrate()
+    imports = measure_imports(args.runs, with_qt)
+    window = measure_window(args.runs) if with_qt else None
+    report(imports, window, args.top)
+
+    if args.save_budget:
+        save_budget(args.budget, speed, imports, window)
+        print(f"预算已保存: {args.budget}")
+        sys.exit(0)
+
+    budget = load_budget(args.budget)
+    if budget is None:
+        print(f"没有预算文件 {args.budget}，只检查延迟导入；在目标机器上使用 --save-budget 生成")
+
+    problems = check_budget(imports, window, budget, speed)
+    if problems:
+        print("\n超出启动预算:")
+        for line in problems:
+            print(f"  ✗ {line}")
+        sys.exit(1)
+    print("\n✓ 启动耗时在预算之内" if budget is not None else "\n✓ 延迟导入的模块没有在启动时被导入")
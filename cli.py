@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+HTTP请求解析工具 - 命令行入口
+不加载界面，适合在 cron 或 CI 中执行保存的请求，用法见 python cli.py --help
+"""
+import sys
+import os
+
+# 添加app目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+
+from request_runner import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,32 +2,96 @@
 """
 HTTP请求解析工具 - 主入口文件
 """
+import time
+
+# 启动计时起点，用于统计首次绘制耗时
+_START_TIME = time.perf_counter()
+
 import sys
 import os
+import json
 
 # 添加app目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
 from app.main_gui import HTTPRequestParserGUI
 
+_IMPORTED_TIME = time.perf_counter()
+
+# 设置 HTTP_TOOL_TRACE=<文件> 时记录启动各阶段，退出时导出 Chrome trace
+from tracing import record_span, span
+
+# 设置该环境变量时，首次绘制后输出启动耗时（JSON）并退出，供 benchmarks/ 中的启动测试使用；
+# 值为 1 时输出到标准输出，否则写入该路径（编译后的无控制台程序没有标准输出）
+STARTUP_PROBE_ENV = 'HTTP_TOOL_STARTUP_PROBE'
+
+
+def current_rss_kb():
+    """当前进程的常驻内存（KB），无法获取时为 None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    # 没有 /proc 时（macOS）只能取峰值，单位为字节
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+
+
+def report_startup_when_painted(app, window, shown_time, target):
+    """等待主窗口首次绘制，输出各阶段耗时和内存后退出"""
+    def check():
+        if window.first_paint_ms is None:
+            return
+        timer.stop()
+        report = json.dumps({
+            'import_ms': round((_IMPORTED_TIME - _START_TIME) * 1000, 1),
+            'window_shown_ms': round((shown_time - _START_TIME) * 1000, 1),
+            'first_paint_ms': window.first_paint_ms,
+            'rss_kb': current_rss_kb()
+        })
+        if target == '1':
+            print(report, flush=True)
+        else:
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(report)
+        app.quit()
+
+    timer = QTimer(app)
+    timer.timeout.connect(check)
+    timer.start(5)
+
 
 def main():
     """主函数"""
+    record_span('import', _START_TIME, _IMPORTED_TIME, 'startup')
+
     # 创建QApplication实例
-    app = QApplication(sys.argv)
+    with span('QApplication', 'startup'):
+        app = QApplication(sys.argv)
 
     # 设置应用程序名称
     app.setApplicationName("HTTP请求解析工具")
     app.setOrganizationName("PyTools")
 
     # 创建主窗口
-    window = HTTPRequestParserGUI()
-    window.show()
+    with span('create window', 'startup'):
+        window = HTTPRequestParserGUI(startup_time=_START_TIME)
+    with span('window.show', 'startup'):
+        window.show()
+
+    probe_target = os.environ.get(STARTUP_PROBE_ENV)
+    if probe_target:
+        report_startup_when_painted(app, window, time.perf_counter(), probe_target)
 
     # 运行应用程序
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
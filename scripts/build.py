@@ -1,11 +1,14 @@
 """
 使用 Nuitka 编译项目
-配置：非独立模式、并行编译、加速编译
+配置：非独立模式、并行编译、加速编译；
+BUILD_PROFILES 提供几种面向启动速度的配置（单文件/独立目录、精简 Qt 插件、排除模块），
+可用 benchmarks/bench_build_startup.py 比较各配置的启动耗时、体积和内存
 """
 import subprocess
 import sys
 import os
 import argparse
+import runpy
 import shutil
 from pathlib import Path
 
@@ -39,15 +42,104 @@ SHOW_MEMORY = False                      # 是否显示内存使用
 COPY_DEPENDENCIES = True                # 是否复制依赖文件
 DEPENDENCY_FOLDERS = []  # 需要复制的文件夹列表
 DEPENDENCY_FILES = []   # 需要复制的文件列表
+
+# 精简配置只打包的 Qt 插件：窗口系统、样式和图标所需的图片格式
+MINIMAL_QT_PLUGINS = ["platforms", "styles", "imageformats"]
+
+# 程序用不到、排除后可以减小体积的模块
+EXCLUDED_MODULES = [
+    "tkinter", "unittest", "pydoc", "doctest", "pytest",
+    "PySide6.QtNetwork", "PySide6.QtQml", "PySide6.QtQuick", "PySide6.QtWebEngineCore",
+]
+
+# 单文件模式解压到固定的缓存目录（按版本区分），之后启动不再重复解压
+ONEFILE_CACHE_SPEC = "{{CACHE_DIR}}/PyHttpRequests/{version}"
+
+# 编译配置：未列出的选项使用上面的全局配置
+BUILD_PROFILES = {
+    # 与原有配置相同
+    "default": {},
+    # 独立目录 + 精简 Qt 插件 + 排除模块
+    "standalone-min": {
+        "qt_plugins": MINIMAL_QT_PLUGINS,
+        "exclude_modules": EXCLUDED_MODULES,
+    },
+    # 单文件，每次启动解压到临时目录
+    "onefile": {
+        "onefile": True,
+        "qt_plugins": MINIMAL_QT_PLUGINS,
+        "exclude_modules": EXCLUDED_MODULES,
+    },
+    # 单文件，解压到缓存目录
+    "onefile-cached": {
+        "onefile": True,
+        "onefile_cache": True,
+        "qt_plugins": MINIMAL_QT_PLUGINS,
+        "exclude_modules": EXCLUDED_MODULES,
+    },
+}
+DEFAULT_PROFILE = "default"
 # ==================================================
 
 
+def get_project_dir():
+    """项目根目录（main.py 所在目录）"""
+    return Path(__file__).parent.parent.absolute()
+
+
+def get_app_version():
+    """读取 app/version.py 中的版本号"""
+    return runpy.run_path(str(get_project_dir() / "app" / "version.py"))["__version__"]
+
+
+def get_profile_output_dir(profile):
+    """配置的输出目录：默认配置为 dist，其他配置为 dist/<配置名>"""
+    output_dir = get_project_dir() / OUTPUT_DIR_NAME
+    if profile != DEFAULT_PROFILE:
+        output_dir = output_dir / profile
+    return output_dir
+
+
+def get_artifact_path(profile):
+    """配置编译出的可执行文件路径"""
+    output_dir = get_profile_output_dir(profile)
+    if BUILD_PROFILES[profile].get("onefile", USE_ONEFILE):
+        return output_dir / OUTPUT_FILENAME
+    return output_dir / (Path(MAIN_FILE_NAME).stem + ".dist") / OUTPUT_FILENAME
+
+
+def get_profile_args(profile):
+    """配置对应的 Nuitka 参数（编译模式、插件和模块排除）"""
+    options = BUILD_PROFILES[profile]
+    args = []
+
+    onefile = options.get("onefile", USE_ONEFILE)
+    if options.get("standalone", USE_STANDALONE) or onefile:
+        args.append("--standalone")  # 打包 Python 运行时和所有依赖到文件夹
+
+    if onefile:
+        args.append("--onefile")  # 打包成单个可执行文件
+        if options.get("onefile_cache"):
+            args.append(f"--onefile-tempdir-spec={ONEFILE_CACHE_SPEC.format(version=get_app_version())}")
+
+    if options.get("pyside6_plugin", ENABLE_PYSIDE6_PLUGIN):
+        args.append("--enable-plugin=pyside6")  # 启用 PySide6 插件
+        if options.get("qt_plugins"):
+            args.append(f"--include-qt-plugins={','.join(options['qt_plugins'])}")
+            args.append("--noinclude-qt-translations")
+
+    for module in options.get("exclude_modules", []):
+        args.append(f"--nofollow-import-to={module}")
+
+    return args
+
+
 def copy_dependencies(output_dist_dir):
     """复制依赖文件到编译输出目录"""
     if not COPY_DEPENDENCIES:
         return
 
-    current_dir = Path(__file__).parent.absolute()
+    current_dir = get_project_dir()
 
     print("\n" + "=" * 60)
     print("开始复制依赖文件")
@@ -89,23 +181,23 @@ def copy_dependencies(output_dist_dir):
     print("=" * 60)
 
 
-def build_with_nuitka():
-    """使用 Nuitka 编译项目"""
+def build_with_nuitka(profile=DEFAULT_PROFILE):
+    """使用 Nuitka 按指定配置编译项目"""
 
-    # 获取当前脚本所在目录
-    current_dir = Path(__file__).parent.absolute()
+    # 项目根目录
+    current_dir = get_project_dir()
 
     # 主文件路径
     main_file = current_dir / MAIN_FILE_NAME
 
     # 图标路径
-    icon_file = current_dir / ICON_FILE_NAME
+    icon_file = current_dir / "resources" / ICON_FILE_NAME
 
-    # 输出目录 - dist 文件夹
-    output_dir = current_dir / OUTPUT_DIR_NAME
+    # 输出目录 - dist 文件夹（非默认配置在 dist/<配置名>）
+    output_dir = get_profile_output_dir(profile)
 
-    # 创建 dist 目录（如果不存在）
-    output_dir.mkdir(exist_ok=True)
+    # 创建输出目录（如果不存在）
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     # 检查文件是否存在
     if not main_file.exists():
@@ -118,6 +210,7 @@ def build_with_nuitka():
     print("=" * 60)
     print("开始使用 Nuitka 编译项目")
     print("=" * 60)
+    print(f"编译配置: {profile}")
     print(f"主文件: {main_file}")
     print(f"图标文件: {icon_file}")
     print(f"输出目录: {output_dir}")
@@ -142,21 +235,13 @@ def build_with_nuitka():
         "--assume-yes-for-downloads",
     ]
 
-    # 根据配置添加编译模式参数
-    if USE_STANDALONE:
-        nuitka_args.append("--standalone")  # 打包 Python 运行时和所有依赖到文件夹
-
-    if USE_ONEFILE:
-        nuitka_args.append("--onefile")  # 打包成单个可执行文件
+    # 根据配置添加编译模式、插件和模块排除参数
+    nuitka_args.extend(get_profile_args(profile))
 
     # Windows 特定设置
     if DISABLE_CONSOLE:
         nuitka_args.append("--windows-console-mode=disable")  # 禁用控制台窗口
 
-    # 插件配置
-    if ENABLE_PYSIDE6_PLUGIN:
-        nuitka_args.append("--enable-plugin=pyside6")  # 启用 PySide6 插件
-
     # 编译优化
     nuitka_args.append(f"--jobs={PARALLEL_JOBS}")  # 并行编译
 
@@ -188,9 +273,10 @@ def build_with_nuitka():
 
         print("\n" + "=" * 60)
         print("编译成功！")
-        output_dist_dir = output_dir / 'main.dist'
+        artifact = get_artifact_path(profile)
+        output_dist_dir = artifact.parent
         print(f"程序文件夹: {output_dist_dir}")
-        print(f"可执行文件: {output_dist_dir / OUTPUT_FILENAME}")
+        print(f"可执行文件: {artifact}")
         print("=" * 60)
 
         # 复制依赖文件
@@ -218,8 +304,7 @@ def build_with_nuitka():
 
 def clean_build_files():
     """清理编译生成的文件"""
-    current_dir = Path(__file__).parent.absolute()
-    output_dir = current_dir / OUTPUT_DIR_NAME
+    output_dir = get_project_dir() / OUTPUT_DIR_NAME
 
     print("=" * 60)
     print("开始清理编译文件")
@@ -255,6 +340,8 @@ if __name__ == "__main__":
   python build.py          # 编译项目
   python build.py build    # 编译项目
   python build.py clean    # 清理编译文件
+  python build.py build --profile onefile-cached   # 按指定配置编译
+  python build.py build --profile all              # 编译全部配置
         """
     )
     parser.add_argument(
@@ -265,6 +352,13 @@ if __name__ == "__main__":
         help="要执行的命令 (默认: build)"
     )
 
+    parser.add_argument(
+        "--profile",
+        default=DEFAULT_PROFILE,
+        choices=list(BUILD_PROFILES) + ["all"],
+        help=f"编译配置 (默认: {DEFAULT_PROFILE})"
+    )
+
     args = parser.parse_args()
 
     # 执行对应的命令
@@ -286,5 +380,8 @@ if __name__ == "__main__":
         sys.exit(1)
 
     # 执行编译
-    exit_code = build_with_nuitka()
+    profiles = list(BUILD_PROFILES) if args.profile == "all" else [args.profile]
+    exit_code = 0
+    for profile in profiles:
+        exit_code = build_with_nuitka(profile) or exit_code
     sys.exit(exit_code)